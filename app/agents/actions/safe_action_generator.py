@@ -1,29 +1,40 @@
 import json
-import os
-from typing import Dict, List, Optional
-
-from openai import OpenAI
-from dotenv import load_dotenv
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional, Tuple
 
 from app.agents.actions.platform_guidance import (
     get_platform_guidance,
     supported_platforms_text,
 )
+from app.core.admission import SAFE_ACTIONS, OverloadedError, get_limiter
+from app.core.config import get_settings
+from app.core.deadline import Deadline, DeadlineExceeded, degrade_reason, resolve_deadline
 from app.core.logging import get_logger
+from app.core.metrics import record_error, record_fallback
+from app.core.tracing import span, traced
 from app.agents.explanation.rag.retrieval_contract import Reference
 
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
 
-load_dotenv()
+logger = get_logger(__name__)
 
-OPENAI_MODEL_ENV = "OPENAI_MODEL_ENV"
-DEFAULT_OPENAI_MODEL = "gpt-5-mini"
+_ASYNC_SAFE_ACTIONS_CLIENT: Optional["AsyncOpenAI"] = None
 
-logger = get_logger(__name__)
+
+def _get_async_client() -> "AsyncOpenAI":
+    global _ASYNC_SAFE_ACTIONS_CLIENT
+    if _ASYNC_SAFE_ACTIONS_CLIENT is None:
+        # SDK import 비용이 커서 첫 사용(또는 워밍업) 시점까지 미룸
+        from openai import AsyncOpenAI
+
+        _ASYNC_SAFE_ACTIONS_CLIENT = AsyncOpenAI()
+    return _ASYNC_SAFE_ACTIONS_CLIENT
 
 
 def _fallback_safe_actions(
     risk_stage: str, references: List[Reference], platform: str
 ) -> Dict[str, object]:
+    record_fallback("safe_actions")
     guidance = get_platform_guidance(platform)
     if references:
         note = references[0].note.strip()
@@ -66,6 +77,7 @@ def _fallback_safe_actions(
         "risk_signals": [],
         "additional_recommendations": recommendations,
         "rag_references": [],
+        "fallback": True,
     }
 
 
@@ -148,19 +160,56 @@ def _ensure_min_recommendations(
     return deduped[:max_items]
 
 
-def _call_openai_safe_actions(
+_SAFE_ACTIONS_TEXT_FORMAT: Dict[str, object] = {
+    "format": {
+        "type": "json_schema",
+        "name": "safe_actions",
+        "schema": {
+            "type": "object",
+            "additionalProperties": False,
+            "properties": {
+                "summary": {"type": "string"},
+                "risk_signals": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "additionalProperties": False,
+                        "properties": {
+                            "quote": {"type": "string"},
+                            "reason": {"type": "string"},
+                        },
+                        "required": ["quote", "reason"],
+                    },
+                    "minItems": 0,
+                    "maxItems": 6,
+                },
+                "additional_recommendations": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "minItems": 2,
+                    "maxItems": 4,
+                },
+            },
+            "required": [
+                "summary",
+                "risk_signals",
+                "additional_recommendations",
+            ],
+        },
+        "strict": True,
+    }
+}
+
+
+def _build_safe_actions_request(
     risk_stage: str,
     conversation_type: str,
     references: List[Reference],
     conversation_lines: List[str],
     platform: str,
-) -> Optional[Dict[str, object]]:
-    if not os.getenv("OPENAI_API_KEY"):
-        logger.warning("OPENAI_API_KEY not set; using fallback safe actions.")
-        return None
-
+) -> Dict[str, object]:
     guidance = get_platform_guidance(platform)
-    model = os.getenv(OPENAI_MODEL_ENV, DEFAULT_OPENAI_MODEL)
+    model = get_settings().safe_actions_model
 
     reference_text = (
         "; ".join(f"{ref.source}: {ref.note}" for ref in references)
@@ -252,116 +301,171 @@ def _call_openai_safe_actions(
         "출력은 JSON 형식이어야 한다."
     )
 
+    return {
+        "model": model,
+        "instructions": instructions,
+        "input": prompt,
+        "max_output_tokens": 400,
+        "text": _SAFE_ACTIONS_TEXT_FORMAT,
+    }
+
+
+def _parse_safe_actions_output(text: str, platform: str) -> Optional[Dict[str, object]]:
+    guidance = get_platform_guidance(platform)
+    text = text.strip()
+    if not text:
+        logger.warning("OpenAI safe actions returned empty output; using fallback.")
+        return None
+    payload = _parse_json_payload(text)
+    if not payload:
+        logger.warning("OpenAI safe actions returned invalid JSON; using fallback.")
+        return None
+    summary = str(payload.get("summary", "")).strip()
+    risk_signals = payload.get("risk_signals", [])
+    recommendations = payload.get("additional_recommendations", [])
+    if not summary or not isinstance(risk_signals, list) or not isinstance(
+        recommendations, list
+    ):
+        logger.warning("OpenAI safe actions missing fields; using fallback.")
+        return None
+    cleaned_signals = []
+    for item in risk_signals:
+        if not isinstance(item, dict):
+            continue
+        quote = str(item.get("quote", "")).strip()
+        reason = str(item.get("reason", "")).strip()
+        if not quote or not reason:
+            continue
+        cleaned_signals.append({"quote": quote, "reason": reason})
+    cleaned_recommendations = [
+        str(item).strip() for item in recommendations if str(item).strip()
+    ]
+    cleaned_recommendations = _ensure_platform_recommendation(
+        cleaned_recommendations,
+        guidance.mandatory_recommendation,
+        guidance.recommendation_keywords,
+    )
+    cleaned_recommendations = _ensure_min_recommendations(
+        cleaned_recommendations,
+        guidance.fallback_recommendations + [guidance.mandatory_recommendation],
+    )
+    if len(cleaned_recommendations) < 2:
+        logger.warning("OpenAI safe actions recommendations invalid; using fallback.")
+        return None
+    return {
+        "summary": summary,
+        "risk_signals": cleaned_signals,
+        "additional_recommendations": cleaned_recommendations,
+        "rag_references": [],
+    }
+
+
+async def _call_openai_safe_actions_async(
+    risk_stage: str,
+    conversation_type: str,
+    references: List[Reference],
+    conversation_lines: List[str],
+    platform: str,
+) -> Optional[Dict[str, object]]:
+    if not get_settings().openai_api_key:
+        logger.warning("OPENAI_API_KEY not set; using fallback safe actions.")
+        return None
+
+    request = _build_safe_actions_request(
+        risk_stage, conversation_type, references, conversation_lines, platform
+    )
     try:
-        client = OpenAI()
-        response = client.responses.create(
-            model=model,
-            instructions=instructions,
-            input=prompt,
-            max_output_tokens=400,
-            text={
-                "format": {
-                    "type": "json_schema",
-                    "name": "safe_actions",
-                    "schema": {
-                    "type": "object",
-                    "additionalProperties": False,
-                    "properties": {
-                        "summary": {"type": "string"},
-                        "risk_signals": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "additionalProperties": False,
-                                "properties": {
-                                    "quote": {"type": "string"},
-                                    "reason": {"type": "string"},
-                                },
-                                "required": ["quote", "reason"],
-                            },
-                            "minItems": 0,
-                            "maxItems": 6,
-                        },
-                        "additional_recommendations": {
-                            "type": "array",
-                            "items": {"type": "string"},
-                            "minItems": 2,
-                            "maxItems": 4,
-                        },
-                    },
-                    "required": [
-                        "summary",
-                        "risk_signals",
-                        "additional_recommendations",
-                    ],
-                },
-                "strict": True,
-            }
-        },
-        )
-        text = response.output_text.strip()
-        if not text:
-            logger.warning("OpenAI safe actions returned empty output; using fallback.")
-            return None
-        payload = _parse_json_payload(text)
-        if not payload:
-            logger.warning("OpenAI safe actions returned invalid JSON; using fallback.")
-            return None
-        summary = str(payload.get("summary", "")).strip()
-        risk_signals = payload.get("risk_signals", [])
-        recommendations = payload.get("additional_recommendations", [])
-        if not summary or not isinstance(risk_signals, list) or not isinstance(
-            recommendations, list
-        ):
-            logger.warning("OpenAI safe actions missing fields; using fallback.")
-            return None
-        cleaned_signals = []
-        for item in risk_signals:
-            if not isinstance(item, dict):
-                continue
-            quote = str(item.get("quote", "")).strip()
-            reason = str(item.get("reason", "")).strip()
-            if not quote or not reason:
-                continue
-            cleaned_signals.append({"quote": quote, "reason": reason})
-        cleaned_recommendations = [
-            str(item).strip() for item in recommendations if str(item).strip()
-        ]
-        cleaned_recommendations = _ensure_platform_recommendation(
-            cleaned_recommendations,
-            guidance.mandatory_recommendation,
-            guidance.recommendation_keywords,
-        )
-        cleaned_recommendations = _ensure_min_recommendations(
-            cleaned_recommendations,
-            guidance.fallback_recommendations + [guidance.mandatory_recommendation],
-        )
-        if len(cleaned_recommendations) < 2:
-            logger.warning("OpenAI safe actions recommendations invalid; using fallback.")
-            return None
-        return {
-            "summary": summary,
-            "risk_signals": cleaned_signals,
-            "additional_recommendations": cleaned_recommendations,
-            "rag_references": [],
-        }
+        client = _get_async_client()
+        async with get_limiter(SAFE_ACTIONS).acquire():
+            with span("openai.responses", model=request["model"]):
+                response = await client.responses.create(**request)
+        return _parse_safe_actions_output(response.output_text, platform)
+    except OverloadedError:
+        raise
     except Exception as exc:
         logger.exception("OpenAI safe actions failed: %s", exc)
+        record_error("safe_actions")
         return None
 
 
-def generate_safe_actions(
+@traced()
+async def generate_safe_actions_async(
     risk_stage: str,
     conversation_type: str,
     references: List[Reference],
     conversation_lines: List[str],
     platform: str,
+    deadline: Optional[Deadline] = None,
 ) -> Dict[str, object]:
     """요약, 위험 신호, 추가 권고를 생성."""
-    llm_result = _call_openai_safe_actions(
-        risk_stage, conversation_type, references, conversation_lines, platform
-    )
+    deadline = resolve_deadline(deadline)
+    try:
+        llm_result = await deadline.run(
+            _call_openai_safe_actions_async(
+                risk_stage, conversation_type, references, conversation_lines, platform
+            )
+        )
+    except (DeadlineExceeded, OverloadedError) as exc:
+        logger.warning("OpenAI safe actions skipped (%s); using fallback.", degrade_reason(exc))
+        deadline.mark_degraded("safe_actions")
+        llm_result = None
     if llm_result:
         return llm_result
 
     return _fallback_safe_actions(risk_stage, references, platform)
+
+
+async def stream_safe_actions_async(
+    risk_stage: str,
+    conversation_type: str,
+    references: List[Reference],
+    conversation_lines: List[str],
+    platform: str,
+    deadline: Optional[Deadline] = None,
+) -> AsyncIterator[Tuple[str, object]]:
+    """LLM 출력 조각("delta")을 도착하는 대로 내보내고 마지막에 최종 결과("result")를 반환."""
+    deadline = resolve_deadline(deadline)
+    llm_result: Optional[Dict[str, object]] = None
+    if not get_settings().openai_api_key:
+        logger.warning("OPENAI_API_KEY not set; using fallback safe actions.")
+    else:
+        request = _build_safe_actions_request(
+            risk_stage, conversation_type, references, conversation_lines, platform
+        )
+        try:
+            client = _get_async_client()
+            chunks: List[str] = []
+            async with get_limiter(SAFE_ACTIONS).acquire():
+                # 스트림 본문은 여러 yield에 걸치므로 첫 응답까지의 시간만 span으로 기록
+                with span("openai.responses.stream_open", model=request["model"]):
+                    stream = await deadline.run(client.responses.create(**request, stream=True))
+                try:
+                    events = stream.__aiter__()
+                    while True:
+                        # 이벤트마다 남은 예산을 적용해 느린 스트림이 전체 응답을 붙잡지 않도록 함
+                        try:
+                            event = await deadline.run(events.__anext__())
+                        except StopAsyncIteration:
+                            break
+                        if event.type == "response.output_text.delta" and event.delta:
+                            chunks.append(event.delta)
+                            yield "delta", event.delta
+                finally:
+                    # 예산 초과, 오류, 클라이언트 연결 종료(GeneratorExit) 시에도 업스트림 응답을
+                    # 닫아 커넥션 풀에 돌려줌
+                    await stream.close()
+            llm_result = _parse_safe_actions_output("".join(chunks), platform)
+        except (DeadlineExceeded, OverloadedError) as exc:
+            logger.warning(
+                "OpenAI safe actions stream skipped (%s); using fallback.", degrade_reason(exc)
+            )
+            deadline.mark_degraded("safe_actions")
+            llm_result = None
+        except Exception as exc:
+            logger.exception("OpenAI safe actions stream failed: %s", exc)
+            record_error("safe_actions")
+            llm_result = None
+
+    if not llm_result:
+        llm_result = _fallback_safe_actions(risk_stage, references, platform)
+    yield "result", llm_result
@@ -1,44 +1,76 @@
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from app.utils.text_patterns import RISK_SIGNAL_RULES, SIGNAL_QUERY_TERMS
-from app.utils.text_utils import normalize_text
+from app.agents.analyzer.rule_matcher import RuleScanResult
+from app.agents.analyzer.rule_set import RuleSet, get_rule_set
+from app.core.tracing import traced
+from app.schemas.conversation import NormalizedConversation, NormalizedMessage
 
 
+def _signals_key(allowed_signals: Optional[List[str]]) -> Optional[Tuple[str, ...]]:
+    return tuple(allowed_signals) if allowed_signals is not None else None
+
+
+@traced()
+def scan_conversation(
+    conversation: NormalizedConversation,
+    conversation_type: str,
+    rules: Optional[RuleSet] = None,
+) -> RuleScanResult:
+    """유형별 신호 범위로 OTHER 메시지를 한 번 훑어 신호, 구절, 매칭 위치를 함께 반환.
+
+    rules를 넘기지 않으면 현재 룰셋 스냅샷을 사용.
+    """
+    return (rules or get_rule_set()).matcher(conversation_type).scan(conversation)
+
+
+@traced()
 def analyze_conversation(
-    conversation: List[str], allowed_signals: Optional[List[str]] = None
+    conversation: NormalizedConversation,
+    allowed_signals: Optional[List[str]] = None,
+    rules: Optional[RuleSet] = None,
 ) -> List[str]:
-    """규칙 기반 신호 추출. 순수 함수이며 결정론적으로 동작."""
-    signals = set()
-    for message in conversation:
-        normalized = normalize_text(message)
-        for signal, patterns in RISK_SIGNAL_RULES.items():
-            if allowed_signals is not None and signal not in allowed_signals:
-                continue
-            if any(pattern.search(normalized) for pattern in patterns):
-                signals.add(signal)
-    return sorted(signals)
+    """규칙 기반 신호 추출. 같은 룰셋 스냅샷에 대해 결정론적으로 동작."""
+    matcher = (rules or get_rule_set()).matcher_for_signals(_signals_key(allowed_signals))
+    return matcher.detect_signals(conversation)
 
 
+@traced()
 def extract_signal_phrases(
-    conversation: List[str], allowed_signals: Optional[List[str]] = None
+    conversation: NormalizedConversation,
+    allowed_signals: Optional[List[str]] = None,
+    rules: Optional[RuleSet] = None,
 ) -> List[str]:
     """RAG 쿼리 개선을 위해 신호에 매칭된 구절을 추출."""
+    matcher = (rules or get_rule_set()).matcher_for_signals(_signals_key(allowed_signals))
+    return matcher.scan(conversation).phrases
+
+
+def scan_message_signals(
+    message: NormalizedMessage, rules: Optional[RuleSet] = None
+) -> Dict[str, List[str]]:
+    """메시지 한 건의 신호별 매칭 구절. 세션 단위 증분 분석에서 메시지별로 보관."""
+    return (rules or get_rule_set()).matcher().scan_message_hits(message)
+
+
+def merge_signal_hits(
+    message_hits: Iterable[Dict[str, List[str]]], allowed_signals: Optional[List[str]] = None
+) -> Tuple[List[str], List[str]]:
+    """메시지별 매칭 결과를 합쳐 analyze_conversation/extract_signal_phrases와 같은 결과를 반환."""
+    allowed = set(allowed_signals) if allowed_signals is not None else None
+    signals = set()
     phrases = set()
-    for message in conversation:
-        normalized = normalize_text(message)
-        for signal, patterns in RISK_SIGNAL_RULES.items():
-            if allowed_signals is not None and signal not in allowed_signals:
+    for hits in message_hits:
+        for signal, signal_phrases in hits.items():
+            if allowed is not None and signal not in allowed:
                 continue
-            for pattern in patterns:
-                for match in pattern.finditer(normalized):
-                    phrase = match.group(0).strip()
-                    if phrase:
-                        phrases.add(phrase)
-    return sorted(phrases)
+            signals.add(signal)
+            phrases.update(signal_phrases)
+    return sorted(signals), sorted(phrases)
 
 
-def signal_query_terms(signals: List[str]) -> List[str]:
+def signal_query_terms(signals: List[str], rules: Optional[RuleSet] = None) -> List[str]:
+    query_terms = (rules or get_rule_set()).pack.query_terms
     terms: List[str] = []
     for signal in signals:
-        terms.extend(SIGNAL_QUERY_TERMS.get(signal, []))
+        terms.extend(query_terms.get(signal, []))
     return sorted(set(terms))
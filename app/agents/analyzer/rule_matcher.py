@@ -0,0 +1,216 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+from app.core.config import get_settings
+from app.core.metrics import record_rule_truncation
+from app.schemas.conversation import NormalizedConversation, NormalizedMessage
+from app.utils.literal_prefilter import LiteralPrefilter, required_literals
+from app.utils.pattern_complexity import PatternComplexity, assess_pattern
+from app.utils.text_utils import normalize_text, sentence_scoped_text, sentence_windows
+
+
+@dataclass(frozen=True)
+class SignalMatch:
+    """규칙 매칭 한 건. message_index는 대화 전체(NormalizedConversation.messages) 기준 위치,
+    start/end는 정규화된 메시지 기준 위치."""
+
+    signal: str
+    message_index: int
+    start: int
+    end: int
+    phrase: str
+
+
+@dataclass(frozen=True)
+class RuleScanResult:
+    signals: List[str]
+    phrases: List[str]
+    matches: List[SignalMatch]
+
+    def match_index(self) -> Dict[int, List[SignalMatch]]:
+        """메시지 번호 -> 그 메시지에서 구절이 매칭된 결과. 발췌할 메시지를 고를 때 사용."""
+        index: Dict[int, List[SignalMatch]] = {}
+        for match in self.matches:
+            if match.phrase:
+                index.setdefault(match.message_index, []).append(match)
+        return index
+
+
+@dataclass(frozen=True)
+class RuleGuard:
+    """긴 OCR 텍스트에서 백트래킹 시간을 제한하는 실행 조건."""
+
+    max_message_chars: int
+    window_chars: int
+
+
+def default_rule_guard() -> Optional[RuleGuard]:
+    settings = get_settings()
+    if not settings.rule_guard_enabled:
+        return None
+    return RuleGuard(settings.rule_max_message_chars, settings.rule_window_chars)
+
+
+def superlinear_patterns(
+    rules: Mapping[str, List[re.Pattern]]
+) -> Tuple[PatternComplexity, ...]:
+    """초선형 백트래킹 가능성이 있는 규칙."""
+    return tuple(
+        complexity
+        for patterns in rules.values()
+        for complexity in map(assess_pattern, patterns)
+        if complexity.superlinear
+    )
+
+
+class CompiledRuleMatcher:
+    """허용 신호 범위로 미리 걸러 둔 규칙 목록. 메시지마다 정규화와 패턴 검사를 한 번씩만 수행.
+
+    필수 literal이 메시지에 없는 패턴은 literal prefilter로 건너뜀. guard가 있으면 메시지를
+    입력 상한에서 자르고, 구간 하나보다 긴 메시지에서는 초선형 백트래킹 가능성이 있는 패턴을
+    문장 단위 구간에서만 실행해 최악 시간을 구간 길이로 묶음. 구간 하나에 들어가는 메시지와
+    나머지 패턴은 메시지 전체에 한 번 실행하므로 guard가 없을 때와 결과가 같음.
+    """
+
+    def __init__(
+        self,
+        rules: Mapping[str, List[re.Pattern]],
+        signals: Optional[Iterable[str]] = None,
+        guard: Optional[RuleGuard] = None,
+    ) -> None:
+        allowed = set(signals) if signals is not None else None
+        self.signals: Tuple[str, ...] = tuple(
+            signal for signal in rules if allowed is None or signal in allowed
+        )
+        self._rules: Tuple[Tuple[str, re.Pattern], ...] = tuple(
+            (signal, pattern) for signal in self.signals for pattern in rules[signal]
+        )
+        self._prefilter = LiteralPrefilter([pattern for _, pattern in self._rules])
+        self.guard = guard
+        complexities = [assess_pattern(pattern) for _, pattern in self._rules]
+        # 구간 단위로 실행할 규칙 -> 구간에 하나 이상 있어야 하는 literal (없으면 모든 구간 검사)
+        self._windowed: Dict[int, Optional[FrozenSet[str]]] = {
+            idx: required_literals(self._rules[idx][1])
+            for idx, complexity in enumerate(complexities)
+            if guard is not None and complexity.superlinear
+        }
+        # 구간에서 찾은 매칭을 메시지 전체 기준으로 다시 확인할 규칙
+        self._lookaround: FrozenSet[int] = frozenset(
+            idx for idx in self._windowed if complexities[idx].lookaround
+        )
+
+    def _targets(
+        self, message: NormalizedMessage, skip_signals: Optional[Set[str]] = None
+    ) -> Iterator[Tuple[int, str, int, int, str]]:
+        """(규칙 번호, 검사할 텍스트, 시작, 끝, 입력 상한에서 자른 정규화 메시지).
+
+        위치는 정규화된 메시지 기준. skip_signals는 순회 중 갱신 가능.
+        """
+        raw, normalized = message.raw, message.normalized
+        if self.guard is not None and len(raw) > self.guard.max_message_chars:
+            record_rule_truncation()
+            raw = raw[: self.guard.max_message_chars]
+            normalized = normalize_text(raw)
+        scoped: Optional[str] = None
+        windows: List[Tuple[int, int]] = []
+        for idx in self._prefilter.candidates(normalized):
+            if skip_signals and self._rules[idx][0] in skip_signals:
+                continue
+            if idx not in self._windowed or len(normalized) <= self.guard.window_chars:
+                yield idx, normalized, 0, len(normalized), normalized
+                continue
+            if scoped is None:
+                scoped = sentence_scoped_text(raw)
+                windows = sentence_windows(scoped, self.guard.window_chars)
+            literals = self._windowed[idx]
+            for start, end in windows:
+                if literals is None or any(scoped.find(literal, start, end) >= 0 for literal in literals):
+                    yield idx, scoped, start, end, normalized
+
+    def _finditer(
+        self,
+        idx: int,
+        text: str,
+        start: int,
+        end: int,
+        whole: str,
+        checked: Dict[Tuple[int, int], Optional[re.Match]],
+    ) -> Iterator[re.Match]:
+        """구간 [start, end)에서 시작하는 매칭. checked는 겹친 구간 사이에 재사용하는 확인 결과."""
+        pattern = self._rules[idx][1]
+        if text is whole or idx not in self._lookaround:
+            yield from pattern.finditer(text, start, end)
+            return
+        # lookaround는 구간이 아니라 메시지 전체를 봐야 함 ((?!...)의 부정 조건이 다음 문장에
+        # 있을 수 있음). 구간에서 찾은 시작 위치마다 메시지 전체에서 다시 매칭해 확인.
+        # 구간에서는 부정 조건이 덜 보이므로 후보가 빠지지 않음 (규칙 팩은 부정 lookaround만 씀)
+        pos = start
+        while pos < end:
+            candidate = pattern.search(text, pos, end)
+            if candidate is None:
+                return
+            key = (idx, candidate.start())
+            if key not in checked:
+                checked[key] = pattern.match(whole, candidate.start())
+            match = checked[key]
+            if match is not None:
+                yield match
+                pos = max(match.end(), candidate.start() + 1)
+            else:
+                pos = candidate.start() + 1
+
+    def scan_message(self, message: NormalizedMessage, message_index: int = 0) -> List[SignalMatch]:
+        """메시지 한 건의 매칭. 규칙 순서, 같은 규칙 안에서는 위치 순."""
+        found: Dict[Tuple[int, int, int], SignalMatch] = {}
+        checked: Dict[Tuple[int, int], Optional[re.Match]] = {}
+        for idx, text, start, end, whole in self._targets(message):
+            signal = self._rules[idx][0]
+            for match in self._finditer(idx, text, start, end, whole, checked):
+                key = (idx, match.start(), match.end())
+                # 겹치게 자른 구간에서 같은 매칭이 두 번 나올 수 있음
+                if key not in found:
+                    found[key] = SignalMatch(
+                        signal=signal,
+                        message_index=message_index,
+                        start=key[1],
+                        end=key[2],
+                        # 구간의 문장 경계 '\n'은 정규화된 메시지에서는 공백
+                        phrase=match.group(0).replace("\n", " ").strip(),
+                    )
+        return [found[key] for key in sorted(found)]
+
+    def scan(self, conversation: NormalizedConversation) -> RuleScanResult:
+        """OTHER 메시지 전체를 검사."""
+        matches: List[SignalMatch] = []
+        for idx, message in zip(conversation.other_indices, conversation.others):
+            matches.extend(self.scan_message(message, idx))
+        # 빈 구절 매칭도 신호로는 인정 (pattern.search 결과와 동일)
+        signals = sorted({match.signal for match in matches})
+        phrases = sorted({match.phrase for match in matches if match.phrase})
+        return RuleScanResult(signals=signals, phrases=phrases, matches=matches)
+
+    def detect_signals(self, conversation: NormalizedConversation) -> List[str]:
+        """구절/위치 없이 신호만 필요할 때. 이미 찾은 신호의 패턴은 건너뜀."""
+        found = set()
+        for message in conversation.others:
+            checked: Dict[Tuple[int, int], Optional[re.Match]] = {}
+            for idx, text, start, end, whole in self._targets(message, found):
+                signal = self._rules[idx][0]
+                if signal in found:
+                    continue
+                if next(self._finditer(idx, text, start, end, whole, checked), None) is not None:
+                    found.add(signal)
+            if len(found) == len(self.signals):
+                break
+        return sorted(found)
+
+    def scan_message_hits(self, message: NormalizedMessage) -> Dict[str, List[str]]:
+        """메시지 한 건의 신호별 매칭 구절 (매칭된 신호만 포함)."""
+        hits: Dict[str, List[str]] = {}
+        for match in self.scan_message(message):
+            phrases = hits.setdefault(match.signal, [])
+            if match.phrase:
+                phrases.append(match.phrase)
+        return hits
+
@@ -0,0 +1,208 @@
+import asyncio
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.agents.analyzer.rule_matcher import (
+    CompiledRuleMatcher,
+    RuleGuard,
+    default_rule_guard,
+    superlinear_patterns,
+)
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.metrics import REGISTRY, CallbackGauge, record_ruleset_reload
+from app.utils.literal_prefilter import LiteralPrefilter
+from app.utils.text_patterns import (
+    BUNDLED_RULE_PACK_PATH,
+    RulePack,
+    RulePackError,
+    load_rule_pack,
+)
+
+logger = get_logger(__name__)
+
+SignalsKey = Optional[Tuple[str, ...]]
+
+# 호출자가 임의의 신호 조합을 넘겨도 캐시가 계속 커지지 않도록 제한
+_MAX_CACHED_MATCHERS = 64
+
+
+class RuleSet:
+    """rule pack 하나로 만든 불변 스냅샷. matcher와 prefilter를 스냅샷마다 따로 보관.
+
+    요청은 시작할 때 받은 스냅샷으로 끝까지 처리하고, pack이 바뀌면 새 스냅샷을 다 만든 뒤
+    참조만 교체하므로 처리 중인 요청은 영향을 받지 않음.
+    """
+
+    def __init__(self, pack: RulePack, guard: Optional[RuleGuard] = None) -> None:
+        self.pack = pack
+        self.guard = guard
+        self.loaded_at = time.time()
+        self.flagged = superlinear_patterns(pack.risk_signal_rules)
+        exponential = [complexity.pattern for complexity in self.flagged if complexity.exponential]
+        if exponential:
+            # 리뷰 없이 바로 반영되는 경로라 guard 구간 안에서도 폭주할 수 있는 패턴은 거절
+            raise RulePackError(f"nested unbounded repeats: {exponential}")
+        self.type_rules: Tuple[Tuple[str, re.Pattern], ...] = tuple(
+            (conversation_type, pattern)
+            for conversation_type, patterns in pack.conversation_type_rules.items()
+            for pattern in patterns
+        )
+        self.type_prefilter = LiteralPrefilter([pattern for _, pattern in self.type_rules])
+        self._matchers: Dict[SignalsKey, CompiledRuleMatcher] = {}
+        # 교체 직후 요청이 컴파일 비용을 치르지 않도록 유형별 matcher를 미리 생성
+        self.matcher()
+        for conversation_type in pack.type_patterns:
+            self.matcher(conversation_type)
+
+    @property
+    def version(self) -> str:
+        return self.pack.version
+
+    @property
+    def digest(self) -> str:
+        return self.pack.digest
+
+    def resolve_risk_signals(self, conversation_type: str) -> List[str]:
+        return self.pack.resolve_risk_signals(conversation_type)
+
+    def matcher(self, conversation_type: Optional[str] = None) -> CompiledRuleMatcher:
+        """대화 유형별 matcher. None이면 전체 룰셋."""
+        if conversation_type is None:
+            return self.matcher_for_signals(None)
+        return self.matcher_for_signals(tuple(self.resolve_risk_signals(conversation_type)))
+
+    def matcher_for_signals(self, signals: SignalsKey) -> CompiledRuleMatcher:
+        matcher = self._matchers.get(signals)
+        if matcher is None:
+            matcher = CompiledRuleMatcher(self.pack.risk_signal_rules, signals, self.guard)
+            # 동시에 만들어도 결과가 같으므로 잠금 없이 먼저 저장된 것을 사용
+            if len(self._matchers) < _MAX_CACHED_MATCHERS:
+                matcher = self._matchers.setdefault(signals, matcher)
+        return matcher
+
+    def info(self) -> Dict[str, object]:
+        return {
+            "version": self.version,
+            "digest": self.digest,
+            "source": self.pack.source,
+            "loaded_at": self.loaded_at,
+            "signals": len(self.pack.risk_signal_rules),
+            "guarded_patterns": len(self.flagged) if self.guard is not None else 0,
+        }
+
+
+_RULE_SET: Optional[RuleSet] = None
+# 마지막으로 읽은 pack 파일의 (mtime_ns, size)
+_RULE_PACK_STAMP: Optional[Tuple[int, int]] = None
+_RELOAD_LOCK = threading.Lock()
+
+
+def rule_pack_path() -> Path:
+    configured = get_settings().rule_pack_path
+    return Path(configured) if configured else BUNDLED_RULE_PACK_PATH
+
+
+def _file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_rule_set() -> RuleSet:
+    """요청을 처리할 현재 스냅샷. 처음 호출 시 pack을 읽으며 실패하면 RulePackError."""
+    rule_set = _RULE_SET
+    if rule_set is None:
+        reload_rule_set(force=True)
+        rule_set = _RULE_SET
+    return rule_set
+
+
+def reload_rule_set(force: bool = False) -> bool:
+    """pack 파일이 바뀌었으면 새 스냅샷을 만들어 교체하고 True.
+
+    force면 파일이 그대로여도 다시 만듦 (guard 설정 변경 등). 읽기/검증에 실패하면 예외를 올리고
+    현재 스냅샷을 그대로 유지.
+    """
+    global _RULE_SET, _RULE_PACK_STAMP
+    path = rule_pack_path()
+    with _RELOAD_LOCK:
+        # 읽기 전에 stamp를 잡아 두어 읽는 중에 바뀐 파일은 다음 확인에서 다시 읽음
+        stamp = _file_stamp(path)
+        if not force and _RULE_SET is not None and stamp == _RULE_PACK_STAMP:
+            return False
+        try:
+            rule_set = RuleSet(load_rule_pack(path), default_rule_guard())
+        except Exception:
+            # 같은 잘못된 파일을 확인할 때마다 다시 읽지 않음
+            _RULE_PACK_STAMP = stamp
+            record_ruleset_reload("failed")
+            raise
+        _RULE_PACK_STAMP = stamp
+        previous = _RULE_SET
+        if (
+            not force
+            and previous is not None
+            and (previous.version, previous.digest) == (rule_set.version, rule_set.digest)
+        ):
+            # mtime만 바뀐 경우: 기존 스냅샷 유지
+            return False
+        _RULE_SET = rule_set
+    record_ruleset_reload("swapped")
+    logger.info(
+        "Rule pack %s (%s) active from %s%s",
+        rule_set.version,
+        rule_set.digest,
+        path,
+        f", replacing {previous.version} ({previous.digest})" if previous is not None else "",
+    )
+    for complexity in rule_set.flagged:
+        logger.warning(
+            "rule may backtrack super-linearly (%s): %s",
+            "exponential" if complexity.exponential else f"O(n^{complexity.degree})",
+            complexity.pattern,
+        )
+    return True
+
+
+async def watch_rule_pack(interval_seconds: float) -> None:
+    """interval마다 pack 파일을 확인해 바뀌었으면 교체. 실패한 pack은 기록만 하고 계속 감시."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(reload_rule_set)
+        except Exception as exc:
+            current = _RULE_SET
+            logger.error(
+                "Rule pack reload failed; keeping %s: %s",
+                current.version if current is not None else "none",
+                exc,
+            )
+
+
+def start_rule_pack_watcher() -> Optional[asyncio.Task]:
+    """RULE_PACK_RELOAD_SECONDS가 0이면 감시하지 않음."""
+    interval = get_settings().rule_pack_reload_seconds
+    if interval <= 0:
+        return None
+    return asyncio.create_task(watch_rule_pack(interval))
+
+
+def _ruleset_info_metric() -> Dict[tuple, float]:
+    rule_set = _RULE_SET
+    return {(rule_set.version, rule_set.digest): 1.0} if rule_set is not None else {}
+
+
+REGISTRY.register(
+    CallbackGauge(
+        "ai_server_ruleset_info",
+        "Rule pack version and content digest currently serving requests.",
+        ("version", "digest"),
+        _ruleset_info_metric,
+    )
+)
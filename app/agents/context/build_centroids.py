@@ -0,0 +1,59 @@
+"""프로토타입 centroid 아티팩트 생성 CLI.
+
+    python -m app.agents.context.build_centroids          # 아티팩트가 최신이 아니면 다시 계산
+    python -m app.agents.context.build_centroids --force  # 항상 다시 계산
+    python -m app.agents.context.build_centroids --check  # 최신 여부만 확인 (최신이 아니면 종료 코드 1)
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from app.agents.context.centroid_artifact import load_centroid_artifact
+from app.agents.context.conversation_type_classifier import (
+    build_prototype_centroids,
+    centroids_path,
+    embedding_model_name,
+    get_embedding_backend,
+    prototypes_version,
+)
+
+
+def _is_up_to_date() -> bool:
+    artifact = load_centroid_artifact(centroids_path())
+    return artifact is not None and artifact.matches(prototypes_version(), embedding_model_name())
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build the prototype centroid artifact.")
+    parser.add_argument("--force", action="store_true", help="최신이어도 다시 계산")
+    parser.add_argument("--check", action="store_true", help="계산하지 않고 최신 여부만 확인")
+    args = parser.parse_args(argv)
+
+    backend = get_embedding_backend()
+    if not backend.remote:
+        print(f"{backend.name} embedding backend computes centroids at startup; no artifact needed")
+        return 0
+
+    path = centroids_path()
+    up_to_date = _is_up_to_date()
+    if args.check:
+        print(f"{path}: {'up to date' if up_to_date else 'stale'}")
+        return 0 if up_to_date else 1
+    if up_to_date and not args.force:
+        print(f"{path}: up to date")
+        return 0
+
+    centroids = build_prototype_centroids(store=True)
+    if not _is_up_to_date():
+        print(f"{path}: failed to write artifact", file=sys.stderr)
+        return 1
+    print(
+        f"{path}: wrote {len(centroids)} centroids "
+        f"(prototypes={prototypes_version()}, model={embedding_model_name()})"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+ARTIFACT_FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class CentroidArtifact:
+    """프로토타입 파일 해시와 임베딩 모델 기준으로 버전이 매겨진 카테고리별 centroid."""
+
+    prototypes_version: str
+    embedding_model: str
+    default_category: str
+    centroids: Dict[str, List[float]]
+
+    def matches(self, prototypes_version: str, embedding_model: str) -> bool:
+        return (
+            self.prototypes_version == prototypes_version
+            and self.embedding_model == embedding_model
+        )
+
+
+def load_centroid_artifact(path: Path) -> Optional[CentroidArtifact]:
+    """파일이 없거나 형식이 맞지 않으면 None."""
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as exc:
+        logger.warning("Failed to read centroid artifact (%s): %s", path, exc)
+        return None
+
+    if payload.get("format_version") != ARTIFACT_FORMAT_VERSION:
+        return None
+    try:
+        centroids = {
+            str(category): [float(value) for value in vector]
+            for category, vector in payload["centroids"].items()
+        }
+        return CentroidArtifact(
+            prototypes_version=str(payload["prototypes_version"]),
+            embedding_model=str(payload["embedding_model"]),
+            default_category=str(payload["default_category"]),
+            centroids=centroids,
+        )
+    except (KeyError, TypeError, ValueError, AttributeError) as exc:
+        logger.warning("Invalid centroid artifact (%s): %s", path, exc)
+        return None
+
+
+def write_centroid_artifact(path: Path, artifact: CentroidArtifact) -> bool:
+    """임시 파일에 쓴 뒤 교체. 읽기 전용 파일 시스템 등으로 실패하면 False."""
+    payload = {
+        "format_version": ARTIFACT_FORMAT_VERSION,
+        "prototypes_version": artifact.prototypes_version,
+        "embedding_model": artifact.embedding_model,
+        "default_category": artifact.default_category,
+        "centroids": artifact.centroids,
+    }
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError as exc:
+        logger.warning("Failed to write centroid artifact (%s): %s", path, exc)
+        tmp_path.unlink(missing_ok=True)
+        return False
+    return True
@@ -0,0 +1,64 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    # 영벡터는 0으로 남겨 모든 카테고리와의 유사도가 0이 되도록 함
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def as_embedding_matrix(embeddings: Sequence[Sequence[float]]) -> np.ndarray:
+    """임베딩 목록을 (n, d) float32 C-연속 행렬로 변환."""
+    return np.ascontiguousarray(np.asarray(embeddings, dtype=np.float32))
+
+
+class CentroidIndex:
+    """카테고리별 centroid를 L2 정규화한 float32 행렬로 보관.
+
+    질의 임베딩도 정규화하므로 코사인 유사도가 행렬 곱 한 번이 됨. 여러 질의를 한 번에 점수화할 수
+    있고, 프로토타입 수와 무관하게 질의당 비용은 카테고리 수 x 차원.
+    """
+
+    def __init__(self, centroids: Dict[str, List[float]], default_category: str) -> None:
+        self.categories: Tuple[str, ...] = tuple(centroids.keys())
+        self.default_category = default_category
+        # 아티팩트에는 정규화 전 평균 벡터를 그대로 저장
+        self.centroids = centroids
+        if self.categories:
+            self.matrix = _normalize_rows(
+                as_embedding_matrix([centroids[category] for category in self.categories])
+            )
+        else:
+            self.matrix = np.zeros((0, 0), dtype=np.float32)
+
+    @classmethod
+    def from_embeddings(
+        cls,
+        category_slices: List[Tuple[str, int, int]],
+        embeddings: Sequence[Sequence[float]],
+        default_category: str,
+    ) -> "CentroidIndex":
+        """프로토타입 임베딩 (카테고리별로 연속 구간)의 카테고리별 평균으로 생성."""
+        matrix = as_embedding_matrix(embeddings)
+        centroids: Dict[str, List[float]] = {}
+        for category, start, end in category_slices:
+            if end > start:
+                # 누적은 float64로 해서 샘플이 많아도 정밀도가 떨어지지 않도록 함
+                centroids[category] = matrix[start:end].mean(axis=0, dtype=np.float64).tolist()
+        return cls(centroids, default_category)
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def scores(self, embeddings: Sequence[Sequence[float]]) -> np.ndarray:
+        """(질의 수, 카테고리 수) 코사인 유사도."""
+        return _normalize_rows(as_embedding_matrix(embeddings)) @ self.matrix.T
+
+    def best_categories(self, embeddings: Sequence[Sequence[float]]) -> List[Optional[str]]:
+        """질의별 가장 가까운 카테고리. 카테고리가 없으면 None. 동점이면 먼저 정의된 카테고리."""
+        if not self.categories or len(embeddings) == 0:
+            return [None] * len(embeddings)
+        best = np.argmax(self.scores(embeddings), axis=1)
+        return [self.categories[idx] for idx in best]
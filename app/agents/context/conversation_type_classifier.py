@@ -1,60 +1,130 @@
+import asyncio
+import hashlib
 import json
-import math
-import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-
-from openai import OpenAI
-from dotenv import load_dotenv
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
 
+from app.agents.analyzer.rule_set import get_rule_set
+from app.agents.context.centroid_artifact import (
+    CentroidArtifact,
+    load_centroid_artifact,
+    write_centroid_artifact,
+)
+from app.agents.context.embedding_backends import EmbeddingBackend, create_embedding_backend
+from app.agents.context.embedding_batcher import EmbeddingBatcher
+from app.agents.context.embedding_cache import EmbeddingCache, get_embedding_cache
+from app.core.admission import OverloadedError
+from app.core.config import get_settings
+from app.core.deadline import Deadline, DeadlineExceeded, degrade_reason, resolve_deadline
 from app.core.logging import get_logger
-from app.utils.text_patterns import CONVERSATION_TYPE_RULES
-from app.utils.text_utils import normalize_text
-
-logger = get_logger(__name__)
+from app.core.metrics import (
+    observe_stage,
+    record_classification_path,
+    record_error,
+    record_fallback,
+)
+from app.core.tracing import traced
+from app.schemas.conversation import NormalizedConversation
 
+if TYPE_CHECKING:
+    from app.agents.context.centroid_index import CentroidIndex
 
-load_dotenv()
+logger = get_logger(__name__)
 
 
 ALLOWED_CONTEXT_TYPES = ["구직", "중고거래", "재테크", "부업"]
-EMBEDDING_MODEL_ENV = "OPENAI_EMBEDDING_MODEL"
-DEFAULT_EMBEDDING_MODEL = "text-embedding-3-small"
 PROTOTYPES_PATH = (
     Path(__file__).resolve().parents[1] / "analyzer" / "embedding_prototypes.json"
 )
+DEFAULT_CENTROIDS_PATH = PROTOTYPES_PATH.with_name("embedding_prototypes.centroids.json")
 
-_EMBEDDING_CLIENT: Optional[OpenAI] = None
-_PROTOTYPE_CENTROIDS: Optional[Dict[str, List[float]]] = None
-_DEFAULT_CATEGORY: Optional[str] = None
+_EMBEDDING_BACKEND: Optional[EmbeddingBackend] = None
+_EMBEDDING_BATCHER: Optional[EmbeddingBatcher] = None
+_PROTOTYPE_CENTROIDS: Optional["CentroidIndex"] = None
+_CENTROID_LOCK = asyncio.Lock()
 
 
-def _get_client() -> OpenAI:
-    global _EMBEDDING_CLIENT
-    if _EMBEDDING_CLIENT is None:
-        _EMBEDDING_CLIENT = OpenAI()
-    return _EMBEDDING_CLIENT
+def get_embedding_backend() -> EmbeddingBackend:
+    global _EMBEDDING_BACKEND
+    if _EMBEDDING_BACKEND is None:
+        _EMBEDDING_BACKEND = create_embedding_backend(get_settings())
+    return _EMBEDDING_BACKEND
 
 
-def _cosine_similarity(a: List[float], b: List[float]) -> float:
-    dot = 0.0
-    norm_a = 0.0
-    norm_b = 0.0
-    for x, y in zip(a, b):
-        dot += x * y
-        norm_a += x * x
-        norm_b += y * y
-    if norm_a == 0.0 or norm_b == 0.0:
-        return 0.0
-    return dot / (math.sqrt(norm_a) * math.sqrt(norm_b))
+def embedding_model_name() -> str:
+    return get_embedding_backend().model
 
 
-def _embed_texts(texts: List[str]) -> List[List[float]]:
-    client = _get_client()
-    model = os.getenv(EMBEDDING_MODEL_ENV, DEFAULT_EMBEDDING_MODEL)
-    response = client.embeddings.create(model=model, input=texts)
-    data = sorted(response.data, key=lambda item: item.index)
-    return [item.embedding for item in data]
+def _get_embedding_batcher(backend: EmbeddingBackend) -> Optional[EmbeddingBatcher]:
+    """EMBEDDING_BATCH_WINDOW_MS가 0이면 None (호출마다 바로 전송)."""
+    global _EMBEDDING_BATCHER
+    settings = get_settings()
+    if settings.embedding_batch_window_ms <= 0:
+        return None
+    if _EMBEDDING_BATCHER is None:
+        _EMBEDDING_BATCHER = EmbeddingBatcher(
+            backend.embed_async,
+            settings.embedding_batch_window_ms / 1000.0,
+            settings.embedding_batch_max_items,
+        )
+    return _EMBEDDING_BATCHER
+
+
+def _missing_texts(texts: List[str], found: Dict[str, Sequence[float]]) -> List[str]:
+    """캐시에 없어 API로 요청할 고유 입력."""
+    return list(dict.fromkeys(text for text in texts if text not in found))
+
+
+def _store_fetched(
+    cache: Optional[EmbeddingCache],
+    model: str,
+    found: Dict[str, Sequence[float]],
+    missing: List[str],
+    embeddings: List[Sequence[float]],
+) -> None:
+    fetched = dict(zip(missing, embeddings))
+    if cache is not None:
+        cache.set_many(model, fetched)
+    found.update(fetched)
+
+
+def _embed_texts(texts: List[str]) -> List[Sequence[float]]:
+    backend = get_embedding_backend()
+    if not backend.remote:
+        return backend.embed(texts)
+    cache = get_embedding_cache()
+    found = cache.get_many(backend.model, texts) if cache is not None else {}
+    missing = _missing_texts(texts, found)
+    if missing:
+        _store_fetched(cache, backend.model, found, missing, backend.embed(missing))
+    return [found[text] for text in texts]
+
+
+async def _embed_texts_async(texts: List[str]) -> List[Sequence[float]]:
+    backend = get_embedding_backend()
+    if not backend.remote:
+        # 로컬 백엔드는 캐시 조회보다 계산이 빠름
+        return await backend.embed_async(texts)
+    # 같은 사기 스크립트의 입력이 반복되므로 캐시에 없는 입력만 API로 요청
+    cache = get_embedding_cache()
+    found = await cache.get_many_async(backend.model, texts) if cache is not None else {}
+    missing = _missing_texts(texts, found)
+    if missing:
+        # 동시에 처리 중인 다른 요청의 입력과 묶어 한 번에 요청
+        batcher = _get_embedding_batcher(backend)
+        if batcher is not None:
+            embeddings = await batcher.embed(missing)
+        else:
+            embeddings = await backend.embed_async(missing)
+        _store_fetched(cache, backend.model, found, missing, embeddings)
+    return [found[text] for text in texts]
+
+
+@lru_cache(maxsize=1)
+def prototypes_version() -> str:
+    """프로토타입 파일 내용 해시. 캐시 키에 사용."""
+    return hashlib.sha256(PROTOTYPES_PATH.read_bytes()).hexdigest()[:16]
 
 
 def _load_prototypes() -> Tuple[Dict[str, List[str]], str]:
@@ -74,11 +144,7 @@ def _load_prototypes() -> Tuple[Dict[str, List[str]], str]:
     return prototype_map, default_category or ALLOWED_CONTEXT_TYPES[0]
 
 
-def _get_prototype_centroids() -> Tuple[Dict[str, List[float]], str]:
-    global _PROTOTYPE_CENTROIDS, _DEFAULT_CATEGORY
-    if _PROTOTYPE_CENTROIDS is not None and _DEFAULT_CATEGORY is not None:
-        return _PROTOTYPE_CENTROIDS, _DEFAULT_CATEGORY
-
+def _prototype_batch() -> Tuple[List[str], List[Tuple[str, int, int]], str]:
     prototype_map, default_category = _load_prototypes()
     if not prototype_map:
         raise ValueError("No embedding prototypes found.")
@@ -90,29 +156,91 @@ def _get_prototype_centroids() -> Tuple[Dict[str, List[float]], str]:
         all_samples.extend(samples)
         category_slices.append((category, cursor, cursor + len(samples)))
         cursor += len(samples)
+    return all_samples, category_slices, default_category
+
+
+def centroids_path() -> Path:
+    configured = get_settings().centroids_path
+    return Path(configured) if configured else DEFAULT_CENTROIDS_PATH
+
+
+def _load_stored_centroids() -> Optional["CentroidIndex"]:
+    if not get_embedding_backend().remote:
+        # 로컬 백엔드는 프로토타입 임베딩이 즉시 끝나므로 아티팩트 없이 매번 계산
+        return None
+    # numpy는 import 비용이 커서 centroid를 처음 로드할 때(워밍업) 가져옴
+    from app.agents.context.centroid_index import CentroidIndex
+
+    # 프로토타입 파일 해시와 임베딩 모델이 같을 때만 저장된 centroid를 사용
+    path = centroids_path()
+    artifact = load_centroid_artifact(path)
+    if artifact is None:
+        return None
+    if not artifact.matches(prototypes_version(), embedding_model_name()):
+        logger.info("Centroid artifact is stale (%s); rebuilding.", path)
+        return None
+    return CentroidIndex(artifact.centroids, artifact.default_category)
+
+
+def _store_centroids(index: "CentroidIndex") -> bool:
+    if not get_embedding_backend().remote:
+        return False
+    artifact = CentroidArtifact(
+        prototypes_version=prototypes_version(),
+        embedding_model=embedding_model_name(),
+        default_category=index.default_category,
+        centroids=index.centroids,
+    )
+    return write_centroid_artifact(centroids_path(), artifact)
 
+
+def build_prototype_centroids(store: bool = True) -> "CentroidIndex":
+    """프로토타입 전체를 임베딩해 centroid를 계산. store면 아티팩트로 저장."""
+    from app.agents.context.centroid_index import CentroidIndex
+
+    all_samples, category_slices, default_category = _prototype_batch()
     embeddings = _embed_texts(all_samples)
-    centroids: Dict[str, List[float]] = {}
-    for category, start, end in category_slices:
-        vectors = embeddings[start:end]
-        if not vectors:
-            continue
-        vector_len = len(vectors[0])
-        mean_vector = [0.0] * vector_len
-        for vector in vectors:
-            for idx in range(vector_len):
-                mean_vector[idx] += vector[idx]
-        count = float(len(vectors))
-        mean_vector = [value / count for value in mean_vector]
-        centroids[category] = mean_vector
-
-    _PROTOTYPE_CENTROIDS = centroids
-    _DEFAULT_CATEGORY = default_category
-    return centroids, default_category
-
-
-def _build_embedding_input(conversation: List[str], max_chars: int = 4000) -> str:
-    parts = [line.strip() for line in conversation if line and line.strip()]
+    index = CentroidIndex.from_embeddings(category_slices, embeddings, default_category)
+    if store:
+        _store_centroids(index)
+    return index
+
+
+async def _get_prototype_centroids_async() -> "CentroidIndex":
+    global _PROTOTYPE_CENTROIDS
+    if _PROTOTYPE_CENTROIDS is not None:
+        return _PROTOTYPE_CENTROIDS
+
+    # 동시 요청이 프로토타입 임베딩을 중복 호출하지 않도록 한 번만 계산
+    async with _CENTROID_LOCK:
+        if _PROTOTYPE_CENTROIDS is not None:
+            return _PROTOTYPE_CENTROIDS
+
+        # 아티팩트 JSON 파싱과 행렬 변환은 프로토타입 수에 비례하므로 스레드에서 실행
+        index = await asyncio.to_thread(_load_stored_centroids)
+        if index is None:
+            from app.agents.context.centroid_index import CentroidIndex
+
+            all_samples, category_slices, default_category = _prototype_batch()
+            with observe_stage("prototype_embedding"):
+                embeddings = await _embed_texts_async(all_samples)
+            index = await asyncio.to_thread(
+                CentroidIndex.from_embeddings, category_slices, embeddings, default_category
+            )
+            # 다음 워커부터는 네트워크 호출 없이 바로 로드하도록 저장
+            await asyncio.to_thread(_store_centroids, index)
+
+        _PROTOTYPE_CENTROIDS = index
+        return index
+
+
+async def warm_prototype_centroids() -> int:
+    """centroid를 미리 로드(없으면 계산). 카테고리 수를 반환."""
+    return len(await _get_prototype_centroids_async())
+
+
+def _build_embedding_input(conversation: NormalizedConversation, max_chars: int = 4000) -> str:
+    parts = [message.raw.strip() for message in conversation.contents]
     text = "\n".join(parts).strip()
     if not text:
         return ""
@@ -122,14 +250,29 @@ def _build_embedding_input(conversation: List[str], max_chars: int = 4000) -> st
     return text[-max_chars:]
 
 
-def _rule_based_classify(conversation: List[str]) -> Optional[str]:
-    scores: Dict[str, int] = {key: 0 for key in CONVERSATION_TYPE_RULES.keys()}
-    for message in conversation:
-        normalized = normalize_text(message)
-        for conversation_type, patterns in CONVERSATION_TYPE_RULES.items():
-            if any(pattern.search(normalized) for pattern in patterns):
-                scores[conversation_type] += 1
+def _rule_based_classify(conversation: NormalizedConversation) -> Optional[str]:
+    with observe_stage("classification_rule"):
+        return _score_rule_based(conversation)
+
+
+def _rule_type_scores(conversation: NormalizedConversation) -> Dict[str, int]:
+    """유형별로 규칙이 하나라도 매칭된 메시지 수."""
+    rules = get_rule_set()
+    scores: Dict[str, int] = {key: 0 for key in rules.pack.conversation_type_rules.keys()}
+    for message in conversation.contents:
+        normalized = message.normalized
+        matched_types = set()
+        for idx in rules.type_prefilter.candidates(normalized):
+            conversation_type, pattern = rules.type_rules[idx]
+            if conversation_type not in matched_types and pattern.search(normalized):
+                matched_types.add(conversation_type)
+        for conversation_type in matched_types:
+            scores[conversation_type] += 1
+    return scores
 
+
+def _score_rule_based(conversation: NormalizedConversation) -> Optional[str]:
+    scores = _rule_type_scores(conversation)
     if not scores:
         return None
 
@@ -141,46 +284,137 @@ def _rule_based_classify(conversation: List[str]) -> Optional[str]:
     return best_type
 
 
-def classify_conversation_type(conversation: List[str]) -> str:
+def _cascade_classify(conversation: NormalizedConversation) -> Optional[str]:
+    """규칙 점수만으로 확실한 대화는 임베딩 없이 결정. 애매하면 None.
+
+    1위 유형의 매칭 메시지 수가 CLASSIFIER_CASCADE_MIN_HITS 이상이고 2위보다
+    CLASSIFIER_CASCADE_MARGIN 이상 많을 때만 확정.
+    """
+    settings = get_settings()
+    if not settings.classifier_cascade_enabled:
+        return None
+    with observe_stage("classification_rule"):
+        scores = _rule_type_scores(conversation)
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    if not ranked:
+        return None
+    best_type, best_hits = ranked[0]
+    runner_up_hits = ranked[1][1] if len(ranked) > 1 else 0
+    if (
+        best_type not in ALLOWED_CONTEXT_TYPES
+        or best_hits < settings.classifier_cascade_min_hits
+        or best_hits - runner_up_hits < settings.classifier_cascade_margin
+    ):
+        return None
+    record_classification_path("rule")
+    return best_type
+
+
+def _fallback_classify(conversation: NormalizedConversation, default_category: str) -> str:
+    record_fallback("classification")
+    record_classification_path("fallback")
+    fallback_type = _rule_based_classify(conversation)
+    if fallback_type:
+        return fallback_type
+    return default_category
+
+
+def _resolve_category(
+    conversation: NormalizedConversation, best_category: Optional[str], default_category: str
+) -> str:
+    if best_category is None or best_category not in ALLOWED_CONTEXT_TYPES:
+        return _fallback_classify(conversation, default_category)
+    record_classification_path("embedding")
+    return best_category
+
+
+@traced()
+async def classify_conversation_type_async(
+    conversation: NormalizedConversation, deadline: Optional[Deadline] = None
+) -> str:
     """대화 유형 분류. risk_stage에는 영향을 주지 않음."""
+    return (await classify_conversation_types_async([conversation], deadline=deadline))[0]
+
+
+@traced()
+async def classify_conversation_types_async(
+    conversations: List[NormalizedConversation], deadline: Optional[Deadline] = None
+) -> List[str]:
+    """여러 대화를 한 번의 임베딩 호출로 분류. 대화별 fallback 동작은 동일.
+
+    cascade가 켜져 있으면 규칙으로 확정된 대화는 임베딩하지 않음.
+    """
+    deadline = resolve_deadline(deadline)
+    results = [_cascade_classify(conversation) for conversation in conversations]
+    pending = [idx for idx, result in enumerate(results) if result is None]
+    if pending:
+        embedded = await _classify_by_embedding_async(
+            [conversations[idx] for idx in pending], deadline
+        )
+        for idx, result in zip(pending, embedded):
+            results[idx] = result
+    return results
+
+
+async def _classify_by_embedding_async(
+    conversations: List[NormalizedConversation], deadline: Deadline
+) -> List[str]:
     try:
-        centroids, default_category = _get_prototype_centroids()
+        # 프로토타입 계산은 다른 요청과 공유되므로 예산 초과로 취소되지 않도록 보호
+        index = await deadline.run(
+            asyncio.shield(_get_prototype_centroids_async())
+        )
+    except (DeadlineExceeded, OverloadedError) as exc:
+        logger.warning(
+            "Embedding prototypes not ready (%s); using rule fallback.", degrade_reason(exc)
+        )
+        deadline.mark_degraded("classification")
+        return [
+            _fallback_classify(conversation, ALLOWED_CONTEXT_TYPES[0])
+            for conversation in conversations
+        ]
     except Exception as exc:
         logger.exception("Failed to load embedding prototypes: %s", exc)
-        fallback_type = _rule_based_classify(conversation)
-        if fallback_type:
-            return fallback_type
-        return ALLOWED_CONTEXT_TYPES[0]
-
-    text = _build_embedding_input(conversation)
-    if not text:
-        fallback_type = _rule_based_classify(conversation)
-        if fallback_type:
-            return fallback_type
-        return default_category
+        record_error("prototype_embedding")
+        deadline.mark_fallback("classification")
+        return [
+            _fallback_classify(conversation, ALLOWED_CONTEXT_TYPES[0])
+            for conversation in conversations
+        ]
+
+    default_category = index.default_category
+    texts = [_build_embedding_input(conversation) for conversation in conversations]
+    results: List[Optional[str]] = [
+        None if text else _fallback_classify(conversation, default_category)
+        for conversation, text in zip(conversations, texts)
+    ]
+    # 같은 스크립트가 반복되는 경우가 많아 동일 입력은 한 번만 임베딩
+    unique_texts = list(dict.fromkeys(text for text in texts if text))
+    if not unique_texts:
+        return [result or default_category for result in results]
 
     try:
-        embedding = _embed_texts([text])[0]
-        scores = {
-            category: _cosine_similarity(embedding, centroid)
-            for category, centroid in centroids.items()
-        }
-        if not scores:
-            fallback_type = _rule_based_classify(conversation)
-            if fallback_type:
-                return fallback_type
-            return default_category
-        sorted_scores = sorted(scores.items(), key=lambda item: item[1], reverse=True)
-        best_category = sorted_scores[0][0]
-        if best_category not in ALLOWED_CONTEXT_TYPES:
-            fallback_type = _rule_based_classify(conversation)
-            if fallback_type:
-                return fallback_type
-            return default_category
-        return best_category
+        with observe_stage("classification_embedding"):
+            embeddings = await deadline.run(_embed_texts_async(unique_texts))
+        # 고유 입력 전체를 행렬 곱 한 번으로 점수화
+        best_by_text = dict(zip(unique_texts, index.best_categories(embeddings)))
+        for idx, (conversation, text) in enumerate(zip(conversations, texts)):
+            if results[idx] is None:
+                results[idx] = _resolve_category(
+                    conversation, best_by_text[text], default_category
+                )
     except Exception as exc:
-        logger.exception("Embedding classification failed: %s", exc)
-        fallback_type = _rule_based_classify(conversation)
-        if fallback_type:
-            return fallback_type
-        return default_category
+        if isinstance(exc, (DeadlineExceeded, OverloadedError)):
+            logger.warning(
+                "Embedding classification skipped (%s); using rule fallback.",
+                degrade_reason(exc),
+            )
+            deadline.mark_degraded("classification")
+        else:
+            logger.exception("Embedding classification failed: %s", exc)
+            record_error("classification")
+            deadline.mark_fallback("classification")
+        for idx, conversation in enumerate(conversations):
+            if results[idx] is None:
+                results[idx] = _fallback_classify(conversation, default_category)
+    return [result or default_category for result in results]
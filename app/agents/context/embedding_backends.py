@@ -0,0 +1,138 @@
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+from app.core.admission import EMBEDDINGS, get_limiter
+from app.core.config import Settings
+from app.core.tracing import span
+from app.utils.text_utils import normalize_text
+
+if TYPE_CHECKING:
+    import numpy as np
+    from openai import AsyncOpenAI, OpenAI
+
+_EMBEDDING_CLIENT: Optional["OpenAI"] = None
+_ASYNC_EMBEDDING_CLIENT: Optional["AsyncOpenAI"] = None
+
+# 64비트 곱셈-xorshift 해시 상수 (splitmix64). 프로세스마다 달라지는 hash() 대신 사용
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_HASH_MIX = 0xBF58476D1CE4E5B9
+
+
+def _get_client() -> "OpenAI":
+    global _EMBEDDING_CLIENT
+    if _EMBEDDING_CLIENT is None:
+        from openai import OpenAI
+
+        _EMBEDDING_CLIENT = OpenAI()
+    return _EMBEDDING_CLIENT
+
+
+def _get_async_client() -> "AsyncOpenAI":
+    global _ASYNC_EMBEDDING_CLIENT
+    if _ASYNC_EMBEDDING_CLIENT is None:
+        from openai import AsyncOpenAI
+
+        _ASYNC_EMBEDDING_CLIENT = AsyncOpenAI()
+    return _ASYNC_EMBEDDING_CLIENT
+
+
+class EmbeddingBackend(ABC):
+    """대화 유형 분류용 임베딩 계산 방식.
+
+    model은 임베딩 캐시 키, centroid 아티팩트, 결과 캐시 키에 쓰는 식별자로 벡터가 달라지는
+    변경(차원, 알고리즘)이 있으면 함께 바뀌어야 함.
+    """
+
+    name = ""
+    # 네트워크 호출 여부. 원격 백엔드만 임베딩 캐시와 centroid 아티팩트를 사용
+    remote = False
+
+    def __init__(self, model: str) -> None:
+        self.model = model
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> List[Sequence[float]]:
+        """texts와 같은 순서의 임베딩 벡터."""
+
+    async def embed_async(self, texts: List[str]) -> List[Sequence[float]]:
+        return self.embed(texts)
+
+    def warm(self) -> None:
+        """첫 요청 전에 클라이언트 생성/import 비용을 미리 치름."""
+
+
+class OpenAIEmbeddingBackend(EmbeddingBackend):
+    name = "openai"
+    remote = True
+
+    def embed(self, texts: List[str]) -> List[Sequence[float]]:
+        client = _get_client()
+        with span("openai.embeddings", model=self.model, inputs=len(texts)):
+            response = client.embeddings.create(model=self.model, input=texts)
+        data = sorted(response.data, key=lambda item: item.index)
+        return [item.embedding for item in data]
+
+    async def embed_async(self, texts: List[str]) -> List[Sequence[float]]:
+        client = _get_async_client()
+        async with get_limiter(EMBEDDINGS).acquire():
+            with span("openai.embeddings", model=self.model, inputs=len(texts)):
+                response = await client.embeddings.create(model=self.model, input=texts)
+        data = sorted(response.data, key=lambda item: item.index)
+        return [item.embedding for item in data]
+
+    def warm(self) -> None:
+        _get_async_client()
+
+
+class HashedNgramEmbeddingBackend(EmbeddingBackend):
+    """문자 n-gram을 고정 차원으로 해싱한 로컬 임베딩. 네트워크 없이 대화당 수십~수백 µs.
+
+    n-gram마다 해시로 칸과 부호(+1/-1)를 정해 더하고 (충돌이 한쪽으로 쌓이지 않도록),
+    반복 표현이 벡터를 지배하지 않도록 sign(x)·log(1+|x|)로 줄임. 의미가 아니라 표현이
+    겹치는 정도로 비교하므로 프로토타입 문장의 어휘가 정확도를 좌우함.
+    """
+
+    name = "local"
+    # 알고리즘을 바꾸면 올려서 이전 벡터로 만든 centroid/캐시를 쓰지 않도록 함
+    version = 1
+
+    def __init__(self, dimensions: int, ngram_sizes: Tuple[int, ...] = (1, 2, 3)) -> None:
+        sizes = "".join(str(size) for size in ngram_sizes)
+        super().__init__(f"local-char-ngram-v{self.version}-{sizes}-{dimensions}")
+        self.dimensions = dimensions
+        self.ngram_sizes = ngram_sizes
+
+    def _vector(self, text: str) -> "np.ndarray":
+        import numpy as np
+
+        # 코드포인트 배열에서 n-gram 해시를 한 번에 계산 (uint64 곱셈은 2^64로 감김)
+        codes = np.frombuffer(normalize_text(text).encode("utf-32-le"), dtype=np.uint32)
+        codes = codes.astype(np.uint64)
+        multiplier = np.uint64(_HASH_MULTIPLIER)
+        counts = np.zeros(self.dimensions, dtype=np.float64)
+        for size in self.ngram_sizes:
+            width = len(codes) - size + 1
+            if width <= 0:
+                continue
+            hashes = np.full(width, size, dtype=np.uint64)
+            for offset in range(size):
+                hashes = (hashes ^ codes[offset : offset + width]) * multiplier
+            hashes ^= hashes >> np.uint64(31)
+            hashes *= np.uint64(_HASH_MIX)
+            hashes ^= hashes >> np.uint64(29)
+            slots = (hashes % np.uint64(self.dimensions)).astype(np.intp)
+            signs = np.where(hashes >> np.uint64(63), -1.0, 1.0)
+            counts += np.bincount(slots, weights=signs, minlength=self.dimensions)
+        return (np.sign(counts) * np.log1p(np.abs(counts))).astype(np.float32)
+
+    def embed(self, texts: List[str]) -> List[Sequence[float]]:
+        return [self._vector(text) for text in texts]
+
+    def warm(self) -> None:
+        self._vector("warmup")
+
+
+def create_embedding_backend(settings: Settings) -> EmbeddingBackend:
+    if settings.embedding_backend == HashedNgramEmbeddingBackend.name:
+        return HashedNgramEmbeddingBackend(settings.local_embedding_dimensions)
+    return OpenAIEmbeddingBackend(settings.embedding_model)
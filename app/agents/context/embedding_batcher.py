@@ -0,0 +1,101 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Set
+
+from app.core.metrics import record_embedding_batch, record_embedding_coalesced
+
+EmbedFunction = Callable[[List[str]], Awaitable[List[Sequence[float]]]]
+
+
+class EmbeddingBatcher:
+    """동시 요청의 임베딩 입력을 짧은 구간 동안 모아 한 번의 API 호출로 보내고 결과를 나눠 줌.
+
+    첫 입력이 들어온 뒤 window_seconds가 지나거나 모인 입력이 max_items 이상이 되면 전송하고,
+    API 호출 하나에는 최대 max_items개만 담음 (넘으면 나눠서 동시에 전송).
+    같은 구간의 동일 입력은 한 번만 보내고 결과를 공유함. 호출자가 예산 초과로 취소되어도
+    배치는 그대로 진행되어 같은 배치의 다른 호출자에게 영향을 주지 않음.
+    """
+
+    def __init__(self, embed: EmbedFunction, window_seconds: float, max_items: int) -> None:
+        self._embed = embed
+        self.window_seconds = window_seconds
+        self.max_items = max(1, max_items)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # 전송 중인 배치 task가 GC되지 않도록 참조 유지
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # 이전 이벤트 루프(벤치마크의 asyncio.run 반복 등)에 묶인 대기 상태는 버림
+            self._loop = loop
+            self._pending = {}
+            self._timer = None
+            self._tasks = set()
+        return loop
+
+    async def embed(self, texts: List[str]) -> List[Sequence[float]]:
+        loop = self._bind_loop()
+        futures: Dict[str, asyncio.Future] = {}
+        coalesced = 0
+        for text in dict.fromkeys(texts):
+            future = self._pending.get(text)
+            if future is None:
+                future = loop.create_future()
+                self._pending[text] = future
+            else:
+                coalesced += 1
+            futures[text] = future
+        if coalesced:
+            record_embedding_coalesced(coalesced)
+
+        if len(self._pending) >= self.max_items:
+            self._flush()
+        elif self._timer is None and self._pending:
+            self._timer = loop.call_later(self.window_seconds, self._flush)
+
+        # shield: 이 호출자가 취소되어도 공유 future는 취소하지 않음
+        results = await asyncio.gather(*(asyncio.shield(future) for future in futures.values()))
+        by_text = dict(zip(futures, results))
+        return [by_text[text] for text in texts]
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, {}
+        items = list(pending.items())
+        loop = asyncio.get_running_loop()
+        # 한 번에 많은 입력이 들어와도 API 호출당 입력은 max_items 이하 (요청당 입력 수 제한)
+        for start in range(0, len(items), self.max_items):
+            batch = dict(items[start : start + self.max_items])
+            # 배치 task는 전송을 시작한 호출자의 context(trace)를 이어받음
+            task = loop.create_task(self._send(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: Dict[str, asyncio.Future]) -> None:
+        texts = list(batch)
+        record_embedding_batch(len(texts))
+        try:
+            embeddings = await self._embed(texts)
+            if len(embeddings) != len(texts):
+                raise RuntimeError(
+                    f"embedding batch returned {len(embeddings)} vectors for {len(texts)} inputs"
+                )
+        except asyncio.CancelledError:
+            # 종료 시 루프가 task를 취소한 경우
+            for future in batch.values():
+                future.cancel()
+            raise
+        except Exception as exc:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+                    # 모든 호출자가 이미 취소된 경우 "exception was never retrieved" 로그 방지
+                    future.exception()
+            return
+        for future, embedding in zip(batch.values(), embeddings):
+            if not future.done():
+                future.set_result(embedding)
@@ -0,0 +1,259 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.metrics import record_cache_lookup, register_cache_size
+from app.utils.ttl_cache import TTLCache
+
+logger = get_logger(__name__)
+
+# SQLite 바인딩 변수 개수 제한(구버전 999)보다 작게 나눠 조회
+_SQLITE_CHUNK = 500
+
+
+def embedding_cache_key(model: str, text: str) -> str:
+    """(임베딩 모델, 입력 텍스트) 해시. 긴 입력 텍스트를 키로 들고 있지 않도록 해시만 사용."""
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+def _encode(vector: Sequence[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _decode(blob: bytes) -> "array[float]":
+    vector = array("f")
+    vector.frombytes(blob)
+    return vector
+
+
+class _SqliteEmbeddingStore:
+    """같은 호스트의 워커가 공유하는 SQLite 계층. 실패하면 경고만 남기고 미스로 처리.
+
+    이벤트 루프에서는 전용 스레드 하나(executor)로만 접근해 잠금 대기(busy timeout)가 다른
+    요청을 막지 않도록 함. rows는 연 시점의 행 수에 이 워커가 추가한 행을 더한 근사치
+    (다른 워커의 쓰기는 반영하지 않음).
+    """
+
+    def __init__(self, path: Path, ttl_seconds: Optional[float]) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding-cache")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(path), timeout=5.0, check_same_thread=False, isolation_level=None
+        )
+        # WAL: 다른 워커가 쓰는 중에도 읽기가 막히지 않음
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._prune()
+        self.rows = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def _cutoff(self) -> Optional[float]:
+        return time.time() - self.ttl_seconds if self.ttl_seconds is not None else None
+
+    def _prune(self) -> None:
+        # 워커가 시작할 때마다 만료된 행을 정리해 파일이 계속 커지지 않도록 함
+        cutoff = self._cutoff()
+        if cutoff is not None:
+            with self._lock:
+                self._conn.execute("DELETE FROM embeddings WHERE stored_at < ?", (cutoff,))
+
+    def get_many(self, keys: List[str]) -> Dict[str, "array[float]"]:
+        cutoff = self._cutoff()
+        found: Dict[str, "array[float]"] = {}
+        try:
+            with self._lock:
+                for start in range(0, len(keys), _SQLITE_CHUNK):
+                    chunk = keys[start : start + _SQLITE_CHUNK]
+                    rows = self._conn.execute(
+                        "SELECT key, vector, stored_at FROM embeddings WHERE key IN "
+                        f"({','.join('?' * len(chunk))})",
+                        chunk,
+                    ).fetchall()
+                    for key, blob, stored_at in rows:
+                        if cutoff is None or stored_at >= cutoff:
+                            found[key] = _decode(blob)
+        except sqlite3.Error as exc:
+            logger.warning("Embedding cache read failed (%s): %s", self.path, exc)
+        return found
+
+    def set_many(self, items: List[Tuple[str, "array[float]"]]) -> None:
+        now = time.time()
+        try:
+            with self._lock:
+                with self._conn:
+                    self._conn.execute("BEGIN")
+                    added = 0
+                    for start in range(0, len(items), _SQLITE_CHUNK):
+                        chunk = items[start : start + _SQLITE_CHUNK]
+                        # 전체 COUNT(*) 없이 rows를 갱신하도록 새로 추가되는 키 수만 확인
+                        existing = self._conn.execute(
+                            "SELECT COUNT(*) FROM embeddings WHERE key IN "
+                            f"({','.join('?' * len(chunk))})",
+                            [key for key, _ in chunk],
+                        ).fetchone()[0]
+                        self._conn.executemany(
+                            "INSERT OR REPLACE INTO embeddings (key, vector, stored_at) "
+                            "VALUES (?, ?, ?)",
+                            [(key, vector.tobytes(), now) for key, vector in chunk],
+                        )
+                        added += len(chunk) - existing
+            self.rows += added
+        except sqlite3.Error as exc:
+            logger.warning("Embedding cache write failed (%s): %s", self.path, exc)
+
+    async def get_many_async(self, keys: List[str]) -> Dict[str, "array[float]"]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.get_many, keys)
+
+    def set_many_background(self, items: List[Tuple[str, "array[float]"]]) -> None:
+        # 디스크 계층은 보조 캐시이므로 쓰기 완료를 기다리지 않음 (종료 시 executor가 마저 처리)
+        self.executor.submit(self.set_many, items)
+
+
+class EmbeddingCache:
+    """(모델, 입력 해시) -> 임베딩 캐시. 인메모리 LRU(TTL) 앞단 + 선택적 SQLite 계층.
+
+    벡터는 float32로 보관. centroid 점수도 float32로 계산하므로 분류 결과는 캐시 여부와 같음.
+    """
+
+    def __init__(
+        self, max_entries: int, ttl_seconds: float, db_path: Optional[Path] = None
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._memory: TTLCache["array[float]"] = TTLCache(max_entries, ttl_seconds)
+        self._disk: Optional[_SqliteEmbeddingStore] = None
+        if db_path is not None:
+            try:
+                self._disk = _SqliteEmbeddingStore(db_path, self._memory.ttl_seconds)
+            except (OSError, sqlite3.Error) as exc:
+                logger.warning("Embedding cache disk tier disabled (%s): %s", db_path, exc)
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _lookup_memory(
+        self, model: str, texts: List[str]
+    ) -> Tuple[Dict[str, List[float]], Dict[str, str]]:
+        """(메모리에서 찾은 {텍스트: 임베딩}, 메모리에 없는 {키: 텍스트})."""
+        found: Dict[str, List[float]] = {}
+        missing: Dict[str, str] = {}
+        for text in dict.fromkeys(texts):
+            key = embedding_cache_key(model, text)
+            vector = self._memory.get(key)
+            if vector is not None:
+                found[text] = vector.tolist()
+            else:
+                missing[key] = text
+        return found, missing
+
+    def get_many(self, model: str, texts: List[str]) -> Dict[str, List[float]]:
+        """캐시에 있는 입력만 담은 {텍스트: 임베딩}. 없는 입력은 결과에서 빠짐."""
+        found, missing = self._lookup_memory(model, texts)
+        disk_found: Dict[str, "array[float]"] = {}
+        if missing and self._disk is not None:
+            disk_found = self._disk.get_many(list(missing))
+        return self._merge_disk(found, missing, disk_found)
+
+    async def get_many_async(self, model: str, texts: List[str]) -> Dict[str, List[float]]:
+        """get_many와 같되 SQLite 조회는 이벤트 루프 밖에서 실행."""
+        found, missing = self._lookup_memory(model, texts)
+        disk_found: Dict[str, "array[float]"] = {}
+        if missing and self._disk is not None:
+            disk_found = await self._disk.get_many_async(list(missing))
+        return self._merge_disk(found, missing, disk_found)
+
+    def _merge_disk(
+        self,
+        found: Dict[str, List[float]],
+        missing: Dict[str, str],
+        disk_found: Dict[str, "array[float]"],
+    ) -> Dict[str, List[float]]:
+        memory_hits = len(found)
+        for key, vector in disk_found.items():
+            self._memory.set(key, vector)
+            found[missing[key]] = vector.tolist()
+        disk_hits = len(disk_found)
+        misses = len(missing) - disk_hits
+        self.hits += memory_hits + disk_hits
+        self.disk_hits += disk_hits
+        self.misses += misses
+        for result, count in (("hit", memory_hits), ("disk_hit", disk_hits), ("miss", misses)):
+            if count:
+                record_cache_lookup("embedding", result, count)
+        return found
+
+    def set_many(self, model: str, items: Dict[str, Sequence[float]]) -> None:
+        encoded = [
+            (embedding_cache_key(model, text), array("f", vector)) for text, vector in items.items()
+        ]
+        for key, vector in encoded:
+            self._memory.set(key, vector)
+        if self._disk is not None and encoded:
+            self._disk.set_many_background(encoded)
+
+    def clear(self) -> None:
+        self._memory.clear()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def disk_entries(self) -> Optional[int]:
+        return self._disk.rows if self._disk is not None else None
+
+    def stats(self) -> Dict[str, object]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "memory": self._memory.stats(),
+            "disk_enabled": self._disk is not None,
+            "disk_entries": self.disk_entries(),
+        }
+
+
+_EMBEDDING_CACHE: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """캐시가 비활성화된 경우 None."""
+    global _EMBEDDING_CACHE
+    settings = get_settings()
+    if not settings.embedding_cache_enabled:
+        return None
+    if _EMBEDDING_CACHE is None:
+        _EMBEDDING_CACHE = EmbeddingCache(
+            settings.embedding_cache_max_entries,
+            settings.embedding_cache_ttl_seconds,
+            Path(settings.embedding_cache_path) if settings.embedding_cache_path else None,
+        )
+    return _EMBEDDING_CACHE
+
+
+def _memory_entries() -> Optional[int]:
+    cache = _EMBEDDING_CACHE
+    return len(cache) if cache is not None else None
+
+
+def _disk_entries() -> Optional[int]:
+    cache = _EMBEDDING_CACHE
+    return cache.disk_entries() if cache is not None else None
+
+
+register_cache_size("embedding", _memory_entries)
+register_cache_size("embedding_disk", _disk_entries)
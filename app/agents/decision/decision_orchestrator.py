@@ -1,9 +1,12 @@
 from typing import List, Literal
 
+from app.core.tracing import traced
+
 
 RiskStage = Literal["normal", "suspicious", "critical"]
 
 
+@traced()
 def decide_risk_stage(signals: List[str]) -> RiskStage:
     """결정론적 판단 로직. LLM 사용 없음."""
     signal_set = set(signals)
@@ -1,5 +1,5 @@
 from app.agents.explanation.rag.corpus_registry import AVAILABLE_CORPORA
-from app.agents.explanation.rag.rag_provider import retrieve_evidence
+from app.agents.explanation.rag.rag_provider import retrieve_evidence, retrieve_evidence_batch
 from app.agents.explanation.rag.retrieval_contract import Reference, RetrievalRequest
 
-__all__ = ["AVAILABLE_CORPORA", "retrieve_evidence", "Reference", "RetrievalRequest"]
+__all__ = ["AVAILABLE_CORPORA", "retrieve_evidence", "retrieve_evidence_batch", "Reference", "RetrievalRequest"]
@@ -1,12 +1,15 @@
+import hashlib
 import math
 import re
 import unicodedata
 from collections import Counter
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 from app.agents.explanation.rag.corpus_registry import AVAILABLE_CORPORA, CorpusEntry
 from app.agents.explanation.rag.retrieval_contract import Reference, RetrievalRequest
+from app.core.tracing import traced
 
 CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
 MAX_REFERENCES = 3
@@ -41,6 +44,18 @@ def _load_text(entry: CorpusEntry) -> str:
         return ""
 
 
+@lru_cache(maxsize=1)
+def corpus_version() -> str:
+    """코퍼스 등록 정보와 문서 내용 기반 버전. 캐시 키에 사용."""
+    digest = hashlib.sha256()
+    for entry in AVAILABLE_CORPORA:
+        digest.update(
+            "\x1f".join([entry.source, entry.note, entry.path, *entry.tags]).encode("utf-8")
+        )
+        digest.update(_load_text(entry).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
 def _tokenize(text: str) -> List[str]:
     return re.findall(r"[가-힣A-Za-z0-9]+", text.lower())
 
@@ -54,15 +69,14 @@ def _split_sentences(text: str) -> List[str]:
     return [part.strip() for part in parts if part.strip()]
 
 
-def _tfidf_vectors(texts: List[str]) -> List[Dict[str, float]]:
-    tokenized = [_tokenize(text) for text in texts]
+def _tfidf_vectors(tokenized: List[List[str]]) -> List[Dict[str, float]]:
     doc_counts = [Counter(tokens) for tokens in tokenized]
     df = Counter()
     for tokens in tokenized:
         for term in set(tokens):
             df[term] += 1
 
-    total_docs = len(texts)
+    total_docs = len(tokenized)
     idf = {
         term: math.log((1 + total_docs) / (1 + freq)) + 1.0 for term, freq in df.items()
     }
@@ -104,15 +118,17 @@ def _tag_overlap(query_tokens: List[str], tags: List[str]) -> int:
 
 
 def _best_sentence(
-    query_text: str, sentences: List[str], tags: List[str]
+    query_tokens: List[str],
+    sentences: List[str],
+    sentence_tokens: List[List[str]],
+    tags: List[str],
 ) -> Tuple[Optional[str], float]:
     if not sentences:
         return None, 0.0
-    vectors = _tfidf_vectors([query_text] + sentences)
+    vectors = _tfidf_vectors([query_tokens] + sentence_tokens)
     query_vector = vectors[0]
     best_sentence = None
     best_score = 0.0
-    query_tokens = _tokenize(query_text)
     tag_overlap = _tag_overlap(query_tokens, tags)
     tag_boost = 0.05 * float(tag_overlap)
     for sentence, vector in zip(sentences, vectors[1:]):
@@ -130,12 +146,29 @@ def _source_title(entry: CorpusEntry) -> str:
     return path.name if path.name else entry.path
 
 
-def retrieve_evidence(request: RetrievalRequest) -> List[Reference]:
-    """선택적 검색 계층. 참고 자료를 반환."""
-    if not AVAILABLE_CORPORA:
-        return []
+CorpusDocument = Tuple[CorpusEntry, List[str], List[List[str]]]
+
+
+@lru_cache(maxsize=1)
+def _load_corpus() -> Tuple[CorpusDocument, ...]:
+    """문서별 (등록 정보, 문장, 문장 토큰). 코퍼스는 배포 단위로 고정이므로 한 번만 읽음."""
+    corpus: List[CorpusDocument] = []
+    for entry in AVAILABLE_CORPORA:
+        text = _load_text(entry)
+        if not text:
+            continue
+        sentences = _split_sentences(text)
+        corpus.append((entry, sentences, [_tokenize(sentence) for sentence in sentences]))
+    return tuple(corpus)
+
+
+def warm_corpus() -> int:
+    """코퍼스를 미리 읽고 토큰화. 로드된 문서 수를 반환."""
+    return len(_load_corpus())
 
-    query_text = " ".join(
+
+def _build_query_text(request: RetrievalRequest) -> str:
+    return " ".join(
         [
             request.risk_stage,
             request.conversation_type,
@@ -144,28 +177,24 @@ def retrieve_evidence(request: RetrievalRequest) -> List[Reference]:
             *request.matched_phrases,
         ]
     ).strip()
+
+
+def _retrieve_from_corpus(
+    query_text: str, corpus: Tuple[CorpusDocument, ...]
+) -> List[Reference]:
     query_tokens = _tokenize(query_text)
     if not query_tokens:
         return []
 
     scored: List[Tuple[float, CorpusEntry, str]] = []
-    for entry in AVAILABLE_CORPORA:
-        text = _load_text(entry)
-        if not text:
-            continue
-        sentences = _split_sentences(text)
-        best_sentence, score = _best_sentence(query_text, sentences, entry.tags)
+    for entry, sentences, sentence_tokens in corpus:
+        best_sentence, score = _best_sentence(query_tokens, sentences, sentence_tokens, entry.tags)
         if best_sentence and score > 0.0:
             scored.append((score, entry, best_sentence))
 
     if not scored:
         fallback: List[Tuple[int, CorpusEntry, str]] = []
-        query_tokens = _tokenize(query_text)
-        for entry in AVAILABLE_CORPORA:
-            text = _load_text(entry)
-            if not text:
-                continue
-            sentences = _split_sentences(text)
+        for entry, sentences, _ in corpus:
             if not sentences:
                 continue
             overlap = _tag_overlap(query_tokens, entry.tags)
@@ -186,3 +215,30 @@ def retrieve_evidence(request: RetrievalRequest) -> List[Reference]:
         Reference(source=_source_title(entry), note=sentence)
         for _, entry, sentence in selected
     ]
+
+
+@traced()
+def retrieve_evidence(request: RetrievalRequest) -> List[Reference]:
+    """선택적 검색 계층. 참고 자료를 반환."""
+    if not AVAILABLE_CORPORA:
+        return []
+
+    query_text = _build_query_text(request)
+    if not _tokenize(query_text):
+        return []
+    return _retrieve_from_corpus(query_text, _load_corpus())
+
+
+@traced()
+def retrieve_evidence_batch(requests: List[RetrievalRequest]) -> List[List[Reference]]:
+    """배치 검색. 코퍼스는 한 번만 읽고 동일한 쿼리는 한 번만 검색."""
+    if not AVAILABLE_CORPORA or not requests:
+        return [[] for _ in requests]
+
+    query_texts = [_build_query_text(request) for request in requests]
+    corpus = _load_corpus()
+    results: Dict[str, List[Reference]] = {}
+    for query_text in query_texts:
+        if query_text not in results:
+            results[query_text] = _retrieve_from_corpus(query_text, corpus)
+    return [list(results[query_text]) for query_text in query_texts]
@@ -1,13 +1,107 @@
-from fastapi import APIRouter
+import json
+from typing import AsyncIterator, Dict, List, Optional, TypeVar
 
-from app.pipeline.analysis_pipeline import run_analysis_pipeline
-from app.schemas.request import AnalyzeRequest
+from fastapi import APIRouter, Header, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.config import MAX_BATCH_SIZE
+from app.core.deadline import DEADLINE_HEADER
+from app.pipeline.analysis_pipeline import (
+    run_analysis_pipeline,
+    run_batch_analysis_pipeline,
+    run_session_analysis_pipeline,
+    stream_analysis_pipeline,
+)
+from app.pipeline.session_store import SessionLimitError, UnknownSessionError
+from app.schemas.request import AnalyzeRequest, SessionAnalyzeRequest
 from app.schemas.response import AnalyzeResponse
 
 router = APIRouter()
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+
+RequestT = TypeVar("RequestT", bound=AnalyzeRequest)
+
+
+def _with_header_deadline(payload: RequestT, deadline_ms: Optional[int]) -> RequestT:
+    # 본문 deadline_ms가 우선하며, 없을 때만 헤더 값을 사용
+    if deadline_ms is None or payload.deadline_ms is not None:
+        return payload
+    return payload.model_copy(update={"deadline_ms": deadline_ms})
+
+
+def _format_ndjson(event: str, data: Dict[str, object]) -> str:
+    return json.dumps({"event": event, "data": data}, ensure_ascii=False) + "\n"
+
+
+def _format_sse(event: str, data: Dict[str, object]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _stream_events(payload: AnalyzeRequest, use_sse: bool) -> AsyncIterator[str]:
+    formatter = _format_sse if use_sse else _format_ndjson
+    async for event, data in stream_analysis_pipeline(payload):
+        if event == "result":
+            data = AnalyzeResponse(**data).model_dump()
+        yield formatter(event, data)
+
 
 @router.post("/analyze", response_model=AnalyzeResponse)
-def analyze(payload: AnalyzeRequest) -> AnalyzeResponse:
-    result = run_analysis_pipeline(payload)
+async def analyze(
+    payload: AnalyzeRequest,
+    deadline_ms: Optional[int] = Header(None, alias=DEADLINE_HEADER, gt=0),
+) -> AnalyzeResponse:
+    result = await run_analysis_pipeline(_with_header_deadline(payload, deadline_ms))
+    return AnalyzeResponse(**result)
+
+
+@router.post("/analyze/batch", response_model=List[AnalyzeResponse])
+async def analyze_batch(
+    payloads: List[AnalyzeRequest],
+    deadline_ms: Optional[int] = Header(None, alias=DEADLINE_HEADER, gt=0),
+) -> List[AnalyzeResponse]:
+    if len(payloads) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch size exceeds limit ({MAX_BATCH_SIZE}).",
+        )
+    payloads = [_with_header_deadline(payload, deadline_ms) for payload in payloads]
+    results = await run_batch_analysis_pipeline(payloads)
+    return [AnalyzeResponse(**result) for result in results]
+
+
+@router.post("/analyze/stream")
+async def analyze_stream(
+    payload: AnalyzeRequest,
+    request: Request,
+    deadline_ms: Optional[int] = Header(None, alias=DEADLINE_HEADER, gt=0),
+) -> StreamingResponse:
+    use_sse = SSE_MEDIA_TYPE in request.headers.get("accept", "")
+    return StreamingResponse(
+        _stream_events(_with_header_deadline(payload, deadline_ms), use_sse),
+        media_type=SSE_MEDIA_TYPE if use_sse else NDJSON_MEDIA_TYPE,
+    )
+
+
+@router.post("/analyze/session", response_model=AnalyzeResponse)
+async def analyze_session(
+    payload: SessionAnalyzeRequest,
+    deadline_ms: Optional[int] = Header(None, alias=DEADLINE_HEADER, gt=0),
+) -> AnalyzeResponse:
+    try:
+        result = await run_session_analysis_pipeline(_with_header_deadline(payload, deadline_ms))
+    except UnknownSessionError:
+        raise HTTPException(
+            status_code=409,
+            detail="Session unknown or expired; resend the full conversation with append=false.",
+        )
+    except SessionLimitError as exc:
+        raise HTTPException(
+            status_code=413,
+            detail=(
+                f"Session exceeds {exc.max_messages} messages or {exc.max_chars} characters "
+                "and was discarded; use /api/analyze for conversations this long."
+            ),
+        )
     return AnalyzeResponse(**result)
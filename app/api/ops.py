@@ -0,0 +1,50 @@
+from typing import Dict
+
+from fastapi import APIRouter, Response
+from fastapi.responses import JSONResponse
+
+from app.agents.analyzer.rule_set import get_rule_set
+from app.agents.context.embedding_cache import get_embedding_cache
+from app.core.admission import admission_stats
+from app.core.metrics import PROMETHEUS_CONTENT_TYPE, render_metrics
+from app.pipeline.result_cache import get_result_cache
+from app.pipeline.warmup import get_warmup_state
+
+router = APIRouter()
+root_router = APIRouter()
+
+
+@router.get("/admission")
+def admission() -> Dict[str, Dict[str, int]]:
+    """의존성별 동시 실행 수, 대기열 길이, 거절 횟수."""
+    return admission_stats()
+
+
+@router.get("/caches")
+def caches() -> Dict[str, object]:
+    """캐시별 적중/미스 횟수, 적중률, 항목 수. 비활성화된 캐시는 null."""
+    result_cache = get_result_cache()
+    embedding_cache = get_embedding_cache()
+    return {
+        "result": result_cache.stats() if result_cache is not None else None,
+        "embedding": embedding_cache.stats() if embedding_cache is not None else None,
+    }
+
+
+@router.get("/rules")
+def rules() -> Dict[str, object]:
+    """요청을 처리 중인 rule pack의 버전, 내용 해시, 경로, 로드 시각."""
+    return get_rule_set().info()
+
+
+@root_router.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    """Prometheus 텍스트 포맷의 단계별 지연 시간, fallback, 캐시, 오류 지표."""
+    return Response(content=render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@root_router.get("/ready", include_in_schema=False)
+def ready() -> JSONResponse:
+    """워밍업이 끝난 워커만 200. 진행 중이거나 필수 단계가 실패하면 503."""
+    state = get_warmup_state()
+    return JSONResponse(state.snapshot(), status_code=200 if state.ready else 503)
@@ -0,0 +1,180 @@
+import asyncio
+import json
+import math
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.metrics import REGISTRY, CallbackCounter, CallbackGauge
+
+logger = get_logger(__name__)
+
+INGRESS = "ingress"
+OCR_DOWNLOAD = "ocr_download"
+OCR_VISION = "ocr_vision"
+EMBEDDINGS = "embeddings"
+SAFE_ACTIONS = "safe_actions"
+
+# 모든 분석 요청이 거치는 외부 의존성. 포화 상태면 요청을 받는 시점에 거절
+INGRESS_DEPENDENCIES = (EMBEDDINGS, SAFE_ACTIONS)
+
+
+class OverloadedError(RuntimeError):
+    """의존성의 동시 실행 수와 대기열이 모두 찬 상태. 즉시 거절."""
+
+    def __init__(self, dependency: str, retry_after: float) -> None:
+        super().__init__(f"{dependency} is overloaded")
+        self.dependency = dependency
+        self.retry_after = retry_after
+
+
+class DependencyLimiter:
+    """외부 의존성별 동시 실행 제한과 크기 제한 대기열."""
+
+    def __init__(
+        self, name: str, max_concurrency: int, max_queue: int, retry_after: float
+    ) -> None:
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.retry_after = retry_after
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+
+    def is_saturated(self) -> bool:
+        return self.in_flight >= self.max_concurrency and self.waiting >= self.max_queue
+
+    def reject(self) -> OverloadedError:
+        self.rejected += 1
+        return OverloadedError(self.name, self.retry_after)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        if self.is_saturated():
+            raise self.reject()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "rejected": self.rejected,
+        }
+
+
+_LIMITERS: Dict[str, DependencyLimiter] = {}
+
+
+def get_limiter(name: str) -> DependencyLimiter:
+    limiter = _LIMITERS.get(name)
+    if limiter is None:
+        settings = get_settings()
+        max_concurrency, max_queue = settings.admission_limits[name]
+        limiter = DependencyLimiter(
+            name, max_concurrency, max_queue, settings.admission_retry_after_seconds
+        )
+        _LIMITERS[name] = limiter
+    return limiter
+
+
+def admission_stats() -> Dict[str, Dict[str, int]]:
+    return {name: get_limiter(name).stats() for name in get_settings().admission_limits}
+
+
+def _admission_metric(field: str):
+    return lambda: {(name,): float(stats[field]) for name, stats in admission_stats().items()}
+
+
+REGISTRY.register(
+    CallbackGauge(
+        "ai_server_admission_in_flight",
+        "Calls currently running, by dependency.",
+        ("dependency",),
+        _admission_metric("in_flight"),
+    )
+)
+REGISTRY.register(
+    CallbackGauge(
+        "ai_server_admission_queue_depth",
+        "Calls waiting for a slot, by dependency.",
+        ("dependency",),
+        _admission_metric("queue_depth"),
+    )
+)
+REGISTRY.register(
+    CallbackCounter(
+        "ai_server_admission_rejected_total",
+        "Calls rejected because the queue was full, by dependency.",
+        ("dependency",),
+        _admission_metric("rejected"),
+    )
+)
+
+
+def _saturated_dependency() -> Optional[DependencyLimiter]:
+    for name in INGRESS_DEPENDENCIES:
+        limiter = get_limiter(name)
+        if limiter.is_saturated():
+            return limiter
+    return None
+
+
+class AdmissionMiddleware:
+    """분석 요청 입구에서 과부하 시 429/503과 Retry-After로 조기 거절하는 ASGI 미들웨어."""
+
+    def __init__(self, app, path_prefix: str) -> None:
+        self.app = app
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        saturated = _saturated_dependency()
+        if saturated is not None:
+            logger.warning("Rejecting request: %s queue is full", saturated.name)
+            await self._reject(send, 503, saturated.reject())
+            return
+
+        ingress = get_limiter(INGRESS)
+        try:
+            async with ingress.acquire():
+                await self.app(scope, receive, send)
+        except OverloadedError as exc:
+            if exc.dependency != INGRESS:
+                raise
+            logger.warning("Rejecting request: too many in-flight requests")
+            await self._reject(send, 429, exc)
+
+    async def _reject(self, send, status_code: int, exc: OverloadedError) -> None:
+        body = json.dumps(
+            {"detail": f"Server is overloaded ({exc.dependency}). Retry later."}
+        ).encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status_code,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode("ascii")),
+                    (b"retry-after", str(math.ceil(exc.retry_after)).encode("ascii")),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -1,2 +1,290 @@
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
 APP_NAME = "AI-Server"
 API_PREFIX = "/api"
+MAX_BATCH_SIZE = 200
+
+# 환경변수 이름
+OPENAI_API_KEY_ENV = "OPENAI_API_KEY"
+OPENAI_MODEL_ENV = "OPENAI_MODEL_ENV"
+EMBEDDING_MODEL_ENV = "OPENAI_EMBEDDING_MODEL"
+EMBEDDING_BACKEND_ENV = "EMBEDDING_BACKEND"
+LOCAL_EMBEDDING_DIMENSIONS_ENV = "LOCAL_EMBEDDING_DIMENSIONS"
+EMBEDDING_BATCH_WINDOW_MS_ENV = "EMBEDDING_BATCH_WINDOW_MS"
+EMBEDDING_BATCH_MAX_ITEMS_ENV = "EMBEDDING_BATCH_MAX_ITEMS"
+CLASSIFIER_CASCADE_ENABLED_ENV = "CLASSIFIER_CASCADE_ENABLED"
+CLASSIFIER_CASCADE_MIN_HITS_ENV = "CLASSIFIER_CASCADE_MIN_HITS"
+CLASSIFIER_CASCADE_MARGIN_ENV = "CLASSIFIER_CASCADE_MARGIN"
+OPENAI_OCR_MODEL_ENV = "OPENAI_OCR_MODEL"
+CENTROIDS_PATH_ENV = "PROTOTYPE_CENTROIDS_PATH"
+OCR_DOWNLOAD_TIMEOUT_ENV = "OCR_DOWNLOAD_TIMEOUT_SECONDS"
+OCR_MAX_IMAGE_BYTES_ENV = "OCR_MAX_IMAGE_BYTES"
+SESSION_MAX_ENTRIES_ENV = "SESSION_STORE_MAX_ENTRIES"
+SESSION_TTL_SECONDS_ENV = "SESSION_STORE_TTL_SECONDS"
+SESSION_MAX_MESSAGES_ENV = "SESSION_MAX_MESSAGES"
+SESSION_MAX_CHARS_ENV = "SESSION_MAX_CHARS"
+DEFAULT_DEADLINE_MS_ENV = "REQUEST_DEFAULT_DEADLINE_MS"
+RETRY_AFTER_ENV = "ADMISSION_RETRY_AFTER_SECONDS"
+RESULT_CACHE_ENABLED_ENV = "RESULT_CACHE_ENABLED"
+RESULT_CACHE_MAX_ENTRIES_ENV = "RESULT_CACHE_MAX_ENTRIES"
+RESULT_CACHE_TTL_SECONDS_ENV = "RESULT_CACHE_TTL_SECONDS"
+RESULT_CACHE_DIR_ENV = "RESULT_CACHE_DIR"
+RESULT_CACHE_DISK_MAX_ENTRIES_ENV = "RESULT_CACHE_DISK_MAX_ENTRIES"
+EMBEDDING_CACHE_ENABLED_ENV = "EMBEDDING_CACHE_ENABLED"
+EMBEDDING_CACHE_MAX_ENTRIES_ENV = "EMBEDDING_CACHE_MAX_ENTRIES"
+EMBEDDING_CACHE_TTL_SECONDS_ENV = "EMBEDDING_CACHE_TTL_SECONDS"
+EMBEDDING_CACHE_PATH_ENV = "EMBEDDING_CACHE_PATH"
+TRACE_EXPORTER_ENV = "TRACE_EXPORTER"
+TRACE_OTLP_ENDPOINT_ENV = "TRACE_OTLP_ENDPOINT"
+TRACE_DEBUG_HEADER_ENV = "TRACE_DEBUG_HEADER_ENABLED"
+WARMUP_ENABLED_ENV = "STARTUP_WARMUP_ENABLED"
+WARMUP_TIMEOUT_ENV = "STARTUP_WARMUP_TIMEOUT_SECONDS"
+RULE_GUARD_ENABLED_ENV = "RULE_GUARD_ENABLED"
+RULE_MAX_MESSAGE_CHARS_ENV = "RULE_MAX_MESSAGE_CHARS"
+RULE_WINDOW_CHARS_ENV = "RULE_WINDOW_CHARS"
+RULE_PACK_PATH_ENV = "RULE_PACK_PATH"
+RULE_PACK_RELOAD_SECONDS_ENV = "RULE_PACK_RELOAD_SECONDS"
+
+DEFAULT_OPENAI_MODEL = "gpt-5-mini"
+DEFAULT_EMBEDDING_MODEL = "text-embedding-3-small"
+# openai: OpenAI 임베딩 API, local: 프로세스 안에서 계산하는 문자 n-gram 해시 임베딩
+EMBEDDING_BACKENDS = ("openai", "local")
+DEFAULT_LOCAL_EMBEDDING_DIMENSIONS = 4096
+# 임베딩 API 응답(수백 ms)에 비해 작은 대기 시간으로 동시 요청을 한 번의 호출로 묶음
+DEFAULT_EMBEDDING_BATCH_WINDOW_MS = 2
+DEFAULT_EMBEDDING_BATCH_MAX_ITEMS = 64
+DEFAULT_CLASSIFIER_CASCADE_MIN_HITS = 2
+DEFAULT_CLASSIFIER_CASCADE_MARGIN = 2
+DEFAULT_OCR_MODEL = "gpt-4o-mini"
+DEFAULT_OCR_DOWNLOAD_TIMEOUT_SECONDS = 10.0
+DEFAULT_OCR_MAX_IMAGE_BYTES = 5_000_000
+DEFAULT_SESSION_MAX_ENTRIES = 10_000
+DEFAULT_SESSION_TTL_SECONDS = 3600.0
+# 세션 하나가 보관하는 메시지 수/문자 수(OCR 이후 원문 기준) 상한
+DEFAULT_SESSION_MAX_MESSAGES = 1000
+DEFAULT_SESSION_MAX_CHARS = 200_000
+DEFAULT_RETRY_AFTER_SECONDS = 1.0
+DEFAULT_RESULT_CACHE_MAX_ENTRIES = 2048
+DEFAULT_RESULT_CACHE_TTL_SECONDS = 3600.0
+DEFAULT_RESULT_CACHE_DISK_MAX_ENTRIES = 50_000
+DEFAULT_EMBEDDING_CACHE_MAX_ENTRIES = 8192
+# 같은 모델의 임베딩은 바뀌지 않으므로 길게 두고, TTL은 디스크 크기 제한 용도
+DEFAULT_EMBEDDING_CACHE_TTL_SECONDS = 7 * 24 * 3600.0
+DEFAULT_OTLP_ENDPOINT = "http://localhost:4318/v1/traces"
+DEFAULT_WARMUP_TIMEOUT_SECONDS = 60.0
+DEFAULT_RULE_MAX_MESSAGE_CHARS = 8000
+DEFAULT_RULE_WINDOW_CHARS = 256
+DEFAULT_RULE_PACK_RELOAD_SECONDS = 10
+
+# 의존성별 (동시 실행 수, 대기열 길이) 기본값. 환경변수 ADMISSION_<NAME>_CONCURRENCY / _QUEUE로 변경
+DEFAULT_ADMISSION_LIMITS: Dict[str, Tuple[int, int]] = {
+    "ingress": (256, 0),
+    "ocr_download": (32, 64),
+    "ocr_vision": (16, 64),
+    "embeddings": (16, 128),
+    "safe_actions": (32, 128),
+}
+
+_FALSE_VALUES = {"0", "false", "no", "off"}
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+
+
+def _get_str(name: str, default: str) -> str:
+    return os.getenv(name, default).strip() or default
+
+
+def _get_choice(name: str, default: str, choices: Tuple[str, ...]) -> str:
+    value = os.getenv(name, "").strip().lower()
+    return value if value in choices else default
+
+
+def _get_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name, "").strip().lower()
+    if value in _FALSE_VALUES:
+        return False
+    if value in _TRUE_VALUES:
+        return True
+    return default
+
+
+def _get_int(name: str, default: int, minimum: int = 1) -> int:
+    try:
+        value = int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+    return value if value >= minimum else default
+
+
+def _get_float(name: str, default: float) -> float:
+    try:
+        value = float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def _get_optional_int(name: str) -> Optional[int]:
+    raw = os.getenv(name, "").strip()
+    try:
+        return int(raw) if raw else None
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True)
+class Settings:
+    """환경변수에서 한 번 읽은 설정. 값 검증과 기본값 처리는 여기서만 함."""
+
+    openai_api_key: Optional[str]
+    safe_actions_model: str
+    embedding_model: str
+    embedding_backend: str
+    local_embedding_dimensions: int
+    embedding_batch_window_ms: int
+    embedding_batch_max_items: int
+    classifier_cascade_enabled: bool
+    classifier_cascade_min_hits: int
+    classifier_cascade_margin: int
+    ocr_model: str
+    centroids_path: Optional[str]
+    ocr_download_timeout_seconds: float
+    ocr_max_image_bytes: int
+    session_max_entries: int
+    session_ttl_seconds: float
+    session_max_messages: int
+    session_max_chars: int
+    default_deadline_ms: Optional[int]
+    admission_limits: Dict[str, Tuple[int, int]]
+    admission_retry_after_seconds: float
+    result_cache_enabled: bool
+    result_cache_max_entries: int
+    result_cache_ttl_seconds: float
+    result_cache_dir: Optional[str]
+    result_cache_disk_max_entries: int
+    embedding_cache_enabled: bool
+    embedding_cache_max_entries: int
+    embedding_cache_ttl_seconds: float
+    embedding_cache_path: Optional[str]
+    trace_exporter: str
+    trace_otlp_endpoint: str
+    trace_debug_header_enabled: bool
+    warmup_enabled: bool
+    warmup_timeout_seconds: float
+    rule_guard_enabled: bool
+    rule_max_message_chars: int
+    rule_window_chars: int
+    rule_pack_path: Optional[str]
+    rule_pack_reload_seconds: int
+
+
+_DOTENV_LOADED = False
+
+
+def _load_dotenv_once() -> None:
+    global _DOTENV_LOADED
+    if _DOTENV_LOADED:
+        return
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    _DOTENV_LOADED = True
+
+
+def load_settings() -> Settings:
+    _load_dotenv_once()
+    admission_limits = {
+        name: (
+            _get_int(f"ADMISSION_{name.upper()}_CONCURRENCY", concurrency, 1),
+            _get_int(f"ADMISSION_{name.upper()}_QUEUE", queue, 0),
+        )
+        for name, (concurrency, queue) in DEFAULT_ADMISSION_LIMITS.items()
+    }
+    return Settings(
+        openai_api_key=os.getenv(OPENAI_API_KEY_ENV) or None,
+        safe_actions_model=_get_str(OPENAI_MODEL_ENV, DEFAULT_OPENAI_MODEL),
+        embedding_model=_get_str(EMBEDDING_MODEL_ENV, DEFAULT_EMBEDDING_MODEL),
+        embedding_backend=_get_choice(
+            EMBEDDING_BACKEND_ENV, EMBEDDING_BACKENDS[0], EMBEDDING_BACKENDS
+        ),
+        local_embedding_dimensions=_get_int(
+            LOCAL_EMBEDDING_DIMENSIONS_ENV, DEFAULT_LOCAL_EMBEDDING_DIMENSIONS, 64
+        ),
+        embedding_batch_window_ms=_get_int(
+            EMBEDDING_BATCH_WINDOW_MS_ENV, DEFAULT_EMBEDDING_BATCH_WINDOW_MS, 0
+        ),
+        embedding_batch_max_items=_get_int(
+            EMBEDDING_BATCH_MAX_ITEMS_ENV, DEFAULT_EMBEDDING_BATCH_MAX_ITEMS
+        ),
+        classifier_cascade_enabled=_get_bool(CLASSIFIER_CASCADE_ENABLED_ENV, False),
+        classifier_cascade_min_hits=_get_int(
+            CLASSIFIER_CASCADE_MIN_HITS_ENV, DEFAULT_CLASSIFIER_CASCADE_MIN_HITS
+        ),
+        classifier_cascade_margin=_get_int(
+            CLASSIFIER_CASCADE_MARGIN_ENV, DEFAULT_CLASSIFIER_CASCADE_MARGIN
+        ),
+        ocr_model=_get_str(OPENAI_OCR_MODEL_ENV, DEFAULT_OCR_MODEL),
+        centroids_path=os.getenv(CENTROIDS_PATH_ENV, "").strip() or None,
+        ocr_download_timeout_seconds=_get_float(
+            OCR_DOWNLOAD_TIMEOUT_ENV, DEFAULT_OCR_DOWNLOAD_TIMEOUT_SECONDS
+        ),
+        ocr_max_image_bytes=_get_int(OCR_MAX_IMAGE_BYTES_ENV, DEFAULT_OCR_MAX_IMAGE_BYTES),
+        session_max_entries=_get_int(SESSION_MAX_ENTRIES_ENV, DEFAULT_SESSION_MAX_ENTRIES),
+        session_ttl_seconds=_get_float(SESSION_TTL_SECONDS_ENV, DEFAULT_SESSION_TTL_SECONDS),
+        session_max_messages=_get_int(SESSION_MAX_MESSAGES_ENV, DEFAULT_SESSION_MAX_MESSAGES),
+        session_max_chars=_get_int(SESSION_MAX_CHARS_ENV, DEFAULT_SESSION_MAX_CHARS),
+        default_deadline_ms=_get_optional_int(DEFAULT_DEADLINE_MS_ENV),
+        admission_limits=admission_limits,
+        admission_retry_after_seconds=_get_float(RETRY_AFTER_ENV, DEFAULT_RETRY_AFTER_SECONDS),
+        result_cache_enabled=_get_bool(RESULT_CACHE_ENABLED_ENV, True),
+        result_cache_max_entries=_get_int(
+            RESULT_CACHE_MAX_ENTRIES_ENV, DEFAULT_RESULT_CACHE_MAX_ENTRIES
+        ),
+        result_cache_ttl_seconds=_get_float(
+            RESULT_CACHE_TTL_SECONDS_ENV, DEFAULT_RESULT_CACHE_TTL_SECONDS
+        ),
+        result_cache_dir=os.getenv(RESULT_CACHE_DIR_ENV, "").strip() or None,
+        result_cache_disk_max_entries=_get_int(
+            RESULT_CACHE_DISK_MAX_ENTRIES_ENV, DEFAULT_RESULT_CACHE_DISK_MAX_ENTRIES
+        ),
+        embedding_cache_enabled=_get_bool(EMBEDDING_CACHE_ENABLED_ENV, True),
+        embedding_cache_max_entries=_get_int(
+            EMBEDDING_CACHE_MAX_ENTRIES_ENV, DEFAULT_EMBEDDING_CACHE_MAX_ENTRIES
+        ),
+        embedding_cache_ttl_seconds=_get_float(
+            EMBEDDING_CACHE_TTL_SECONDS_ENV, DEFAULT_EMBEDDING_CACHE_TTL_SECONDS
+        ),
+        embedding_cache_path=os.getenv(EMBEDDING_CACHE_PATH_ENV, "").strip() or None,
+        trace_exporter=os.getenv(TRACE_EXPORTER_ENV, "").strip().lower(),
+        trace_otlp_endpoint=_get_str(TRACE_OTLP_ENDPOINT_ENV, DEFAULT_OTLP_ENDPOINT),
+        trace_debug_header_enabled=_get_bool(TRACE_DEBUG_HEADER_ENV, True),
+        warmup_enabled=_get_bool(WARMUP_ENABLED_ENV, True),
+        warmup_timeout_seconds=_get_float(WARMUP_TIMEOUT_ENV, DEFAULT_WARMUP_TIMEOUT_SECONDS),
+        rule_guard_enabled=_get_bool(RULE_GUARD_ENABLED_ENV, True),
+        rule_max_message_chars=_get_int(
+            RULE_MAX_MESSAGE_CHARS_ENV, DEFAULT_RULE_MAX_MESSAGE_CHARS
+        ),
+        rule_window_chars=_get_int(RULE_WINDOW_CHARS_ENV, DEFAULT_RULE_WINDOW_CHARS, 64),
+        rule_pack_path=os.getenv(RULE_PACK_PATH_ENV, "").strip() or None,
+        rule_pack_reload_seconds=_get_int(
+            RULE_PACK_RELOAD_SECONDS_ENV, DEFAULT_RULE_PACK_RELOAD_SECONDS, 0
+        ),
+    )
+
+
+_SETTINGS: Optional[Settings] = None
+
+
+def get_settings() -> Settings:
+    global _SETTINGS
+    if _SETTINGS is None:
+        _SETTINGS = load_settings()
+    return _SETTINGS
+
+
+def reload_settings() -> Settings:
+    """환경변수를 바꾼 뒤(벤치마크, 스텁 설치 등) 다시 읽음."""
+    global _SETTINGS
+    _SETTINGS = load_settings()
+    return _SETTINGS
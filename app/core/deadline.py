@@ -0,0 +1,89 @@
+import asyncio
+import time
+from typing import Awaitable, List, Optional, TypeVar
+
+from app.core.config import get_settings
+
+DEADLINE_HEADER = "X-Request-Deadline-Ms"
+
+T = TypeVar("T")
+
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """남은 처리 시간 안에 단계가 끝나지 않음. 호출자는 결정론적 fallback으로 전환."""
+
+
+class Deadline:
+    """요청 단위 처리 시간 예산. 단계별 타임아웃을 남은 시간에서 계산하고 저하된 단계를 기록."""
+
+    def __init__(self, budget_seconds: Optional[float] = None) -> None:
+        self.budget_seconds = budget_seconds
+        self._expires_at = (
+            time.monotonic() + budget_seconds if budget_seconds is not None else None
+        )
+        self._degraded: List[str] = []
+        self._fallbacks: List[str] = []
+
+    @classmethod
+    def from_budget_ms(cls, budget_ms: Optional[int]) -> "Deadline":
+        if budget_ms is None:
+            budget_ms = get_settings().default_deadline_ms
+        if budget_ms is None or budget_ms <= 0:
+            return cls()
+        return cls(budget_ms / 1000.0)
+
+    def remaining(self) -> Optional[float]:
+        if self._expires_at is None:
+            return None
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0.0
+
+    def timeout(self, default: Optional[float] = None) -> Optional[float]:
+        """기본 타임아웃과 남은 예산 중 작은 값. 둘 다 없으면 None(무제한)."""
+        remaining = self.remaining()
+        if remaining is None:
+            return default
+        if default is None:
+            return remaining
+        return min(default, remaining)
+
+    def mark_degraded(self, stage: str) -> None:
+        if stage not in self._degraded:
+            self._degraded.append(stage)
+
+    @property
+    def degraded_stages(self) -> List[str]:
+        return list(self._degraded)
+
+    def mark_fallback(self, stage: str) -> None:
+        """오류로 fallback한 단계. 응답의 degraded_stages에는 넣지 않지만 결과를 캐시하지 않음."""
+        if stage not in self._fallbacks:
+            self._fallbacks.append(stage)
+
+    @property
+    def fallback_stages(self) -> List[str]:
+        return list(self._fallbacks)
+
+    async def run(self, awaitable: Awaitable[T], default_timeout: Optional[float] = None) -> T:
+        """남은 예산 안에서 awaitable을 실행. 예산이 없거나 초과되면 DeadlineExceeded."""
+        if self.expired():
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            raise DeadlineExceeded()
+        try:
+            return await asyncio.wait_for(awaitable, self.timeout(default_timeout))
+        except asyncio.TimeoutError as exc:
+            raise DeadlineExceeded() from exc
+
+
+def resolve_deadline(deadline: Optional[Deadline]) -> Deadline:
+    return deadline if deadline is not None else Deadline()
+
+
+def degrade_reason(exc: BaseException) -> str:
+    if isinstance(exc, DeadlineExceeded):
+        return "deadline exceeded"
+    return str(exc) or type(exc).__name__
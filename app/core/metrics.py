@@ -0,0 +1,324 @@
+import bisect
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 외부 API 호출(수 초)과 규칙 스캔(수 ms)을 모두 구분할 수 있는 버킷
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+        lines.extend(self._samples())
+        return lines
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        """exposition 포맷의 샘플 줄."""
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._label_values(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._label_values(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[index] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(counts)) for key, counts in self._counts.items())
+            sums = dict(self._sums)
+        lines: List[str] = []
+        for key, counts in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(sums.get(key, 0.0))}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class CallbackGauge(_Metric):
+    """스크레이프 시점에 콜백으로 값을 읽는 게이지 (대기열 길이, 캐시 크기 등)."""
+
+    metric_type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        callback: Callable[[], Dict[LabelValues, float]],
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self.callback().items())
+        ]
+
+
+class CallbackCounter(CallbackGauge):
+    """스크레이프 시점에 콜백으로 값을 읽는 누적 카운터."""
+
+    metric_type = "counter"
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.setdefault(metric.name, metric)
+        return self._metrics[metric.name]
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_DURATION = REGISTRY.register(
+    Histogram(
+        "ai_server_stage_duration_seconds",
+        "Duration of each analysis pipeline stage.",
+        ("stage",),
+    )
+)
+STAGE_FALLBACKS = REGISTRY.register(
+    Counter(
+        "ai_server_stage_fallbacks_total",
+        "Deterministic fallbacks taken, by stage.",
+        ("stage",),
+    )
+)
+STAGE_ERRORS = REGISTRY.register(
+    Counter(
+        "ai_server_stage_errors_total",
+        "Errors raised by external calls, by stage.",
+        ("stage",),
+    )
+)
+CACHE_REQUESTS = REGISTRY.register(
+    Counter(
+        "ai_server_cache_requests_total",
+        "Cache lookups by cache and result (hit/disk_hit/miss).",
+        ("cache", "result"),
+    )
+)
+# 캐시 이름 -> 현재 항목 수 콜백 (비활성화/미생성이면 None)
+_CACHE_SIZE_CALLBACKS: Dict[str, Callable[[], Optional[int]]] = {}
+
+
+def _cache_sizes() -> Dict[LabelValues, float]:
+    sizes: Dict[LabelValues, float] = {}
+    for cache, callback in list(_CACHE_SIZE_CALLBACKS.items()):
+        size = callback()
+        if size is not None:
+            sizes[(cache,)] = float(size)
+    return sizes
+
+
+CACHE_ENTRIES = REGISTRY.register(
+    CallbackGauge(
+        "ai_server_cache_entries",
+        "Entries held in caches, by cache.",
+        ("cache",),
+        _cache_sizes,
+    )
+)
+RULE_INPUT_TRUNCATED = REGISTRY.register(
+    Counter(
+        "ai_server_rule_input_truncated_total",
+        "Messages cut to the rule scan input cap before matching.",
+    )
+)
+CLASSIFICATION_PATHS = REGISTRY.register(
+    Counter(
+        "ai_server_classification_decisions_total",
+        "Conversation type decisions by path (rule/embedding/fallback).",
+        ("path",),
+    )
+)
+EMBEDDING_BATCH_SIZE = REGISTRY.register(
+    Histogram(
+        "ai_server_embedding_batch_size",
+        "Inputs per coalesced embeddings API call.",
+        buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+    )
+)
+EMBEDDING_COALESCED = REGISTRY.register(
+    Counter(
+        "ai_server_embedding_coalesced_inputs_total",
+        "Embedding inputs served by an identical input already waiting in the batch window.",
+    )
+)
+RULESET_RELOADS = REGISTRY.register(
+    Counter(
+        "ai_server_ruleset_reloads_total",
+        "Rule pack reload attempts by result (swapped/failed).",
+        ("result",),
+    )
+)
+
+
+@contextmanager
+def observe_stage(stage: str) -> Iterator[None]:
+    """파이프라인 단계 소요 시간을 ai_server_stage_duration_seconds에 기록."""
+    with STAGE_DURATION.time(stage=stage):
+        yield
+
+
+def record_fallback(stage: str) -> None:
+    STAGE_FALLBACKS.inc(stage=stage)
+
+
+def record_error(stage: str) -> None:
+    STAGE_ERRORS.inc(stage=stage)
+
+
+def record_cache_lookup(cache: str, result: str, count: int = 1) -> None:
+    CACHE_REQUESTS.inc(count, cache=cache, result=result)
+
+
+def register_cache_size(cache: str, callback: Callable[[], Optional[int]]) -> None:
+    """ai_server_cache_entries{cache}에 노출할 항목 수 콜백 등록."""
+    _CACHE_SIZE_CALLBACKS[cache] = callback
+
+
+def record_rule_truncation() -> None:
+    RULE_INPUT_TRUNCATED.inc()
+
+
+def record_classification_path(path: str) -> None:
+    CLASSIFICATION_PATHS.inc(path=path)
+
+
+def record_embedding_batch(size: int) -> None:
+    EMBEDDING_BATCH_SIZE.observe(size)
+
+
+def record_embedding_coalesced(count: int) -> None:
+    EMBEDDING_COALESCED.inc(count)
+
+
+def record_ruleset_reload(result: str) -> None:
+    RULESET_RELOADS.inc(result=result)
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
@@ -0,0 +1,272 @@
+import asyncio
+import contextvars
+import functools
+import json
+import secrets
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Set, TypeVar
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = get_logger(__name__)
+
+EXPORTER_NONE = "none"
+EXPORTER_LOG = "log"
+EXPORTER_OTLP = "otlp"
+
+# 요청 시 이 헤더가 참이면 응답에 Server-Timing / X-Trace-Id 헤더로 span 타이밍을 돌려줌
+DEBUG_TIMING_HEADER = "X-Debug-Timing"
+SERVICE_NAME = "ai-server"
+
+F = TypeVar("F", bound=Callable)
+
+
+def _get_exporter() -> str:
+    value = get_settings().trace_exporter
+    return value if value in {EXPORTER_LOG, EXPORTER_OTLP} else EXPORTER_NONE
+
+
+def _debug_header_enabled() -> bool:
+    return get_settings().trace_debug_header_enabled
+
+
+@dataclass
+class Span:
+    name: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: Optional[int] = None
+    attributes: Dict[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1_000_000
+
+
+@dataclass
+class Trace:
+    """요청 하나에서 생성된 span 모음."""
+
+    trace_id: str
+    name: str
+    spans: List[Span] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "spans": [
+                {
+                    "name": span.name,
+                    "span_id": span.span_id,
+                    "parent_id": span.parent_id,
+                    "start_ns": span.start_ns,
+                    "duration_ms": round(span.duration_ms, 3),
+                    "attributes": span.attributes,
+                    "error": span.error,
+                }
+                for span in self.spans
+            ],
+        }
+
+
+_CURRENT_TRACE: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar(
+    "current_trace", default=None
+)
+_CURRENT_SPAN: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+def _new_id(num_bytes: int) -> str:
+    return secrets.token_hex(num_bytes)
+
+
+@contextmanager
+def span(name: str, **attributes: object) -> Iterator[Optional[Span]]:
+    """현재 요청 trace에 하위 span을 추가. trace가 없으면 아무것도 기록하지 않음."""
+    trace = _CURRENT_TRACE.get()
+    if trace is None:
+        yield None
+        return
+    parent = _CURRENT_SPAN.get()
+    current = Span(
+        name=name,
+        span_id=_new_id(8),
+        parent_id=parent.span_id if parent is not None else None,
+        start_ns=time.time_ns(),
+        attributes={key: str(value) for key, value in attributes.items()},
+    )
+    trace.spans.append(current)
+    token = _CURRENT_SPAN.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.error = type(exc).__name__
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        _CURRENT_SPAN.reset(token)
+
+
+def traced(name: Optional[str] = None) -> Callable[[F], F]:
+    """함수 호출 전체를 span으로 감싸는 데코레이터 (sync/async 모두 지원)."""
+
+    def decorator(func: F) -> F:
+        span_name = name or func.__name__
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def _otlp_attributes(attributes: Dict[str, str]) -> List[Dict[str, object]]:
+    return [{"key": key, "value": {"stringValue": value}} for key, value in attributes.items()]
+
+
+def _otlp_payload(trace: Trace) -> Dict[str, object]:
+    spans = []
+    for item in trace.spans:
+        otlp_span: Dict[str, object] = {
+            "traceId": trace.trace_id,
+            "spanId": item.span_id,
+            "name": item.name,
+            "kind": 1,
+            "startTimeUnixNano": str(item.start_ns),
+            "endTimeUnixNano": str(item.end_ns or item.start_ns),
+            "attributes": _otlp_attributes(item.attributes),
+        }
+        if item.parent_id:
+            otlp_span["parentSpanId"] = item.parent_id
+        if item.error:
+            otlp_span["status"] = {"code": 2, "message": item.error}
+        spans.append(otlp_span)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": _otlp_attributes({"service.name": SERVICE_NAME})
+                },
+                "scopeSpans": [{"scope": {"name": __name__}, "spans": spans}],
+            }
+        ]
+    }
+
+
+_OTLP_CLIENT: Optional["httpx.AsyncClient"] = None
+_PENDING_EXPORTS: Set[asyncio.Task] = set()
+
+
+def _get_otlp_client() -> "httpx.AsyncClient":
+    global _OTLP_CLIENT
+    if _OTLP_CLIENT is None:
+        import httpx
+
+        _OTLP_CLIENT = httpx.AsyncClient(timeout=httpx.Timeout(2.0))
+    return _OTLP_CLIENT
+
+
+async def _post_otlp(trace: Trace) -> None:
+    import httpx
+
+    endpoint = get_settings().trace_otlp_endpoint
+    try:
+        response = await _get_otlp_client().post(endpoint, json=_otlp_payload(trace))
+        response.raise_for_status()
+    except httpx.HTTPError as exc:
+        logger.warning("OTLP trace export failed (%s): %s", endpoint, exc)
+
+
+def export_trace(trace: Trace) -> None:
+    exporter = _get_exporter()
+    if exporter == EXPORTER_LOG:
+        logger.info("trace %s", json.dumps(trace.to_dict(), ensure_ascii=False))
+    elif exporter == EXPORTER_OTLP:
+        # 응답 지연을 늘리지 않도록 백그라운드로 전송
+        task = asyncio.get_running_loop().create_task(_post_otlp(trace))
+        _PENDING_EXPORTS.add(task)
+        task.add_done_callback(_PENDING_EXPORTS.discard)
+
+
+def server_timing_header(trace: Trace) -> str:
+    """완료된 span을 Server-Timing 형식으로 변환. desc에 부모 span 이름을 넣어 호출 경로를 표시."""
+    names = {item.span_id: item.name for item in trace.spans}
+    entries = []
+    for item in trace.spans:
+        if item.end_ns is None:
+            continue
+        entry = f"{item.name};dur={item.duration_ms:.2f}"
+        if item.parent_id in names:
+            entry += f';desc="{names[item.parent_id]}"'
+        entries.append(entry)
+    return ", ".join(entries)
+
+
+def _is_truthy(value: bytes) -> bool:
+    return value.strip().lower() in {b"1", b"true", b"yes", b"on"}
+
+
+class TracingMiddleware:
+    """요청 단위 trace를 시작하고 끝나면 export. 디버그 헤더 요청 시 span 타이밍을 응답 헤더로 반환."""
+
+    def __init__(self, app, path_prefix: str) -> None:
+        self.app = app
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        debug_header = DEBUG_TIMING_HEADER.lower().encode("ascii")
+        debug = _debug_header_enabled() and any(
+            key == debug_header and _is_truthy(value) for key, value in scope["headers"]
+        )
+        exporter = _get_exporter()
+        if not debug and exporter == EXPORTER_NONE:
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace(trace_id=_new_id(16), name=f"{scope['method']} {scope['path']}")
+        trace_token = _CURRENT_TRACE.set(trace)
+
+        async def send_with_timing(message) -> None:
+            if debug and message["type"] == "http.response.start":
+                # 스트리밍 응답은 헤더 전송 시점까지 끝난 span만 포함
+                headers = list(message.get("headers", []))
+                headers.append((b"x-trace-id", trace.trace_id.encode("ascii")))
+                timing = server_timing_header(trace)
+                if timing:
+                    headers.append((b"server-timing", timing.encode("latin-1", "replace")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            with span(trace.name):
+                await self.app(scope, receive, send_with_timing)
+        finally:
+            _CURRENT_TRACE.reset(trace_token)
+            if exporter != EXPORTER_NONE:
+                export_trace(trace)
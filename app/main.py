@@ -1,12 +1,38 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 
+from app.agents.analyzer.rule_set import start_rule_pack_watcher
 from app.api.analyze import router as analyze_router
+from app.api.ops import root_router as ops_root_router
+from app.api.ops import router as ops_router
+from app.core.admission import AdmissionMiddleware
 from app.core.config import API_PREFIX, APP_NAME
+from app.core.tracing import TracingMiddleware
+from app.pipeline.warmup import start_warmup
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # 워밍업은 백그라운드로 실행하고 완료 전까지 /ready가 503을 반환
+    warmup_task = start_warmup()
+    # rule pack 파일이 바뀌면 재시작 없이 새 룰셋으로 교체
+    watcher_task = start_rule_pack_watcher()
+    yield
+    for task in (warmup_task, watcher_task):
+        if task is not None and not task.done():
+            task.cancel()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title=APP_NAME)
+    app = FastAPI(title=APP_NAME, lifespan=lifespan)
     app.include_router(analyze_router, prefix=API_PREFIX)
+    app.include_router(ops_router, prefix=API_PREFIX)
+    app.include_router(ops_root_router)
+    app.add_middleware(AdmissionMiddleware, path_prefix=f"{API_PREFIX}/analyze")
+    # 가장 바깥에서 trace를 시작해 입구 거절까지 포함
+    app.add_middleware(TracingMiddleware, path_prefix=f"{API_PREFIX}/analyze")
     return app
 
 
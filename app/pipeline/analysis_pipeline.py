@@ -1,82 +1,181 @@
-from typing import Dict, List
+import asyncio
+import heapq
+from typing import AsyncIterator, Collection, Dict, List, Mapping, Sequence, Tuple
 
-from app.agents.actions.safe_action_generator import generate_safe_actions
+from app.agents.actions.safe_action_generator import (
+    generate_safe_actions_async,
+    stream_safe_actions_async,
+)
 from app.agents.analyzer.conversation_analyzer import (
-    analyze_conversation,
-    extract_signal_phrases,
+    merge_signal_hits,
+    scan_conversation,
+    scan_message_signals,
     signal_query_terms,
 )
-from app.agents.context.conversation_type_classifier import classify_conversation_type
+from app.agents.analyzer.rule_matcher import SignalMatch
+from app.agents.analyzer.rule_set import RuleSet, get_rule_set
+from app.agents.context.conversation_type_classifier import (
+    classify_conversation_type_async,
+    classify_conversation_types_async,
+)
 from app.agents.decision.decision_orchestrator import decide_risk_stage
-from app.agents.explanation.rag.rag_provider import retrieve_evidence
-from app.agents.explanation.rag.retrieval_contract import RetrievalRequest
+from app.agents.explanation.rag.rag_provider import retrieve_evidence, retrieve_evidence_batch
+from app.agents.explanation.rag.retrieval_contract import Reference, RetrievalRequest
+from app.core.deadline import Deadline
 from app.core.logging import get_logger
-from app.pipeline.message_preprocessor import normalize_messages_with_ocr
-from app.schemas.request import AnalyzeRequest
-from app.utils.text_patterns import resolve_risk_signals
+from app.core.metrics import observe_stage
+from app.core.tracing import traced
+from app.pipeline.message_preprocessor import (
+    normalize_messages_with_ocr_async,
+    ocr_messages_async,
+)
+from app.pipeline.result_cache import analysis_cache_key, get_result_cache
+from app.pipeline.session_store import (
+    SessionMessage,
+    UnknownSessionError,
+    get_session_store,
+    message_fingerprint,
+)
+from app.schemas.conversation import NormalizedConversation, NormalizedMessage
+from app.schemas.request import AnalyzeRequest, SessionAnalyzeRequest
 from app.utils.text_utils import normalize_text
 
 logger = get_logger(__name__)
 
 
 def _build_conversation_excerpt(
-    messages: List[object], matched_phrases: List[str], max_lines: int = 20
+    conversation: NormalizedConversation,
+    match_index: Mapping[int, Collection[object]],
+    matched_phrases: Sequence[str] = (),
+    max_lines: int = 20,
 ) -> List[str]:
-    if not messages:
-        return []
+    """LLM에 넘길 대화 발췌 (최대 max_lines줄, 원래 순서).
 
-    phrases = [normalize_text(phrase) for phrase in matched_phrases if phrase.strip()]
-    lines = [f"{message.sender}: {message.content}" for message in messages]
-    normalized_contents = [normalize_text(message.content) for message in messages]
+    match_index는 메시지 번호 -> 그 메시지의 규칙 매칭 (OTHER 메시지만 검사한 결과).
+    matched_phrases를 그대로 포함한 ME 메시지("계좌번호 알려주세요? 왜요")도 매칭으로 셈.
+    매칭이 많은 메시지를(같으면 최근 메시지를) 먼저 고르고 남는 줄은 최근 대화로 채움.
+    """
+    messages = conversation.messages
+    if not messages or max_lines <= 0:
+        return []
 
-    selected_indices: List[int] = []
+    match_counts = {
+        idx: len(matches) for idx, matches in match_index.items() if 0 <= idx < len(messages)
+    }
+    phrases = [normalize_text(phrase) for phrase in dict.fromkeys(matched_phrases)]
+    phrases = [phrase for phrase in phrases if phrase]
     if phrases:
-        for idx, normalized in enumerate(normalized_contents):
-            if any(phrase in normalized for phrase in phrases):
-                selected_indices.append(idx)
+        for idx, message in enumerate(messages):
+            if message.is_other or idx in match_counts:
+                continue
+            echoed = sum(phrase in message.normalized for phrase in phrases)
+            if echoed:
+                match_counts[idx] = echoed
+
+    selected = set(
+        heapq.nlargest(max_lines, match_counts, key=lambda idx: (match_counts[idx], idx))
+    )
 
     # 최근 대화를 우선해서 부족한 라인을 채움
-    idx = len(lines) - 1
-    while len(selected_indices) < max_lines and idx >= 0:
-        if idx not in selected_indices:
-            selected_indices.append(idx)
+    idx = len(messages) - 1
+    while len(selected) < max_lines and idx >= 0:
+        selected.add(idx)
         idx -= 1
 
-    selected_indices = sorted(selected_indices)
-    return [lines[idx] for idx in selected_indices]
+    return [f"{messages[idx].sender}: {messages[idx].raw}" for idx in sorted(selected)]
 
 
-def run_analysis_pipeline(payload: AnalyzeRequest) -> Dict[str, object]:
-    conversation = normalize_messages_with_ocr(payload.messages)
-    contents = [message.content for message in conversation if message.content.strip()]
-    other_contents = [
-        message.content
-        for message in conversation
-        if message.sender.strip().upper() == "OTHER" and message.content.strip()
-    ]
-    logger.info(
-        "Pipeline start: %d turns (other=%d)",
-        len(conversation),
-        len(other_contents),
+def _analyze_signals(
+    conversation_type: str, conversation: NormalizedConversation, rules: RuleSet
+) -> Tuple[List[str], List[str], List[str], str, Dict[int, List[SignalMatch]]]:
+    # 2. 규칙 기반 신호 추출 (유형 기반 + 공통 신호) (위험 신호 후보 추출)
+    with observe_stage("rule_scan"):
+        scan = scan_conversation(conversation, conversation_type, rules)
+    rule_signals, signal_terms, matched_phrases, risk_stage = _derive_risk(
+        scan.signals, scan.phrases, rules
     )
+    # 발췌 단계에서 메시지를 다시 검색하지 않도록 매칭 위치 색인을 함께 반환
+    return rule_signals, signal_terms, matched_phrases, risk_stage, scan.match_index()
 
-    # 1. 대화 유형 분류 (임베딩 + fallback) (유형별 신호 범위 결정을 위함)
-    conversation_type = classify_conversation_type(contents)
-    logger.info("Step 1 conversation_type: %s", conversation_type)
 
-    # 2. 규칙 기반 신호 추출 (유형 기반 + 공통 신호) (위험 신호 후보 추출)
-    allowed_signals = resolve_risk_signals(conversation_type)
-    rule_signals = analyze_conversation(other_contents, allowed_signals=allowed_signals)
+def _derive_risk(
+    rule_signals: List[str], matched_phrases: List[str], rules: RuleSet
+) -> Tuple[List[str], List[str], List[str], str]:
     logger.info("Step 2 signals: %s", rule_signals)
 
     # 3. RAG 쿼리 보강 (근거 자료 확보를 위한 검색 품질 향상)
-    signal_terms = signal_query_terms(rule_signals)
-    matched_phrases = extract_signal_phrases(other_contents, allowed_signals=allowed_signals)
+    signal_terms = signal_query_terms(rule_signals, rules)
     logger.info("Step 3 query_terms=%s matched_phrases=%s", signal_terms, matched_phrases)
 
     # 4. 결정 오케스트레이터 (위험 단계 산출)
     risk_stage = decide_risk_stage(rule_signals)
     logger.info("Step 4 risk_stage: %s", risk_stage)
+    return rule_signals, signal_terms, matched_phrases, risk_stage
+
+
+def _rag_references(references: List[Reference]) -> List[Dict[str, str]]:
+    return [
+        {"source": reference.source, "summary": reference.note} for reference in references
+    ]
+
+
+def _build_result(
+    conversation_type: str,
+    safe_actions: Dict[str, object],
+    references: List[Reference],
+    deadline: Deadline,
+) -> Dict[str, object]:
+    return {
+        "summary": safe_actions["summary"],
+        "type": conversation_type,
+        "risk_signals": safe_actions["risk_signals"],
+        "additional_recommendations": safe_actions["additional_recommendations"],
+        "rag_references": _rag_references(references),
+        "degraded_stages": deadline.degraded_stages,
+    }
+
+
+def _is_cacheable(safe_actions: Dict[str, object], deadline: Deadline) -> bool:
+    # fallback/예산 초과 결과는 일시적인 장애일 수 있어 캐시하지 않음
+    return (
+        not safe_actions.get("fallback")
+        and not deadline.degraded_stages
+        and not deadline.fallback_stages
+    )
+
+
+@traced()
+async def run_analysis_pipeline(payload: AnalyzeRequest) -> Dict[str, object]:
+    # 처리 중에 rule pack이 교체되어도 이 요청은 시작할 때의 룰셋으로 끝까지 처리
+    rules = get_rule_set()
+    # 동일한 대화(정규화 기준)는 OCR/임베딩/LLM 호출 없이 캐시된 결과를 반환
+    cache = get_result_cache()
+    cache_key = analysis_cache_key(payload, rules) if cache is not None else None
+    if cache is not None:
+        cached = await cache.get(cache_key)
+        if cached is not None:
+            logger.info("Pipeline cache hit: %s", cache_key[:12])
+            return cached
+
+    deadline = Deadline.from_budget_ms(payload.deadline_ms)
+    with observe_stage("preprocess"):
+        conversation = NormalizedConversation.from_messages(
+            await normalize_messages_with_ocr_async(payload.messages, deadline=deadline)
+        )
+    logger.info(
+        "Pipeline start: %d turns (other=%d)",
+        len(conversation),
+        len(conversation.others),
+    )
+
+    # 1. 대화 유형 분류 (임베딩 + fallback) (유형별 신호 범위 결정을 위함)
+    conversation_type = await classify_conversation_type_async(conversation, deadline=deadline)
+    logger.info("Step 1 conversation_type: %s", conversation_type)
+
+    # 2~4. 규칙 기반 신호 추출, RAG 쿼리 보강, 위험 단계 산출
+    rule_signals, signal_terms, matched_phrases, risk_stage, match_index = _analyze_signals(
+        conversation_type, conversation, rules
+    )
 
     # 5. RAG 검색 (근거 자료 확보)
     retrieval_request = RetrievalRequest(
@@ -86,26 +185,382 @@ def run_analysis_pipeline(payload: AnalyzeRequest) -> Dict[str, object]:
         query_terms=signal_terms,
         matched_phrases=matched_phrases,
     )
-    references = retrieve_evidence(retrieval_request)
+    with observe_stage("retrieval"):
+        references = retrieve_evidence(retrieval_request)
     logger.info("Step 5 references: %d", len(references))
 
     # 6. 안전 행동 생성 (LLM: references + 대화 발췌 사용) (최종 응답 생성)
     conversation_lines = _build_conversation_excerpt(
-        conversation, matched_phrases, max_lines=20
-    )
-    safe_actions = generate_safe_actions(
-        risk_stage, conversation_type, references, conversation_lines, payload.platform
+        conversation, match_index, matched_phrases, max_lines=20
     )
+    with observe_stage("safe_actions"):
+        safe_actions = await generate_safe_actions_async(
+            risk_stage,
+            conversation_type,
+            references,
+            conversation_lines,
+            payload.platform,
+            deadline=deadline,
+        )
     logger.info("Step 6 safe_actions generated")
 
-    rag_references = [
-        {"source": reference.source, "summary": reference.note} for reference in references
+    result = _build_result(conversation_type, safe_actions, references, deadline)
+    if cache is not None and _is_cacheable(safe_actions, deadline):
+        await cache.set(cache_key, result)
+    if deadline.degraded_stages:
+        logger.warning("Pipeline degraded stages: %s", deadline.degraded_stages)
+    return result
+
+
+@traced()
+async def run_batch_analysis_pipeline(payloads: List[AnalyzeRequest]) -> List[Dict[str, object]]:
+    """여러 대화를 함께 분석. 임베딩은 한 번, 검색과 LLM 호출은 중복 없이 수행."""
+    if not payloads:
+        return []
+
+    rules = get_rule_set()
+    cache = get_result_cache()
+    if cache is None:
+        return [result for result, _ in await _analyze_batch(payloads, rules)]
+
+    cache_keys = [analysis_cache_key(payload, rules) for payload in payloads]
+    results: List[Dict[str, object]] = [None] * len(payloads)
+    pending: Dict[str, List[int]] = {}
+    for idx, key in enumerate(cache_keys):
+        cached = await cache.get(key)
+        if cached is not None:
+            results[idx] = cached
+        else:
+            # 배치 안에서 같은 대화가 반복되면 한 번만 분석
+            pending.setdefault(key, []).append(idx)
+    logger.info(
+        "Batch cache: %d hits, %d to analyze",
+        len(payloads) - sum(len(indices) for indices in pending.values()),
+        len(pending),
+    )
+
+    if pending:
+        pending_keys = list(pending.keys())
+        analyzed = await _analyze_batch(
+            [payloads[pending[key][0]] for key in pending_keys], rules
+        )
+        for key, (result, cacheable) in zip(pending_keys, analyzed):
+            if cacheable:
+                await cache.set(key, result)
+            for idx in pending[key]:
+                results[idx] = result
+    return results
+
+
+async def _analyze_batch(
+    payloads: List[AnalyzeRequest], rules: RuleSet
+) -> List[Tuple[Dict[str, object], bool]]:
+    # 임베딩 호출을 공유하므로 배치 전체에 가장 짧은 예산을 적용
+    budgets = [payload.deadline_ms for payload in payloads if payload.deadline_ms]
+    deadline = Deadline.from_budget_ms(min(budgets) if budgets else None)
+
+    with observe_stage("preprocess"):
+        processed = await asyncio.gather(
+            *(
+                normalize_messages_with_ocr_async(payload.messages, deadline=deadline)
+                for payload in payloads
+            )
+        )
+        conversations = [NormalizedConversation.from_messages(messages) for messages in processed]
+    logger.info("Batch pipeline start: %d conversations", len(payloads))
+
+    # 1. 대화 유형 분류 (배치 전체를 한 번의 임베딩 호출로 처리)
+    conversation_types = await classify_conversation_types_async(conversations, deadline=deadline)
+    logger.info("Batch step 1 conversation_types: %s", conversation_types)
+
+    # 2~4. 규칙 기반 신호 추출, RAG 쿼리 보강, 위험 단계 산출
+    analyses = [
+        _analyze_signals(conversation_type, conversation, rules)
+        for conversation_type, conversation in zip(conversation_types, conversations)
     ]
 
-    return {
-        "summary": safe_actions["summary"],
-        "type": conversation_type,
-        "risk_signals": safe_actions["risk_signals"],
-        "additional_recommendations": safe_actions["additional_recommendations"],
-        "rag_references": rag_references,
-    }
+    # 5. RAG 검색 (코퍼스 1회 로드, 동일 쿼리 1회 검색)
+    retrieval_requests = [
+        RetrievalRequest(
+            risk_stage=risk_stage,
+            conversation_type=conversation_type,
+            signals=rule_signals,
+            query_terms=signal_terms,
+            matched_phrases=matched_phrases,
+        )
+        for conversation_type, (rule_signals, signal_terms, matched_phrases, risk_stage, _) in zip(
+            conversation_types, analyses
+        )
+    ]
+    with observe_stage("retrieval"):
+        references_list = retrieve_evidence_batch(retrieval_requests)
+    logger.info("Batch step 5 references: %s", [len(refs) for refs in references_list])
+
+    # 6. 안전 행동 생성 (동일한 입력은 한 번만 호출하고 나머지는 동시에 실행)
+    calls: Dict[Tuple[object, ...], Tuple[str, str, List[Reference], List[str], str]] = {}
+    call_keys: List[Tuple[object, ...]] = []
+    for payload, conversation, conversation_type, analysis, references in zip(
+        payloads, conversations, conversation_types, analyses, references_list
+    ):
+        risk_stage = analysis[3]
+        conversation_lines = _build_conversation_excerpt(
+            conversation, analysis[4], analysis[2], max_lines=20
+        )
+        key = (
+            risk_stage,
+            conversation_type,
+            tuple(references),
+            tuple(conversation_lines),
+            payload.platform,
+        )
+        calls.setdefault(
+            key,
+            (risk_stage, conversation_type, references, conversation_lines, payload.platform),
+        )
+        call_keys.append(key)
+
+    unique_keys = list(calls.keys())
+    with observe_stage("safe_actions"):
+        safe_actions_list = await asyncio.gather(
+            *(generate_safe_actions_async(*calls[key], deadline=deadline) for key in unique_keys)
+        )
+    safe_actions_by_key = dict(zip(unique_keys, safe_actions_list))
+    logger.info(
+        "Batch step 6 safe_actions generated (%d calls for %d conversations)",
+        len(unique_keys),
+        len(payloads),
+    )
+
+    return [
+        (
+            _build_result(conversation_type, safe_actions_by_key[key], references, deadline),
+            _is_cacheable(safe_actions_by_key[key], deadline),
+        )
+        for conversation_type, references, key in zip(
+            conversation_types, references_list, call_keys
+        )
+    ]
+
+
+async def stream_analysis_pipeline(
+    payload: AnalyzeRequest,
+) -> AsyncIterator[Tuple[str, Dict[str, object]]]:
+    """run_analysis_pipeline과 같은 단계를 수행하되 단계별 결과를 완료되는 즉시 내보냄."""
+    rules = get_rule_set()
+    deadline = Deadline.from_budget_ms(payload.deadline_ms)
+    with observe_stage("preprocess"):
+        conversation = NormalizedConversation.from_messages(
+            await normalize_messages_with_ocr_async(payload.messages, deadline=deadline)
+        )
+    logger.info(
+        "Stream pipeline start: %d turns (other=%d)",
+        len(conversation),
+        len(conversation.others),
+    )
+
+    # 1. 대화 유형 분류
+    conversation_type = await classify_conversation_type_async(conversation, deadline=deadline)
+    logger.info("Step 1 conversation_type: %s", conversation_type)
+    yield "classification", {"type": conversation_type}
+
+    # 2~4. 규칙 기반 신호 추출, RAG 쿼리 보강, 위험 단계 산출
+    rule_signals, signal_terms, matched_phrases, risk_stage, match_index = _analyze_signals(
+        conversation_type, conversation, rules
+    )
+    yield "risk_stage", {"risk_stage": risk_stage, "signals": rule_signals}
+
+    # 5. RAG 검색
+    retrieval_request = RetrievalRequest(
+        risk_stage=risk_stage,
+        conversation_type=conversation_type,
+        signals=rule_signals,
+        query_terms=signal_terms,
+        matched_phrases=matched_phrases,
+    )
+    with observe_stage("retrieval"):
+        references = retrieve_evidence(retrieval_request)
+    logger.info("Step 5 references: %d", len(references))
+    yield "references", {"rag_references": _rag_references(references)}
+
+    # 6. 안전 행동 생성 (LLM 출력은 도착하는 대로 전달)
+    conversation_lines = _build_conversation_excerpt(
+        conversation, match_index, matched_phrases, max_lines=20
+    )
+    safe_actions: Dict[str, object] = {}
+    # 여러 yield에 걸쳐 측정. 클라이언트 연결 종료(GeneratorExit)로 중단되어도 finally에서 기록됨
+    with observe_stage("safe_actions"):
+        async for event, data in stream_safe_actions_async(
+            risk_stage,
+            conversation_type,
+            references,
+            conversation_lines,
+            payload.platform,
+            deadline=deadline,
+        ):
+            if event == "delta":
+                yield "safe_actions_delta", {"delta": data}
+            else:
+                safe_actions = data
+    logger.info("Step 6 safe_actions generated")
+
+    yield "result", _build_result(conversation_type, safe_actions, references, deadline)
+
+
+def _session_match_index(
+    items: List[SessionMessage], allowed_signals: List[str]
+) -> Dict[int, List[str]]:
+    """세션에 보관한 메시지별 매칭으로 만든 발췌 색인 (메시지 번호 -> 구절이 매칭된 신호)."""
+    allowed = set(allowed_signals)
+    index: Dict[int, List[str]] = {}
+    for idx, item in enumerate(items):
+        signals = [
+            signal for signal, phrases in item.signal_hits.items() if signal in allowed and phrases
+        ]
+        if signals:
+            index[idx] = signals
+    return index
+
+
+def _message_signal_hits(message: NormalizedMessage, rules: RuleSet) -> Dict[str, List[str]]:
+    if not (message.is_other and message.has_content):
+        return {}
+    return scan_message_signals(message, rules)
+
+
+@traced()
+async def run_session_analysis_pipeline(payload: SessionAnalyzeRequest) -> Dict[str, object]:
+    """uuid 기준 세션 상태를 유지하며 새 메시지만 처리하는 증분 분석."""
+    rules = get_rule_set()
+    store = get_session_store()
+    # append는 앞부분이 세션에 있어야 의미가 있음. 세션이 만료/제거된 경우 새 메시지만 분석하면
+    # 제거된 앞부분의 위험 신호를 놓친 채 정상 결과처럼 보이므로 전체 대화를 다시 받음
+    session = store.get(payload.uuid) if payload.append else store.get_or_create(payload.uuid)
+    if session is None:
+        raise UnknownSessionError(payload.uuid)
+    deadline = Deadline.from_budget_ms(payload.deadline_ms)
+    async with session.lock:
+        if payload.append:
+            if not session.messages:
+                raise UnknownSessionError(payload.uuid)
+            new_messages = list(payload.messages)
+        else:
+            # 전체 대화를 다시 보낸 경우: 이미 처리한 앞부분이 같으면 뒤에 붙은 메시지만 처리
+            fingerprints = [message_fingerprint(message) for message in payload.messages]
+            known = session.fingerprints
+            if fingerprints[: len(known)] != known:
+                logger.info("Session %s history changed; rebuilding", payload.uuid)
+                session.reset()
+                known = []
+            new_messages = list(payload.messages[len(known) :])
+
+        store.check_limits(
+            session, len(new_messages), sum(len(message.content) for message in new_messages)
+        )
+
+        if session.messages and session.ruleset_digest != rules.digest:
+            # rule pack이 바뀌면 보관한 메시지를 새 룰셋으로 다시 검사 (OCR은 다시 하지 않음)
+            logger.info("Session %s rescanned with rule pack %s", payload.uuid, rules.version)
+            with observe_stage("rule_scan"):
+                for item in session.messages:
+                    item.signal_hits = _message_signal_hits(item.message, rules)
+            session.conversation_type = None
+            session.last_result = None
+        session.ruleset_digest = rules.digest
+
+        # 이전 요청에서 OCR이 실패/생략된 메시지는 URL 그대로 두지 않고 이번 요청에서 다시 시도
+        retry_items = [item for item in session.messages if item.pending_ocr is not None]
+        if (
+            not new_messages
+            and not retry_items
+            and session.last_result is not None
+            and session.last_platform == payload.platform
+        ):
+            logger.info("Session %s unchanged; returning cached result", payload.uuid)
+            return session.last_result
+
+        with observe_stage("preprocess"):
+            processed = await ocr_messages_async(
+                [item.pending_ocr for item in retry_items] + new_messages, deadline=deadline
+            )
+        recovered = 0
+        with observe_stage("rule_scan"):
+            for item, (message, ocr_done) in zip(retry_items, processed):
+                if ocr_done:
+                    item.message = NormalizedMessage.from_message(message)
+                    item.signal_hits = _message_signal_hits(item.message, rules)
+                    item.pending_ocr = None
+                    recovered += 1
+            for original, (message, ocr_done) in zip(new_messages, processed[len(retry_items) :]):
+                normalized = NormalizedMessage.from_message(message)
+                session.messages.append(
+                    SessionMessage(
+                        fingerprint=message_fingerprint(original),
+                        message=normalized,
+                        signal_hits=_message_signal_hits(normalized, rules),
+                        pending_ocr=None if ocr_done else original,
+                    )
+                )
+        # OCR 결과는 URL보다 길 수 있어 보관한 뒤 다시 확인 (넘으면 세션째 제거)
+        store.check_limits(session, 0, 0)
+
+        conversation = session.conversation
+        logger.info(
+            "Session pipeline: %d turns (new=%d, ocr_recovered=%d, other=%d)",
+            len(conversation),
+            len(new_messages),
+            recovered,
+            len(conversation.others),
+        )
+
+        # 1. 대화 유형 분류 (새 메시지나 OCR을 다시 한 메시지가 있을 때만 다시 분류)
+        if new_messages or recovered or session.conversation_type is None:
+            session.conversation_type = await classify_conversation_type_async(
+                conversation, deadline=deadline
+            )
+        conversation_type = session.conversation_type
+        logger.info("Step 1 conversation_type: %s", conversation_type)
+
+        # 2~4. 메시지별 매칭 결과를 유형별 신호 범위로 합쳐 위험 단계 산출
+        allowed_signals = rules.resolve_risk_signals(conversation_type)
+        merged_signals, merged_phrases = merge_signal_hits(
+            (item.signal_hits for item in session.messages), allowed_signals=allowed_signals
+        )
+        rule_signals, signal_terms, matched_phrases, risk_stage = _derive_risk(
+            merged_signals, merged_phrases, rules
+        )
+
+        # 5. RAG 검색
+        retrieval_request = RetrievalRequest(
+            risk_stage=risk_stage,
+            conversation_type=conversation_type,
+            signals=rule_signals,
+            query_terms=signal_terms,
+            matched_phrases=matched_phrases,
+        )
+        with observe_stage("retrieval"):
+            references = retrieve_evidence(retrieval_request)
+        logger.info("Step 5 references: %d", len(references))
+
+        # 6. 안전 행동 생성
+        conversation_lines = _build_conversation_excerpt(
+            conversation,
+            _session_match_index(session.messages, allowed_signals),
+            matched_phrases,
+            max_lines=20,
+        )
+        with observe_stage("safe_actions"):
+            safe_actions = await generate_safe_actions_async(
+                risk_stage,
+                conversation_type,
+                references,
+                conversation_lines,
+                payload.platform,
+                deadline=deadline,
+            )
+        logger.info("Step 6 safe_actions generated")
+
+        result = _build_result(conversation_type, safe_actions, references, deadline)
+        # 저하된 결과는 다음 요청에서 다시 계산되도록 세션에 보관하지 않음
+        session.last_result = result if _is_cacheable(safe_actions, deadline) else None
+        session.last_platform = payload.platform
+        return result
@@ -1,38 +1,75 @@
-from typing import List
+import asyncio
+from typing import List, Optional, Tuple
 
+from app.core.admission import OverloadedError
+from app.core.deadline import Deadline, DeadlineExceeded, degrade_reason, resolve_deadline
 from app.core.logging import get_logger
+from app.core.metrics import record_error, record_fallback
+from app.core.tracing import traced
 from app.schemas.request import Message
-from app.services.ocr_service import extract_text_from_image_url
+from app.services.ocr_service import extract_text_from_image_url_async
 
 logger = get_logger(__name__)
 
 
-def normalize_messages_with_ocr(messages: List[Message]) -> List[Message]:
-    processed: List[Message] = []
-    for message in messages:
-        if message.type != "URL":
-            processed.append(message)
-            continue
-
-        try:
-            extracted_text = extract_text_from_image_url(message.content)
-        except Exception as exc:
-            logger.warning("OCR failed for URL message (%s): %s", message.content, exc)
-            processed.append(message)
-            continue
-
-        if not extracted_text:
-            logger.warning("OCR returned empty text for URL message: %s", message.content)
-            processed.append(message)
-            continue
-
-        processed.append(
-            Message(
-                type="TEXT",
-                content=extracted_text,
-                sender=message.sender,
-                timestamp=message.timestamp,
-            )
+def _apply_ocr_result(message: Message, extracted_text: Optional[str]) -> Message:
+    if not extracted_text:
+        logger.warning("OCR returned empty text for URL message: %s", message.content)
+        record_fallback("ocr")
+        return message
+
+    return Message(
+        type="TEXT",
+        content=extracted_text,
+        sender=message.sender,
+        timestamp=message.timestamp,
+    )
+
+
+async def _ocr_message_async(message: Message, deadline: Deadline) -> Tuple[Message, bool]:
+    """(OCR 이후 메시지, OCR 완료 여부). OCR 실패/예산 초과 시 원래 메시지와 False."""
+    if message.type != "URL":
+        return message, True
+
+    try:
+        extracted_text = await deadline.run(extract_text_from_image_url_async(message.content))
+    except (DeadlineExceeded, OverloadedError) as exc:
+        logger.warning(
+            "OCR skipped for URL message (%s): %s", message.content, degrade_reason(exc)
         )
+        deadline.mark_degraded("ocr")
+        record_fallback("ocr")
+        return message, False
+    except Exception as exc:
+        logger.warning("OCR failed for URL message (%s): %s", message.content, exc)
+        record_error("ocr")
+        record_fallback("ocr")
+        deadline.mark_fallback("ocr")
+        return message, False
+
+    return _apply_ocr_result(message, extracted_text), True
+
+
+async def _ocr_messages_async(
+    messages: List[Message], deadline: Optional[Deadline]
+) -> List[Tuple[Message, bool]]:
+    # URL 메시지는 서로 독립적이므로 동시에 OCR을 수행하고 원래 순서를 유지
+    deadline = resolve_deadline(deadline)
+    return list(
+        await asyncio.gather(*(_ocr_message_async(message, deadline) for message in messages))
+    )
+
+
+@traced()
+async def normalize_messages_with_ocr_async(
+    messages: List[Message], deadline: Optional[Deadline] = None
+) -> List[Message]:
+    return [message for message, _ in await _ocr_messages_async(messages, deadline)]
+
 
-    return processed
+@traced()
+async def ocr_messages_async(
+    messages: List[Message], deadline: Optional[Deadline] = None
+) -> List[Tuple[Message, bool]]:
+    """메시지별 (OCR 이후 메시지, OCR 완료 여부). 실패한 OCR을 다음 요청에서 다시 시도할 때 사용."""
+    return await _ocr_messages_async(messages, deadline)
@@ -0,0 +1,233 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.agents.analyzer.rule_set import RuleSet, get_rule_set
+from app.agents.context.conversation_type_classifier import (
+    embedding_model_name,
+    prototypes_version,
+)
+from app.agents.explanation.rag.rag_provider import corpus_version
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.metrics import record_cache_lookup, register_cache_size
+from app.schemas.request import AnalyzeRequest
+from app.utils.text_utils import normalize_text
+from app.utils.ttl_cache import TTLCache
+
+logger = get_logger(__name__)
+
+# 디스크 계층 정리(디렉터리 전체 탐색) 최소 간격
+_DISK_PRUNE_INTERVAL_SECONDS = 60.0
+
+
+def _pipeline_versions(rules: RuleSet) -> Dict[str, str]:
+    settings = get_settings()
+    # guard 구간 크기/입력 상한에 따라 매칭 결과가 달라짐. v2: 구간 하나에 들어가는 메시지는
+    # 나누지 않고 lookaround는 메시지 전체 기준으로 확인
+    guard = rules.guard
+    rule_guard = (
+        f"v2:{guard.max_message_chars}:{guard.window_chars}" if guard is not None else "off"
+    )
+    # cascade 사용 여부/임계값에 따라 분류 결과(type)가 달라짐
+    classifier_cascade = (
+        f"{settings.classifier_cascade_min_hits}:{settings.classifier_cascade_margin}"
+        if settings.classifier_cascade_enabled
+        else "off"
+    )
+    return {
+        "ruleset": rules.digest,
+        "ruleset_version": rules.version,
+        "rule_guard": rule_guard,
+        "classifier_cascade": classifier_cascade,
+        "corpus": corpus_version(),
+        "prototypes": prototypes_version(),
+        "embedding_model": embedding_model_name(),
+        "ocr_model": settings.ocr_model,
+        "safe_actions_model": settings.safe_actions_model,
+    }
+
+
+def analysis_cache_key(payload: AnalyzeRequest, rules: Optional[RuleSet] = None) -> str:
+    """정규화한 메시지 내용/발신자, 플랫폼, 룰/코퍼스/모델 버전 기반의 결정적 키.
+
+    rules는 요청을 처리할 룰셋 스냅샷 (없으면 현재 스냅샷).
+    """
+    body = {
+        "messages": [
+            [message.type, message.sender.strip().upper(), normalize_text(message.content)]
+            for message in payload.messages
+        ],
+        "platform": payload.platform,
+        "versions": _pipeline_versions(rules or get_rule_set()),
+    }
+    raw = json.dumps(body, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """분석 결과 캐시. 인메모리 LRU(TTL) 앞단 + 선택적 디스크 계층.
+
+    디스크 읽기/쓰기는 이벤트 루프를 막지 않도록 스레드에서 실행. 쓰기 시 주기적으로 만료된
+    파일과 disk_max_entries를 넘는 오래된 파일을 지움.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        disk_dir: Optional[Path] = None,
+        disk_max_entries: Optional[int] = None,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = disk_dir
+        self.disk_max_entries = disk_max_entries
+        self._prune_lock = threading.Lock()
+        self._last_prune = 0.0
+        self._memory: TTLCache[Dict[str, object]] = TTLCache(max_entries, ttl_seconds)
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, object]]:
+        if self.disk_dir is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                return None
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _write_disk(self, key: str, value: Dict[str, object]) -> None:
+        if self.disk_dir is None:
+            return
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 다른 워커(스레드)가 반쯤 쓰인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(json.dumps(value, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            logger.warning("Result cache disk write failed (%s): %s", path, exc)
+        self._maybe_prune_disk()
+
+    def _maybe_prune_disk(self) -> None:
+        now = time.time()
+        if now - self._last_prune < _DISK_PRUNE_INTERVAL_SECONDS:
+            return
+        # 다른 스레드가 정리 중이면 건너뜀
+        if not self._prune_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_prune = now
+            self._prune_disk(now)
+        finally:
+            self._prune_lock.release()
+
+    def _prune_disk(self, now: float) -> None:
+        """다시 조회되지 않는 키의 파일도 남지 않도록 만료/초과 파일을 mtime 기준으로 삭제."""
+        entries: List[Tuple[float, Path]] = []
+        removed = 0
+        try:
+            for path in self.disk_dir.glob("*/*"):
+                try:
+                    mtime = path.stat().st_mtime
+                except OSError:
+                    continue
+                # 쓰다 중단된 임시 파일도 만료 기준으로 정리
+                if now - mtime > self.ttl_seconds:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+                elif path.suffix == ".json":
+                    entries.append((mtime, path))
+            if self.disk_max_entries is not None and len(entries) > self.disk_max_entries:
+                entries.sort()
+                for _, path in entries[: len(entries) - self.disk_max_entries]:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+        except OSError as exc:
+            logger.warning("Result cache disk prune failed (%s): %s", self.disk_dir, exc)
+        if removed:
+            logger.info("Result cache disk pruned %d files", removed)
+
+    async def get(self, key: str) -> Optional[Dict[str, object]]:
+        value = self._memory.get(key)
+        if value is not None:
+            self.hits += 1
+            record_cache_lookup("result", "hit")
+            return value
+        value = None
+        if self.disk_dir is not None:
+            value = await asyncio.to_thread(self._read_disk, key)
+        if value is not None:
+            self.hits += 1
+            self.disk_hits += 1
+            record_cache_lookup("result", "disk_hit")
+            self._memory.set(key, value)
+            return value
+        self.misses += 1
+        record_cache_lookup("result", "miss")
+        return None
+
+    async def set(self, key: str, value: Dict[str, object]) -> None:
+        self._memory.set(key, value)
+        if self.disk_dir is not None:
+            await asyncio.to_thread(self._write_disk, key, value)
+
+    def clear(self) -> None:
+        self._memory.clear()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def stats(self) -> Dict[str, object]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "memory": self._memory.stats(),
+            "disk_enabled": self.disk_dir is not None,
+        }
+
+
+_RESULT_CACHE: Optional[ResultCache] = None
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """캐시가 비활성화된 경우 None."""
+    global _RESULT_CACHE
+    settings = get_settings()
+    if not settings.result_cache_enabled:
+        return None
+    if _RESULT_CACHE is None:
+        _RESULT_CACHE = ResultCache(
+            settings.result_cache_max_entries,
+            settings.result_cache_ttl_seconds,
+            Path(settings.result_cache_dir) if settings.result_cache_dir else None,
+            settings.result_cache_disk_max_entries,
+        )
+    return _RESULT_CACHE
+
+
+def _cache_size_metric() -> Optional[int]:
+    cache = _RESULT_CACHE
+    return len(cache) if cache is not None else None
+
+
+register_cache_size("result", _cache_size_metric)
@@ -0,0 +1,158 @@
+import asyncio
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from app.core.config import get_settings
+from app.core.metrics import REGISTRY, CallbackGauge
+from app.schemas.conversation import NormalizedConversation, NormalizedMessage
+from app.schemas.request import Message
+from app.utils.ttl_cache import TTLCache
+
+
+def message_fingerprint(message: Message) -> str:
+    raw = "\x1f".join(
+        [message.type, message.sender, message.content, message.timestamp.isoformat()]
+    )
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class UnknownSessionError(LookupError):
+    """append 요청의 세션이 없음 (만료/제거/재시작). 클라이언트가 전체 대화를 다시 보내야 함."""
+
+    def __init__(self, uuid: str) -> None:
+        super().__init__(f"session {uuid} is unknown")
+        self.uuid = uuid
+
+
+class SessionLimitError(ValueError):
+    """세션에 보관할 메시지 수/문자 수가 상한을 넘음. 세션은 제거되고 요청은 거절됨."""
+
+    def __init__(self, uuid: str, max_messages: int, max_chars: int) -> None:
+        super().__init__(
+            f"session {uuid} exceeds {max_messages} messages or {max_chars} characters"
+        )
+        self.uuid = uuid
+        self.max_messages = max_messages
+        self.max_chars = max_chars
+
+
+@dataclass
+class SessionMessage:
+    fingerprint: str
+    # OCR 이후 메시지. 세션에 남아 다음 요청에서 다시 정규화하지 않음
+    message: NormalizedMessage
+    # OTHER 메시지의 신호별 매칭 구절 (유형과 무관하게 전체 룰셋 기준으로 보관)
+    signal_hits: Dict[str, List[str]] = field(default_factory=dict)
+    # OCR이 실패/생략된 URL 메시지 원본. 다음 요청에서 OCR을 다시 시도하고 성공하면 None
+    pending_ocr: Optional[Message] = None
+
+
+@dataclass
+class ConversationSession:
+    uuid: str
+    messages: List[SessionMessage] = field(default_factory=list)
+    conversation_type: Optional[str] = None
+    last_result: Optional[Dict[str, object]] = None
+    # last_result를 만든 요청의 플랫폼 (플랫폼별 권고가 달라 다른 플랫폼이면 다시 생성)
+    last_platform: Optional[str] = None
+    # signal_hits를 계산한 룰셋 (rule pack이 바뀌면 다시 검사)
+    ruleset_digest: Optional[str] = None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    @property
+    def fingerprints(self) -> List[str]:
+        return [item.fingerprint for item in self.messages]
+
+    @property
+    def total_chars(self) -> int:
+        return sum(len(item.message.raw) for item in self.messages)
+
+    @property
+    def conversation(self) -> NormalizedConversation:
+        return NormalizedConversation.from_normalized(item.message for item in self.messages)
+
+    def reset(self) -> None:
+        self.messages = []
+        self.conversation_type = None
+        self.last_result = None
+        self.last_platform = None
+        self.ruleset_digest = None
+
+
+class SessionStore:
+    """uuid 기준 대화 세션 상태 저장소. 크기/만료 제한을 넘으면 오래된 세션부터 제거.
+
+    세션 하나의 메시지 수/문자 수도 max_messages/max_chars로 제한 (check_limits).
+    """
+
+    def __init__(
+        self, max_entries: int, ttl_seconds: float, max_messages: int, max_chars: int
+    ) -> None:
+        self._sessions: TTLCache[ConversationSession] = TTLCache(max_entries, ttl_seconds)
+        self.max_messages = max_messages
+        self.max_chars = max_chars
+
+    def get(self, uuid: str) -> Optional[ConversationSession]:
+        session = self._sessions.get(uuid)
+        if session is not None:
+            # 접근 시마다 다시 저장해 LRU 순서와 만료 시간을 갱신
+            self._sessions.set(uuid, session)
+        return session
+
+    def get_or_create(self, uuid: str) -> ConversationSession:
+        session = self._sessions.get(uuid)
+        if session is None:
+            session = ConversationSession(uuid=uuid)
+        # 접근 시마다 다시 저장해 LRU 순서와 만료 시간을 갱신
+        self._sessions.set(uuid, session)
+        return session
+
+    def check_limits(
+        self, session: ConversationSession, new_messages: int, new_chars: int
+    ) -> None:
+        """새 메시지를 더하면 상한을 넘는 경우 세션을 제거하고 SessionLimitError.
+
+        같은 uuid로 계속 append하면 세션 수 제한과 무관하게 메모리가 늘어나므로 세션 단위로 제한.
+        """
+        if (
+            len(session.messages) + new_messages > self.max_messages
+            or session.total_chars + new_chars > self.max_chars
+        ):
+            self.discard(session.uuid)
+            raise SessionLimitError(session.uuid, self.max_messages, self.max_chars)
+
+    def discard(self, uuid: str) -> None:
+        self._sessions.pop(uuid)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def stats(self) -> Dict[str, int]:
+        return self._sessions.stats()
+
+
+_SESSION_STORE: Optional[SessionStore] = None
+
+
+def get_session_store() -> SessionStore:
+    global _SESSION_STORE
+    if _SESSION_STORE is None:
+        settings = get_settings()
+        _SESSION_STORE = SessionStore(
+            settings.session_max_entries,
+            settings.session_ttl_seconds,
+            settings.session_max_messages,
+            settings.session_max_chars,
+        )
+    return _SESSION_STORE
+
+
+REGISTRY.register(
+    CallbackGauge(
+        "ai_server_sessions",
+        "Conversation sessions held in the session store.",
+        (),
+        lambda: {(): float(len(_SESSION_STORE))} if _SESSION_STORE is not None else {},
+    )
+)
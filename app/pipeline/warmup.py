@@ -0,0 +1,154 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.agents.actions import safe_action_generator
+from app.agents.analyzer.conversation_analyzer import analyze_conversation
+from app.agents.analyzer.rule_set import get_rule_set
+from app.agents.context import conversation_type_classifier
+from app.agents.context.conversation_type_classifier import warm_prototype_centroids
+from app.agents.context.embedding_cache import get_embedding_cache
+from app.agents.explanation.rag.rag_provider import warm_corpus
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.metrics import REGISTRY, CallbackGauge
+from app.schemas.conversation import NormalizedConversation
+from app.services import ocr_service
+
+logger = get_logger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+READY = "ready"
+FAILED = "failed"
+
+# 규칙 스모크 테스트: (메시지, 기대 신호). 패턴이 깨진 채로 배포되면 트래픽을 받지 않음
+RULE_SMOKE_CASES: List[Tuple[str, List[str]]] = [
+    ("계좌번호 알려주세요. 오늘 안에 입금해 주세요", ["money_request", "urgency"]),
+    ("인증번호 알려주세요", ["credential_request"]),
+    ("내일 카페에서 만나요", []),
+]
+
+
+class WarmupState:
+    """워커 준비 상태. 단계별 결과는 "ok" 또는 "failed: <사유>"."""
+
+    def __init__(self) -> None:
+        self.status = PENDING
+        self.steps: Dict[str, str] = {}
+        self.started_at: Optional[float] = None
+        self.duration_seconds: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == READY
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "status": self.status,
+            "steps": dict(self.steps),
+            "duration_seconds": self.duration_seconds,
+        }
+
+
+_WARMUP_STATE = WarmupState()
+
+
+def get_warmup_state() -> WarmupState:
+    return _WARMUP_STATE
+
+
+async def _smoke_test_rules() -> str:
+    # rule pack 로드/컴파일도 여기서 처음 수행. 파일이 잘못되었으면 준비 완료로 전환하지 않음
+    rules = get_rule_set()
+    for message, expected in RULE_SMOKE_CASES:
+        signals = analyze_conversation(NormalizedConversation.from_texts([message]), rules=rules)
+        if signals != sorted(expected):
+            raise RuntimeError(f"unexpected signals for {message!r}: {signals}")
+    return (
+        f"rule pack {rules.version} ({rules.digest}), {len(RULE_SMOKE_CASES)} cases, "
+        f"{len(rules.flagged)} guarded patterns"
+    )
+
+
+def _create_clients() -> str:
+    # 첫 요청에서 SDK import와 클라이언트 생성 비용을 치르지 않도록 미리 생성
+    conversation_type_classifier.get_embedding_backend().warm()
+    safe_action_generator._get_async_client()
+    ocr_service._get_async_openai_client()
+    ocr_service._get_async_http_client()
+    # SQLite 임베딩 캐시 열기(만료 행 정리, 행 수 확인)도 첫 요청의 이벤트 루프에서 하지 않음
+    get_embedding_cache()
+    return "4 clients"
+
+
+async def _create_clients_async() -> str:
+    # SDK import가 이벤트 루프를 막으면 /ready, /metrics 응답도 늦어지므로 스레드에서 실행
+    return await asyncio.to_thread(_create_clients)
+
+
+async def _warm_corpus() -> str:
+    return f"{await asyncio.to_thread(warm_corpus)} documents"
+
+
+async def _warm_centroids() -> str:
+    return f"{await warm_prototype_centroids()} categories"
+
+
+# (이름, 실행 함수, 필수 여부). 필수 단계가 실패하면 준비 완료로 전환하지 않음
+WARMUP_STEPS: List[Tuple[str, Callable[[], Awaitable[str]], bool]] = [
+    ("rules", _smoke_test_rules, True),
+    ("corpus", _warm_corpus, False),
+    ("clients", _create_clients_async, False),
+    ("prototype_centroids", _warm_centroids, False),
+]
+
+
+async def run_warmup(state: Optional[WarmupState] = None) -> WarmupState:
+    """워밍업 단계를 순서대로 실행. 선택 단계 실패는 기록만 하고 요청 시점 처리에 맡김."""
+    state = state or _WARMUP_STATE
+    state.status = RUNNING
+    state.started_at = time.monotonic()
+    timeout = get_settings().warmup_timeout_seconds
+    critical_failed = False
+
+    for name, step, critical in WARMUP_STEPS:
+        try:
+            detail = await asyncio.wait_for(step(), timeout=timeout)
+            state.steps[name] = "ok"
+            logger.info("Warmup step %s done (%s)", name, detail)
+        except asyncio.TimeoutError:
+            state.steps[name] = "failed: timeout"
+            logger.warning("Warmup step %s timed out after %.1fs", name, timeout)
+            critical_failed = critical_failed or critical
+        except Exception as exc:
+            state.steps[name] = f"failed: {type(exc).__name__}"
+            logger.warning("Warmup step %s failed: %s", name, exc)
+            critical_failed = critical_failed or critical
+
+    state.duration_seconds = round(time.monotonic() - state.started_at, 3)
+    state.status = FAILED if critical_failed else READY
+    logger.info("Warmup finished: %s in %.3fs", state.status, state.duration_seconds)
+    return state
+
+
+def start_warmup() -> Optional[asyncio.Task]:
+    """백그라운드 워밍업 시작. 비활성화되어 있으면 즉시 준비 완료로 표시."""
+    if not get_settings().warmup_enabled:
+        _WARMUP_STATE.status = READY
+        return None
+    return asyncio.create_task(run_warmup(_WARMUP_STATE))
+
+
+def _ready_metric() -> Dict[tuple, float]:
+    return {(): 1.0 if _WARMUP_STATE.ready else 0.0}
+
+
+REGISTRY.register(
+    CallbackGauge(
+        "ai_server_ready",
+        "1 when startup warmup has finished and the worker accepts traffic.",
+        (),
+        _ready_metric,
+    )
+)
@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+from typing import Iterable, Tuple
+
+from app.schemas.request import Message
+from app.utils.text_utils import normalize_text
+
+ME_SENDER = "ME"
+OTHER_SENDER = "OTHER"
+
+
+@dataclass(frozen=True, slots=True)
+class NormalizedMessage:
+    """메시지 한 건의 원문(OCR 이후), 정규화 텍스트, 토큰, 발신자 역할."""
+
+    raw: str
+    normalized: str
+    tokens: Tuple[str, ...]
+    sender: str
+    is_me: bool
+    is_other: bool
+
+    @classmethod
+    def from_text(cls, raw: str, sender: str) -> "NormalizedMessage":
+        normalized = normalize_text(raw)
+        role = sender.strip().upper()
+        return cls(
+            raw=raw,
+            normalized=normalized,
+            # 정규화된 텍스트는 공백이 하나씩이라 split만으로 토큰화됨
+            tokens=tuple(normalized.split(" ")) if normalized else (),
+            sender=sender,
+            is_me=role == ME_SENDER,
+            is_other=role == OTHER_SENDER,
+        )
+
+    @classmethod
+    def from_message(cls, message: Message) -> "NormalizedMessage":
+        return cls.from_text(message.content, message.sender)
+
+    @property
+    def has_content(self) -> bool:
+        return bool(self.normalized)
+
+
+@dataclass(frozen=True, slots=True)
+class NormalizedConversation:
+    """요청마다 OCR 직후 한 번 만들어 분류/규칙 검사/발췌 단계가 함께 쓰는 대화.
+
+    contents는 내용이 있는 메시지, others는 그중 OTHER 메시지. other_indices는 others 각각의
+    messages 기준 위치.
+    """
+
+    messages: Tuple[NormalizedMessage, ...]
+    contents: Tuple[NormalizedMessage, ...]
+    others: Tuple[NormalizedMessage, ...]
+    other_indices: Tuple[int, ...]
+
+    @classmethod
+    def from_normalized(cls, messages: Iterable[NormalizedMessage]) -> "NormalizedConversation":
+        messages = tuple(messages)
+        other_indices = tuple(
+            idx for idx, message in enumerate(messages) if message.is_other and message.has_content
+        )
+        return cls(
+            messages=messages,
+            contents=tuple(message for message in messages if message.has_content),
+            others=tuple(messages[idx] for idx in other_indices),
+            other_indices=other_indices,
+        )
+
+    @classmethod
+    def from_messages(cls, messages: Iterable[Message]) -> "NormalizedConversation":
+        return cls.from_normalized(NormalizedMessage.from_message(message) for message in messages)
+
+    @classmethod
+    def from_texts(
+        cls, texts: Iterable[str], sender: str = OTHER_SENDER
+    ) -> "NormalizedConversation":
+        """발신자가 모두 같은 텍스트 목록 (벤치마크, 스모크 테스트 등)."""
+        return cls.from_normalized(NormalizedMessage.from_text(text, sender) for text in texts)
+
+    def __len__(self) -> int:
+        return len(self.messages)
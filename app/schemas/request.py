@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Literal
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -19,3 +19,21 @@ class AnalyzeRequest(BaseModel):
     platform: Literal["INSTAGRAM", "TELEGRAM"] = Field(
         ..., description="Platform name (INSTAGRAM or TELEGRAM)"
     )
+    deadline_ms: Optional[int] = Field(
+        None,
+        gt=0,
+        description=(
+            "Latency budget in milliseconds. Stages that cannot finish in time "
+            "fall back to deterministic results (X-Request-Deadline-Ms header also accepted)"
+        ),
+    )
+
+
+class SessionAnalyzeRequest(AnalyzeRequest):
+    append: bool = Field(
+        False,
+        description=(
+            "If true, messages continue the existing session. If false, messages are the "
+            "full conversation and the already processed prefix is skipped"
+        ),
+    )
@@ -19,3 +19,10 @@ class AnalyzeResponse(BaseModel):
     risk_signals: List[RiskSignal] = Field(default_factory=list)
     additional_recommendations: List[str] = Field(default_factory=list)
     rag_references: List[RagReference] = Field(default_factory=list)
+    degraded_stages: List[str] = Field(
+        default_factory=list,
+        description=(
+            "Stages that fell back to deterministic results due to the latency budget "
+            "or dependency overload"
+        ),
+    )
@@ -1,27 +1,22 @@
+import asyncio
 import base64
 import ipaddress
-import os
 import socket
-from typing import Tuple
+from typing import TYPE_CHECKING, Dict, Tuple
 from urllib.parse import urlparse
 
-import httpx
-from dotenv import load_dotenv
-from openai import OpenAI
-
+from app.core.admission import OCR_DOWNLOAD, OCR_VISION, get_limiter
+from app.core.config import get_settings
 from app.core.logging import get_logger
+from app.core.metrics import observe_stage
+from app.core.tracing import span, traced
 
-load_dotenv()
+if TYPE_CHECKING:
+    import httpx
+    from openai import AsyncOpenAI
 
 logger = get_logger(__name__)
 
-OPENAI_OCR_MODEL_ENV = "OPENAI_OCR_MODEL"
-DEFAULT_OCR_MODEL = "gpt-4o-mini"
-OCR_DOWNLOAD_TIMEOUT_ENV = "OCR_DOWNLOAD_TIMEOUT_SECONDS"
-OCR_MAX_IMAGE_BYTES_ENV = "OCR_MAX_IMAGE_BYTES"
-DEFAULT_OCR_DOWNLOAD_TIMEOUT_SECONDS = 10.0
-DEFAULT_OCR_MAX_IMAGE_BYTES = 5_000_000
-
 ALLOWED_IMAGE_TYPES = {
     "image/png",
     "image/jpeg",
@@ -38,32 +33,31 @@ IMAGE_EXTENSION_TO_TYPE = {
     ".bmp": "image/bmp",
 }
 
-_OCR_CLIENT: OpenAI | None = None
+OCR_USER_AGENT = "AI-Server OCR Fetcher/1.0"
 
+_ASYNC_OCR_CLIENT: "AsyncOpenAI | None" = None
+_ASYNC_HTTP_CLIENT: "httpx.AsyncClient | None" = None
 
-def _get_openai_client() -> OpenAI:
-    global _OCR_CLIENT
-    if _OCR_CLIENT is None:
-        _OCR_CLIENT = OpenAI()
-    return _OCR_CLIENT
 
+def _get_async_openai_client() -> "AsyncOpenAI":
+    global _ASYNC_OCR_CLIENT
+    if _ASYNC_OCR_CLIENT is None:
+        # SDK import 비용이 커서 첫 사용(또는 워밍업) 시점까지 미룸
+        from openai import AsyncOpenAI
 
-def _get_download_timeout_seconds() -> float:
-    raw = os.getenv(OCR_DOWNLOAD_TIMEOUT_ENV, str(DEFAULT_OCR_DOWNLOAD_TIMEOUT_SECONDS))
-    try:
-        value = float(raw)
-    except ValueError:
-        return DEFAULT_OCR_DOWNLOAD_TIMEOUT_SECONDS
-    return value if value > 0 else DEFAULT_OCR_DOWNLOAD_TIMEOUT_SECONDS
+        _ASYNC_OCR_CLIENT = AsyncOpenAI()
+    return _ASYNC_OCR_CLIENT
 
 
-def _get_max_image_bytes() -> int:
-    raw = os.getenv(OCR_MAX_IMAGE_BYTES_ENV, str(DEFAULT_OCR_MAX_IMAGE_BYTES))
-    try:
-        value = int(raw)
-    except ValueError:
-        return DEFAULT_OCR_MAX_IMAGE_BYTES
-    return value if value > 0 else DEFAULT_OCR_MAX_IMAGE_BYTES
+def _get_async_http_client() -> "httpx.AsyncClient":
+    global _ASYNC_HTTP_CLIENT
+    if _ASYNC_HTTP_CLIENT is None:
+        import httpx
+
+        _ASYNC_HTTP_CLIENT = httpx.AsyncClient(
+            follow_redirects=True, headers={"User-Agent": OCR_USER_AGENT}
+        )
+    return _ASYNC_HTTP_CLIENT
 
 
 def _is_private_or_local_host(host: str) -> bool:
@@ -113,7 +107,9 @@ def _validate_url(url: str) -> None:
     host = parsed.hostname
     if not host:
         raise ValueError("Invalid URL hostname.")
-    if _is_private_or_local_host(host):
+    with span("ocr.dns", host=host):
+        is_private = _is_private_or_local_host(host)
+    if is_private:
         raise ValueError("Private/local network URL is not allowed.")
 
 
@@ -138,14 +134,7 @@ def _resolve_image_type(content_type: str | None, url: str) -> str:
     raise ValueError("Unsupported or unknown image content type.")
 
 
-def _download_image(url: str) -> Tuple[bytes, str]:
-    timeout = httpx.Timeout(_get_download_timeout_seconds())
-    max_bytes = _get_max_image_bytes()
-    headers = {"User-Agent": "AI-Server OCR Fetcher/1.0"}
-
-    with httpx.Client(timeout=timeout, follow_redirects=True) as client:
-        response = client.get(url, headers=headers)
-
+def _read_image_response(response: "httpx.Response", url: str, max_bytes: int) -> Tuple[bytes, str]:
     response.raise_for_status()
 
     content_length = response.headers.get("content-length")
@@ -166,18 +155,32 @@ def _download_image(url: str) -> Tuple[bytes, str]:
     return image_bytes, content_type
 
 
-def _extract_text_from_image_bytes(image_bytes: bytes, content_type: str) -> str:
-    if not os.getenv("OPENAI_API_KEY"):
+async def _download_image_async(url: str) -> Tuple[bytes, str]:
+    import httpx
+
+    timeout = httpx.Timeout(get_settings().ocr_download_timeout_seconds)
+    max_bytes = get_settings().ocr_max_image_bytes
+
+    client = _get_async_http_client()
+    async with get_limiter(OCR_DOWNLOAD).acquire():
+        with observe_stage("ocr_download"), span("ocr.download"):
+            response = await client.get(url, timeout=timeout)
+
+    return _read_image_response(response, url, max_bytes)
+
+
+def _build_ocr_request(image_bytes: bytes, content_type: str) -> Dict[str, object]:
+    settings = get_settings()
+    if not settings.openai_api_key:
         raise RuntimeError("OPENAI_API_KEY is not set.")
 
-    model = os.getenv(OPENAI_OCR_MODEL_ENV, DEFAULT_OCR_MODEL)
+    model = settings.ocr_model
     image_base64 = base64.b64encode(image_bytes).decode("ascii")
     image_data_url = f"data:{content_type};base64,{image_base64}"
 
-    client = _get_openai_client()
-    response = client.responses.create(
-        model=model,
-        input=[
+    return {
+        "model": model,
+        "input": [
             {
                 "role": "user",
                 "content": [
@@ -193,15 +196,25 @@ def _extract_text_from_image_bytes(image_bytes: bytes, content_type: str) -> str
                 ],
             }
         ],
-        max_output_tokens=1000,
-    )
+        "max_output_tokens": 1000,
+    }
+
+
+async def _extract_text_from_image_bytes_async(image_bytes: bytes, content_type: str) -> str:
+    request = _build_ocr_request(image_bytes, content_type)
+    client = _get_async_openai_client()
+    async with get_limiter(OCR_VISION).acquire():
+        with observe_stage("ocr_model"), span("openai.responses", model=request["model"]):
+            response = await client.responses.create(**request)
     return response.output_text.strip()
 
 
-def extract_text_from_image_url(url: str) -> str:
-    _validate_url(url)
-    image_bytes, content_type = _download_image(url)
-    text = _extract_text_from_image_bytes(image_bytes, content_type)
+@traced()
+async def extract_text_from_image_url_async(url: str) -> str:
+    # 호스트 검증은 DNS 조회(getaddrinfo)를 포함하므로 이벤트 루프를 막지 않도록 스레드에서 실행
+    await asyncio.to_thread(_validate_url, url)
+    image_bytes, content_type = await _download_image_async(url)
+    text = await _extract_text_from_image_bytes_async(image_bytes, content_type)
     logger.info("OCR extracted %d chars from %s", len(text), url)
     logger.info("OCR message: %s", text)
     return text
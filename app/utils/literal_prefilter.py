@@ -0,0 +1,138 @@
+import re
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set
+
+from app.utils.pattern_complexity import REPEAT_OPCODES, sre_parse
+
+
+def _pick(candidates: List[FrozenSet[str]]) -> Optional[FrozenSet[str]]:
+    """가장 선택적인 후보: 가장 짧은 literal이 긴 것, 같으면 개수가 적은 것."""
+    if not candidates:
+        return None
+    return max(candidates, key=lambda literals: (min(map(len, literals)), -len(literals)))
+
+
+def _branch_literals(branches) -> Optional[FrozenSet[str]]:
+    union: Set[str] = set()
+    for branch in branches:
+        literals = _sequence_literals(branch)
+        if literals is None:
+            return None
+        union.update(literals)
+    return frozenset(union)
+
+
+def _item_literals(op, av) -> Optional[FrozenSet[str]]:
+    if op is sre_parse.SUBPATTERN:
+        return _sequence_literals(av[-1])
+    if op is sre_parse.BRANCH:
+        return _branch_literals(av[1])
+    if op in REPEAT_OPCODES:
+        low, _, body = av
+        return _sequence_literals(body) if low >= 1 else None
+    if op is sre_parse.IN:
+        chars = [chr(value) for kind, value in av if kind is sre_parse.LITERAL]
+        return frozenset(chars) if chars and len(chars) == len(av) else None
+    if getattr(sre_parse, "ATOMIC_GROUP", None) is op:
+        return _sequence_literals(av)
+    return None
+
+
+def _sequence_literals(items) -> Optional[FrozenSet[str]]:
+    """시퀀스의 모든 매칭이 반드시 포함하는 literal 집합 (그중 하나 이상). 알 수 없으면 None."""
+    candidates: List[FrozenSet[str]] = []
+    run: List[str] = []
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        if run:
+            candidates.append(frozenset(["".join(run)]))
+            run = []
+        literals = _item_literals(op, av)
+        if literals and all(literals):
+            candidates.append(literals)
+    if run:
+        candidates.append(frozenset(["".join(run)]))
+    return _pick(candidates)
+
+
+def required_literals(pattern: re.Pattern) -> Optional[FrozenSet[str]]:
+    """매칭되려면 텍스트에 반드시 하나 이상 들어 있어야 하는 literal 집합.
+
+    대소문자 무시 패턴이나 분석할 수 없는 패턴은 None (항상 실행).
+    """
+    if pattern.flags & re.IGNORECASE:
+        return None
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except (re.error, TypeError):
+        return None
+    return _sequence_literals(list(parsed))
+
+
+def _trie_regex(literals: Sequence[str]) -> str:
+    """literal 집합을 접두사 트리 형태의 정규식으로 변환. 같은 위치에서는 가장 긴 literal이 매칭됨."""
+    trie: Dict[str, dict] = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        terminal = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            body = ("(?:" + body + ")" if len(branches) == 1 else body) + "?"
+        return body
+
+    return build(trie)
+
+
+class LiteralPrefilter:
+    """패턴별 필수 literal로 실행할 패턴을 고르는 다중 literal 검색기 (Aho-Corasick 대체).
+
+    모든 literal을 접두사 트리 정규식 하나로 묶어 C 엔진에서 검색하고, 매칭 시작 다음 위치에서
+    다시 검색해 겹치는 출현도 찾음. 같은 위치에서 시작하는 더 짧은 literal(접두사)은 미리 계산한
+    접두사 관계로 함께 처리. 순수 파이썬 오토마톤은 문자 단위 루프 때문에 이보다 느림.
+    """
+
+    def __init__(self, patterns: Sequence[re.Pattern]) -> None:
+        self.size = len(patterns)
+        self._always: Set[int] = set()
+        owners: Dict[str, Set[int]] = {}
+        for idx, pattern in enumerate(patterns):
+            literals = required_literals(pattern)
+            if not literals:
+                self._always.add(idx)
+                continue
+            for literal in literals:
+                owners.setdefault(literal, set()).add(idx)
+
+        self._triggers: Dict[str, FrozenSet[int]] = {
+            literal: frozenset(
+                idx
+                for prefix, indices in owners.items()
+                if literal.startswith(prefix)
+                for idx in indices
+            )
+            for literal in owners
+        }
+        self._regex = re.compile(_trie_regex(sorted(owners))) if owners else None
+
+    def candidates(self, text: str) -> List[int]:
+        """text에서 매칭 가능성이 있는 패턴 번호 (오름차순)."""
+        selected = set(self._always)
+        regex = self._regex
+        if regex is not None:
+            pos = 0
+            while len(selected) < self.size:
+                match = regex.search(text, pos)
+                if match is None:
+                    break
+                selected.update(self._triggers[match.group(0)])
+                pos = match.start() + 1
+        return sorted(selected)
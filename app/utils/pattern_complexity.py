@@ -0,0 +1,109 @@
+import re
+from dataclasses import dataclass
+from typing import List, Tuple
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+# 반복 연산자 opcode (literal_prefilter와 공유)
+REPEAT_OPCODES = {sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT}
+if hasattr(sre_parse, "POSSESSIVE_REPEAT"):
+    REPEAT_OPCODES.add(sre_parse.POSSESSIVE_REPEAT)
+_LOOKAROUNDS = {sre_parse.ASSERT, sre_parse.ASSERT_NOT}
+
+
+@dataclass(frozen=True)
+class PatternComplexity:
+    """정규식 최악 실행 시간 추정. degree가 d면 입력 길이 n에 대해 O(n^d)."""
+
+    pattern: str
+    degree: int
+    exponential: bool
+    reasons: Tuple[str, ...]
+    lookaround: bool = False
+
+    @property
+    def superlinear(self) -> bool:
+        return self.exponential or self.degree > 1
+
+
+def _is_unbounded(op, av) -> bool:
+    return op in REPEAT_OPCODES and av[1] is sre_parse.MAXREPEAT
+
+
+def _is_wildcard(items) -> bool:
+    """아무 문자나(또는 거의 모든 문자를) 매칭하는 단일 항목인지."""
+    items = list(items)
+    if len(items) != 1:
+        return False
+    op, av = items[0]
+    if op in (sre_parse.ANY, sre_parse.NOT_LITERAL):
+        return True
+    return op is sre_parse.IN and bool(av) and av[0][0] is sre_parse.NEGATE
+
+
+def _children(op, av) -> List[list]:
+    if op is sre_parse.SUBPATTERN:
+        return [list(av[-1])]
+    if op is sre_parse.BRANCH:
+        return [list(branch) for branch in av[1]]
+    if op in REPEAT_OPCODES:
+        return [list(av[2])]
+    if op in _LOOKAROUNDS:
+        return [list(av[1])]
+    if getattr(sre_parse, "ATOMIC_GROUP", None) is op:
+        return [list(av)]
+    return []
+
+
+def _walk(items, inside_unbounded: bool, reasons: List[str]) -> Tuple[int, bool]:
+    """(뒤에 다른 요소가 이어지는 무제한 와일드카드 반복 수, 중첩 무제한 반복 여부)."""
+    items = list(items)
+    wildcards = 0
+    nested = False
+    for position, (op, av) in enumerate(items):
+        unbounded = _is_unbounded(op, av)
+        if unbounded and inside_unbounded:
+            nested = True
+            reasons.append("nested unbounded repeat")
+        if unbounded and _is_wildcard(av[2]) and position < len(items) - 1:
+            # 실패할 때마다 문장 끝까지 갔다가 되돌아옴: 시작 위치마다 O(n)
+            wildcards += 1
+            reasons.append("unbounded wildcard followed by more pattern")
+        for child in _children(op, av):
+            child_wildcards, child_nested = _walk(child, inside_unbounded or unbounded, reasons)
+            if op in _LOOKAROUNDS and child_wildcards == 0 and any(
+                _is_unbounded(*item) and _is_wildcard(item[1][2]) for item in child
+            ):
+                # (?!.*x)처럼 lookaround 안의 와일드카드는 매 시도마다 끝까지 검사
+                child_wildcards = 1
+                reasons.append("unbounded wildcard inside lookaround")
+            wildcards += child_wildcards
+            nested = nested or child_nested
+    return wildcards, nested
+
+
+def _has_lookaround(items) -> bool:
+    return any(
+        op in _LOOKAROUNDS or any(_has_lookaround(child) for child in _children(op, av))
+        for op, av in items
+    )
+
+
+def assess_pattern(pattern: re.Pattern) -> PatternComplexity:
+    """unanchored search 기준 최악 백트래킹 복잡도를 구문 트리로 보수적으로 추정."""
+    try:
+        parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    except (re.error, TypeError):
+        return PatternComplexity(pattern.pattern, 1, False, ("unparseable",))
+    reasons: List[str] = []
+    wildcards, nested = _walk(list(parsed), False, reasons)
+    return PatternComplexity(
+        pattern=pattern.pattern,
+        degree=1 + wildcards,
+        exponential=nested,
+        reasons=tuple(dict.fromkeys(reasons)),
+        lookaround=_has_lookaround(parsed),
+    )
@@ -1,103 +1,44 @@
+import hashlib
+import json
 import re
-from typing import Dict, List
-
-# [Step 1. 대화 유형 분류] 임베딩 실패 시 fallback 룰
-CONVERSATION_TYPE_RULES: Dict[str, List[re.Pattern]] = {
-    "중고거래": [
-        re.compile(r"(중고|직거래|택배|판매|구매|가격|송장)"),
-    ],
-    "재테크": [
-        re.compile(r"(투자|수익|수익률|코인|암호화폐|주식|fx|선물|레버리지)"),
-    ],
-    "구직": [
-        re.compile(r"(취업|채용|구인|면접|이력서|지원서|급여|계약서)"),
-    ],
-    "부업": [
-        re.compile(r"(부업|재택|알바|아르바이트|단기|건당|수당|파트타임)"),
-    ],
-}
-
-# [Step 2. 규칙 기반 신호 추출] 공통 위험 신호 패턴
-COMMON_RISK_PATTERNS: Dict[str, List[re.Pattern]] = {
-    "money_request": [
-        re.compile(
-            r"(송금|입금|결제|이체)\s*(해|해주세요|해요|해\s*주세요|부탁|부탁드립니다|요청|주시|주시면|주셔야|해야|하셔야)"
-        ),
-        re.compile(
-            r"(돈|현금|카드|상품권|보증금|예약금)\s*(으로|로)?\s*(보내|송금|입금|결제)\s*(해|해주세요|해요|해\s*주세요|주시|주시면|주셔야|해야|하셔야)"
-        ),
-        re.compile(
-            r"(계좌번호|계좌)(?:\s*로)?\s*(먼저|우선)?\s*(알려|알려줘|알려주세요|알려주시면|보내|보내줘|보내주세요|보내주시면|공유|주세요|주시면|주셔야|주실|받아야|받아야\s*합니다|받아야\s*해요)"
-        ),
-        re.compile(
-            r"(소액|선입금)\s*(이라도)?\s*(먼저)?\s*(보내|입금|송금)\s*(주셔야|주세요|해|해야|하셔야|해요|해\s*주세요)"
-        ),
-    ],
-    "credential_request": [
-        re.compile(
-            r"(비밀번호|인증\s*코드|인증코드|인증번호|otp|일회용|pin)\s*(알려|알려줘|알려주세요|보내|보내줘|보내주세요|입력|입력해|입력해주세요|공유|말해)"
-        ),
-    ],
-    "urgency": [
-        re.compile(r"(긴급|급히|급해요|급합니다|급함|서둘러|지체\s*없이)"),
-        re.compile(r"(지금\s*당장|지금\s*바로|바로\s*지금|오늘\s*내로|몇\s*시간\s*안에)"),
-        re.compile(r"오늘\s*안에(?!.*(안\s*하셔도|안\s*해도|괜찮|무관))"),
-        re.compile(r"지금\s*(처리|결정|응답)\s*(해|해주세요|하셔야|해야|해\s*주세요)"),
-        re.compile(r"지금\s*(결정|처리|응답)하셔야"),
-        re.compile(r"지금\s*.*(안\s*하면|안\s*하시면).*(불이익|기회|취소|다음\s*순번)"),
-    ],
-}
-
-# [Step 2. 규칙 기반 신호 추출] 유형별 위험 신호 패턴
-TYPE_RISK_PATTERNS: Dict[str, Dict[str, List[re.Pattern]]] = {
-    "구직": {
-        "job_fee_request": [
-            re.compile(r"(입사비|교육비|연수비|등록비|보증금)\s*(입금|송금|결제|납부)"),
-            re.compile(r"(채용|합격|면접)\s*(확정|진행)\s*.*(비용|수수료)"),
-        ],
-        "job_personal_info": [
-            re.compile(r"(신분증|주민등록번호|계좌정보|통장사본)\s*(제출|전송|공유|보내)"),
-        ],
-    },
-    "중고거래": {
-        "usedgoods_safe_payment": [
-            re.compile(r"(안전결제|안전거래|에스크로)\s*(링크|결제|확인)"),
-            re.compile(r"(결제|거래)\s*링크\s*로\s*진행"),
-        ],
-        "usedgoods_delivery_fee": [
-            re.compile(r"(배송비|택배비)\s*(먼저|선결제|선입금)"),
-            re.compile(r"(착불\s*불가|선불\s*만\s*가능)"),
-        ],
-    },
-    "재테크": {
-        "investment_guarantee": [
-            re.compile(r"(원금\s*보장|손실\s*없음|확정\s*수익)"),
-            re.compile(r"(고수익|수익률\s*\d+%|월\s*\d+%\s*보장)"),
-        ],
-        "investment_recruit": [
-            re.compile(r"(리딩방|투자방|전문가\s*추천|VIP\s*회원)"),
-            re.compile(r"(지금\s*가입|무료\s*체험|수익\s*인증)"),
-        ],
-    },
-    "부업": {
-        "sidejob_fee_request": [
-            re.compile(r"(등록비|재료비|보증금|교육비)\s*(입금|송금|결제)"),
-            re.compile(r"(작업|업무)\s*시작\s*전\s*(비용|수수료)"),
-        ],
-        "sidejob_task": [
-            re.compile(r"(클릭|캡처|좋아요|리뷰)\s*만\s*하면\s*수익"),
-            re.compile(r"(단순\s*작업|재택\s*부업|건당\s*수익)"),
-        ],
-    },
-}
-
-
-# [Step 2. 규칙 기반 신호 추출] 공통/유형 패턴 합침
-def _merge_risk_patterns() -> Dict[str, List[re.Pattern]]:
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Mapping
+
+# 배포 이미지에 포함된 기본 rule pack. RULE_PACK_PATH로 외부 파일을 지정할 수 있음
+BUNDLED_RULE_PACK_PATH = (
+    Path(__file__).resolve().parents[1] / "agents" / "analyzer" / "rule_pack.json"
+)
+
+_PACK_SECTIONS = ("conversation_types", "common", "types", "query_terms")
+
+
+class RulePackError(ValueError):
+    """rule pack 파일 형식이 잘못되었거나 패턴을 컴파일할 수 없음."""
+
+
+def _compile_patterns(section: str, raw: object) -> Dict[str, List[re.Pattern]]:
+    if not isinstance(raw, dict):
+        raise RulePackError(f"{section}: expected an object")
+    compiled: Dict[str, List[re.Pattern]] = {}
+    for name, patterns in raw.items():
+        if not isinstance(patterns, list) or not all(isinstance(p, str) for p in patterns):
+            raise RulePackError(f"{section}.{name}: expected a list of strings")
+        try:
+            compiled[name] = [re.compile(pattern) for pattern in patterns]
+        except re.error as exc:
+            raise RulePackError(f"{section}.{name}: {exc}") from exc
+    return compiled
+
+
+def _merge_risk_patterns(
+    common: Mapping[str, List[re.Pattern]], types: Mapping[str, Mapping[str, List[re.Pattern]]]
+) -> Dict[str, List[re.Pattern]]:
+    """공통/유형 패턴을 신호별로 합치고 같은 패턴은 한 번만 남김."""
     merged: Dict[str, List[re.Pattern]] = {}
-    for signal, patterns in COMMON_RISK_PATTERNS.items():
+    for signal, patterns in common.items():
         merged[signal] = list(patterns)
-    for type_patterns in TYPE_RISK_PATTERNS.values():
+    for type_patterns in types.values():
         for signal, patterns in type_patterns.items():
             merged.setdefault(signal, []).extend(patterns)
     for signal, patterns in merged.items():
@@ -113,34 +54,79 @@ def _merge_risk_patterns() -> Dict[str, List[re.Pattern]]:
     return merged
 
 
-# [Step 2. 규칙 기반 신호 추출] 실제 룰셋
-RISK_SIGNAL_RULES: Dict[str, List[re.Pattern]] = _merge_risk_patterns()
+def _compute_digest(data: Mapping[str, object]) -> str:
+    """패턴/키워드 내용 해시. 같은 내용이면 version 표기와 무관하게 같은 값."""
+    payload = {section: data[section] for section in _PACK_SECTIONS}
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class RulePack:
+    """rule pack 파일 하나를 컴파일한 결과. 만든 뒤에는 바꾸지 않음."""
+
+    version: str
+    digest: str
+    source: str
+    # [Step 1. 대화 유형 분류] 임베딩 실패 시 fallback 룰
+    conversation_type_rules: Dict[str, List[re.Pattern]]
+    # [Step 2. 규칙 기반 신호 추출] 공통/유형별 패턴과 둘을 합친 실제 룰셋
+    common_patterns: Dict[str, List[re.Pattern]]
+    type_patterns: Dict[str, Dict[str, List[re.Pattern]]]
+    risk_signal_rules: Dict[str, List[re.Pattern]]
+    # [Step 3. RAG 쿼리 보강] 신호별 확장 키워드
+    query_terms: Dict[str, List[str]]
+
+    @property
+    def common_signals(self) -> List[str]:
+        return list(self.common_patterns.keys())
+
+    def resolve_risk_signals(self, conversation_type: str) -> List[str]:
+        """유형에 맞는 신호 범위 (공통 신호 + 유형 신호)."""
+        type_signals = list(self.type_patterns.get(conversation_type, {}).keys())
+        return list(dict.fromkeys(self.common_signals + type_signals))
 
 
-# [Step 2. 규칙 기반 신호 추출] 유형별 신호 범위 결정
-COMMON_RISK_SIGNALS: List[str] = list(COMMON_RISK_PATTERNS.keys())
-TYPE_RISK_SIGNALS: Dict[str, List[str]] = {
-    conversation_type: list(patterns.keys()) for conversation_type, patterns in TYPE_RISK_PATTERNS.items()
-}
+def parse_rule_pack(data: object, source: str = "<memory>") -> RulePack:
+    if not isinstance(data, dict):
+        raise RulePackError("rule pack must be a JSON object")
+    missing = [section for section in ("version",) + _PACK_SECTIONS if section not in data]
+    if missing:
+        raise RulePackError(f"missing sections: {', '.join(missing)}")
+    version = data["version"]
+    if not isinstance(version, str) or not version.strip():
+        raise RulePackError("version: expected a non-empty string")
 
+    types_raw = data["types"]
+    if not isinstance(types_raw, dict):
+        raise RulePackError("types: expected an object")
+    common = _compile_patterns("common", data["common"])
+    types = {
+        conversation_type: _compile_patterns(f"types.{conversation_type}", type_patterns)
+        for conversation_type, type_patterns in types_raw.items()
+    }
+    query_terms = data["query_terms"]
+    if not isinstance(query_terms, dict) or not all(
+        isinstance(terms, list) and all(isinstance(term, str) for term in terms)
+        for terms in query_terms.values()
+    ):
+        raise RulePackError("query_terms: expected lists of strings")
 
-# [Step 2. 규칙 기반 신호 추출] 유형에 맞는 신호 범위 선택
-def resolve_risk_signals(conversation_type: str) -> List[str]:
-    type_signals = TYPE_RISK_SIGNALS.get(conversation_type, [])
-    return list(dict.fromkeys(COMMON_RISK_SIGNALS + type_signals))
+    return RulePack(
+        version=version.strip(),
+        digest=_compute_digest(data),
+        source=source,
+        conversation_type_rules=_compile_patterns("conversation_types", data["conversation_types"]),
+        common_patterns=common,
+        type_patterns=types,
+        risk_signal_rules=_merge_risk_patterns(common, types),
+        query_terms={signal: list(terms) for signal, terms in query_terms.items()},
+    )
 
 
-# [Step 3. RAG 쿼리 보강] 신호별 확장 키워드
-SIGNAL_QUERY_TERMS: Dict[str, List[str]] = {
-    "money_request": ["입금", "송금", "계좌", "보증금", "예약금", "결제"],
-    "urgency": ["오늘 안에", "지금", "당장", "즉시", "몇 시간 안에"],
-    "credential_request": ["인증코드", "otp", "비밀번호", "pin"],
-    "job_fee_request": ["입사비", "교육비", "연수비", "등록비", "보증금"],
-    "job_personal_info": ["신분증", "주민등록번호", "통장사본", "계좌정보"],
-    "usedgoods_safe_payment": ["안전결제", "안전거래", "에스크로", "결제 링크"],
-    "usedgoods_delivery_fee": ["배송비", "택배비", "선입금", "착불 불가"],
-    "investment_guarantee": ["원금 보장", "확정 수익", "고수익", "수익률"],
-    "investment_recruit": ["리딩방", "투자방", "VIP", "수익 인증"],
-    "sidejob_fee_request": ["등록비", "재료비", "보증금", "수수료"],
-    "sidejob_task": ["클릭", "캡처", "좋아요", "단순 작업", "건당"],
-}
+def load_rule_pack(path: Path = BUNDLED_RULE_PACK_PATH) -> RulePack:
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as exc:
+        raise RulePackError(f"cannot read rule pack {path}: {exc}") from exc
+    return parse_rule_pack(data, str(path))
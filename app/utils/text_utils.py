@@ -1,4 +1,6 @@
-from typing import Iterable, List
+from typing import Iterable, List, Tuple
+
+_SENTENCE_ENDS = (".", "!", "?", "。", "…")
 
 
 def normalize_text(text: str) -> str:
@@ -11,3 +13,35 @@ def join_conversation(conversation: Iterable[str]) -> str:
 
 def tokenize(text: str) -> List[str]:
     return [token for token in text.split() if token]
+
+
+def sentence_scoped_text(text: str) -> str:
+    """normalize_text(text)와 길이/위치가 같고, 줄바꿈과 문장부호 뒤 공백만 '\\n'으로 남긴 텍스트."""
+    lines = (" ".join(line.split()) for line in text.lower().splitlines())
+    scoped = "\n".join(line for line in lines if line)
+    for end in _SENTENCE_ENDS:
+        if end in scoped:
+            scoped = scoped.replace(end + " ", end + "\n")
+    return scoped
+
+
+def sentence_windows(scoped: str, window_chars: int, overlap_chars: int = 32) -> List[Tuple[int, int]]:
+    """sentence_scoped_text 결과를 나눈 (시작, 끝) 구간. 위치는 normalize_text 기준과 같음.
+
+    문장을 window_chars 이하로 묶어 구간 수를 줄이고, 더 긴 문장은 overlap_chars만큼 겹쳐 자름.
+    `.`은 줄바꿈을 넘지 않으므로 `.*` 패턴은 구간 안에서도 한 문장 안에서만 매칭됨.
+    """
+    windows: List[Tuple[int, int]] = []
+    start = 0
+    while start < len(scoped):
+        if len(scoped) - start <= window_chars:
+            windows.append((start, len(scoped)))
+            break
+        cut = scoped.rfind("\n", start, start + window_chars + 1)
+        if cut > start:
+            windows.append((start, cut))
+            start = cut + 1
+        else:
+            windows.append((start, start + window_chars))
+            start += max(1, window_chars - overlap_chars)
+    return windows
@@ -0,0 +1,242 @@
+"""백트래킹 유발 입력에 대한 규칙 실행 최악 시간 벤치마크.
+
+`.*`가 들어간 규칙이 실패하며 끝까지 되돌아가도록 만든 반복 텍스트를 길이별로 실행해,
+guard 없이(메시지 전체에 한 번) 실행한 시간과 guard 실행 시간을 비교.
+guard 실행의 최대 시간이 --budget-ms를 넘거나 길이를 두 배로 늘렸을 때 시간이 --max-growth배를
+넘게 늘어나면 종료 코드 1. 구간 안의 규칙은 선형(약 2배)이지만 lookaround는 입력 상한까지의
+메시지 전체를 보므로 상한 전까지 최대 약 4배, 상한 이후에는 약 1배.
+
+구간 하나에 들어가는 일반 길이 메시지에서 guard 유무에 따라 신호/구절/위치가 하나라도 다르면
+역시 종료 코드 1.
+
+    python -m benchmarks.adversarial_rules
+    python -m benchmarks.adversarial_rules --sizes 1000,2000,4000,8000,16000 --output adversarial.json
+"""
+
+import argparse
+import json
+import logging
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from app.agents.analyzer.rule_matcher import CompiledRuleMatcher, default_rule_guard
+from app.agents.analyzer.rule_set import get_rule_set
+from app.schemas.conversation import NormalizedConversation
+from benchmarks.conversation_generator import (
+    COMMON_SIGNAL_LINES,
+    ME_LINES,
+    NEUTRAL_LINES,
+    SIGNAL_LINES,
+)
+
+# 규칙의 앞부분만 반복해 뒷부분을 찾지 못하고 실패하는 입력
+ADVERSARIAL_UNITS: Dict[str, str] = {
+    "urgency_if_not": "지금 안 하면 ",
+    "urgency_today": "오늘 안에 ",
+    "job_fee_confirmed": "채용 확정 ",
+    "urgency_now": "지금 ",
+    "mixed_no_punctuation": "지금 바로 채용 확정 안 하시면 오늘 안에 ",
+}
+
+
+# 부정 lookahead의 조건이 다음 문장에 있는 문장 (구간을 문장 단위로 나누면 달라지는 경우)
+VETO_LINES = [
+    "오늘 안에 입금하실 필요 없어요.",
+    "안 하셔도 괜찮아요",
+    "오늘 안에 답장 주셔도 되고 내일도 무관합니다.",
+    "지금 결정 안 하시면",
+    "다음 순번으로 넘어가요.",
+]
+
+
+def adversarial_text(unit: str, chars: int) -> str:
+    return (unit * (chars // len(unit) + 1))[:chars]
+
+
+def normal_texts(count: int, max_chars: int, seed: int = 42) -> List[str]:
+    """합성 대화 문장을 max_chars 이하로 이어 붙인 메시지 (구간 하나에 들어가는 길이)."""
+    rng = random.Random(seed)
+    lines = [line for group in (NEUTRAL_LINES, SIGNAL_LINES) for values in group.values() for line in values]
+    lines += COMMON_SIGNAL_LINES + ME_LINES + VETO_LINES
+    texts: List[str] = []
+    for _ in range(count):
+        parts = [rng.choice(lines)]
+        while rng.random() < 0.7:
+            line = rng.choice(lines)
+            if len(" ".join(parts)) + len(line) + 1 > max_chars:
+                break
+            parts.append(line)
+        texts.append(" ".join(parts))
+    return texts
+
+
+def equivalence_mismatches(
+    guarded: CompiledRuleMatcher, unguarded: CompiledRuleMatcher, texts: List[str]
+) -> List[str]:
+    """guard 유무에 따라 매칭 결과(신호, 구절, 위치)가 달라지는 메시지."""
+    mismatches: List[str] = []
+    for text in texts:
+        conversation = NormalizedConversation.from_texts([text])
+        expected = unguarded.scan(conversation)
+        actual = guarded.scan(conversation)
+        if actual != expected or guarded.detect_signals(conversation) != expected.signals:
+            mismatches.append(text)
+    return mismatches
+
+
+def _best_of(call: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _growth(timings: List[Dict[str, object]], key: str) -> Optional[float]:
+    """연속한 두 길이 사이 시간 배율 중 최댓값 (길이는 두 배씩 늘린다고 가정)."""
+    values = [row[key] for row in timings if row.get(key) is not None]
+    ratios = [later / earlier for earlier, later in zip(values, values[1:]) if earlier]
+    return round(max(ratios), 2) if ratios else None
+
+
+def run(args: argparse.Namespace) -> Dict[str, object]:
+    guard = default_rule_guard()
+    if guard is None:
+        raise SystemExit("RULE_GUARD_ENABLED=false: nothing to measure")
+    rules = get_rule_set()
+    guarded = CompiledRuleMatcher(rules.pack.risk_signal_rules, guard=guard)
+    unguarded = CompiledRuleMatcher(rules.pack.risk_signal_rules)
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+
+    cases: Dict[str, Dict[str, object]] = {}
+    for name, unit in ADVERSARIAL_UNITS.items():
+        timings: List[Dict[str, object]] = []
+        for size in sizes:
+            text = NormalizedConversation.from_texts([adversarial_text(unit, size)])
+            row: Dict[str, object] = {
+                "chars": size,
+                "guarded_ms": round(_best_of(lambda: guarded.scan(text), args.repeat) * 1000, 3),
+                "unguarded_ms": None,
+            }
+            # guard 없는 실행은 수 초 이상 걸릴 수 있어 작은 입력에서만 측정
+            if size <= args.unguarded_max_chars:
+                row["unguarded_ms"] = round(_best_of(lambda: unguarded.scan(text), 1) * 1000, 3)
+            timings.append(row)
+        cases[name] = {
+            "timings": timings,
+            "guarded_growth": _growth(timings, "guarded_ms"),
+            "unguarded_growth": _growth(timings, "unguarded_ms"),
+        }
+
+    mismatches = equivalence_mismatches(
+        guarded, unguarded, normal_texts(args.equivalence_samples, guard.window_chars)
+    )
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "max_message_chars": guard.max_message_chars,
+            "window_chars": guard.window_chars,
+            "ruleset_version": rules.version,
+            "sizes": sizes,
+            "repeat": args.repeat,
+            "equivalence_samples": args.equivalence_samples,
+        },
+        "flagged_patterns": [
+            {
+                "pattern": complexity.pattern,
+                "degree": complexity.degree,
+                "exponential": complexity.exponential,
+                "reasons": list(complexity.reasons),
+            }
+            for complexity in rules.flagged
+        ],
+        "cases": cases,
+        "worst_guarded_ms": max(
+            row["guarded_ms"] for case in cases.values() for row in case["timings"]
+        ),
+        "equivalence_mismatches": mismatches,
+    }
+
+
+def _print_report(report: Dict[str, object]) -> None:
+    meta = report["meta"]
+    print(f"cap={meta['max_message_chars']} chars, window={meta['window_chars']} chars")
+    for flagged in report["flagged_patterns"]:
+        label = "exponential" if flagged["exponential"] else f"O(n^{flagged['degree']})"
+        print(f"flagged {label:12} {flagged['pattern']}")
+    print(f"{'case':24} {'chars':>7} {'guarded_ms':>11} {'unguarded_ms':>13}")
+    for name, case in report["cases"].items():
+        for row in case["timings"]:
+            unguarded = "-" if row["unguarded_ms"] is None else f"{row['unguarded_ms']:.3f}"
+            print(f"{name:24} {row['chars']:>7} {row['guarded_ms']:>11.3f} {unguarded:>13}")
+        print(
+            f"{'':24} max growth x{case['guarded_growth']} (unguarded x{case['unguarded_growth']})"
+        )
+    print(f"worst guarded: {report['worst_guarded_ms']:.3f} ms")
+    print(
+        f"guard on/off mismatches: {len(report['equivalence_mismatches'])}"
+        f"/{meta['equivalence_samples']} normal-length messages"
+    )
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Worst-case rule scan time on adversarial input.")
+    parser.add_argument("--sizes", default="1000,2000,4000,8000,16000", help="입력 길이(문자, 쉼표 구분)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--unguarded-max-chars", type=int, default=2000, help="guard 없는 실행을 측정할 최대 길이"
+    )
+    parser.add_argument("--budget-ms", type=float, default=250.0, help="guard 실행 최대 시간 예산")
+    parser.add_argument(
+        "--max-growth", type=float, default=4.5, help="길이 두 배당 허용 시간 배율 (0이면 검사 안 함)"
+    )
+    parser.add_argument(
+        "--equivalence-samples",
+        type=int,
+        default=5000,
+        help="guard 유무 결과를 비교할 일반 길이 메시지 수",
+    )
+    parser.add_argument("--output", type=Path, help="결과 JSON 저장 경로")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.disable(logging.WARNING)
+    args = _parse_args(argv)
+    report = run(args)
+    _print_report(report)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+        )
+
+    failed = False
+    if report["worst_guarded_ms"] > args.budget_ms:
+        print(
+            f"FAIL: worst guarded scan {report['worst_guarded_ms']:.1f} ms exceeds "
+            f"budget {args.budget_ms:.1f} ms",
+            file=sys.stderr,
+        )
+        failed = True
+    for name, case in report["cases"].items():
+        growth = case["guarded_growth"]
+        if args.max_growth and growth is not None and growth > args.max_growth:
+            print(f"FAIL: {name} grows x{growth} per doubling (limit x{args.max_growth})", file=sys.stderr)
+            failed = True
+    for text in report["equivalence_mismatches"][:5]:
+        print(f"FAIL: guard changes rule matches on {text!r}", file=sys.stderr)
+    if report["equivalence_mismatches"]:
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""대화 유형 분류 cascade 임계값별 정확도와 임베딩 호출률 비교.
+
+합성 대화(유형 라벨이 있음)를 cascade 꺼짐과 (최소 매칭 수, 차이) 조합별로 분류해
+정확도, 임베딩으로 넘어간 대화 비율과 API 호출 수, 대화당 소요 시간, 결정 경로별 건수를 출력.
+임베딩은 결정적 스텁(--stub-latency-ms로 API 지연 흉내) 또는 로컬 백엔드를 사용.
+--max-accuracy-drop을 주면 cascade 꺼짐 대비 정확도가 그보다 많이 떨어지는 조합이 있을 때 종료 코드 1.
+
+    python -m benchmarks.classifier_cascade
+    python -m benchmarks.classifier_cascade --thresholds off,1:1,2:2,3:2 --output cascade.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.agents.context import conversation_type_classifier as classifier
+from app.core.config import (
+    CLASSIFIER_CASCADE_ENABLED_ENV,
+    CLASSIFIER_CASCADE_MARGIN_ENV,
+    CLASSIFIER_CASCADE_MIN_HITS_ENV,
+    EMBEDDING_BACKEND_ENV,
+    EMBEDDING_BACKENDS,
+    EMBEDDING_CACHE_ENABLED_ENV,
+    reload_settings,
+)
+from app.core.metrics import CLASSIFICATION_PATHS
+from app.schemas.conversation import NormalizedConversation
+from app.schemas.request import AnalyzeRequest
+from benchmarks.conversation_generator import generate_payload
+from benchmarks.openai_stub import install_stub_clients
+
+DECISION_PATHS = ("rule", "embedding", "fallback")
+
+# None이면 cascade 꺼짐
+Threshold = Optional[Tuple[int, int]]
+
+
+def _parse_thresholds(raw: str) -> List[Threshold]:
+    thresholds: List[Threshold] = []
+    for item in raw.split(","):
+        item = item.strip()
+        if item == "off":
+            thresholds.append(None)
+        elif item:
+            min_hits, margin = item.split(":")
+            thresholds.append((int(min_hits), int(margin)))
+    return thresholds
+
+
+def _label(threshold: Threshold) -> str:
+    return "off" if threshold is None else f"{threshold[0]}:{threshold[1]}"
+
+
+def _labeled_corpus(args: argparse.Namespace) -> List[Tuple[NormalizedConversation, str]]:
+    rng = random.Random(args.seed)
+    lengths = [int(value) for value in args.messages.split(",")]
+    corpus: List[Tuple[NormalizedConversation, str]] = []
+    for idx in range(args.conversations):
+        context_type = classifier.ALLOWED_CONTEXT_TYPES[idx % len(classifier.ALLOWED_CONTEXT_TYPES)]
+        payload = generate_payload(
+            rng.choice(lengths), context_type=context_type, signal_density=args.density, rng=rng
+        )
+        request = AnalyzeRequest(**payload)
+        corpus.append((NormalizedConversation.from_messages(request.messages), context_type))
+    return corpus
+
+
+def _apply_threshold(threshold: Threshold) -> None:
+    os.environ[CLASSIFIER_CASCADE_ENABLED_ENV] = "false" if threshold is None else "true"
+    if threshold is not None:
+        os.environ[CLASSIFIER_CASCADE_MIN_HITS_ENV] = str(threshold[0])
+        os.environ[CLASSIFIER_CASCADE_MARGIN_ENV] = str(threshold[1])
+    reload_settings()
+
+
+def _path_counts() -> Dict[str, float]:
+    return {path: CLASSIFICATION_PATHS.value(path=path) for path in DECISION_PATHS}
+
+
+def _measure(
+    corpus: List[Tuple[NormalizedConversation, str]], clients: Dict[str, object]
+) -> Dict[str, object]:
+    embeddings = clients["async"].embeddings
+    calls_before = embeddings.calls
+    paths_before = _path_counts()
+    correct = 0
+    samples: List[float] = []
+
+    async def _classify_all() -> None:
+        nonlocal correct
+        # 파이프라인과 같이 요청(대화)마다 따로 분류
+        for conversation, expected in corpus:
+            started = time.perf_counter()
+            predicted = await classifier.classify_conversation_type_async(conversation)
+            samples.append(time.perf_counter() - started)
+            correct += predicted == expected
+
+    asyncio.run(_classify_all())
+    paths = {path: int(count - paths_before[path]) for path, count in _path_counts().items()}
+    total = len(corpus)
+    return {
+        "accuracy": round(correct / total, 4),
+        # 규칙으로 확정되지 않아 임베딩 단계로 넘어간 대화 비율
+        "embedding_rate": round((total - paths["rule"]) / total, 4),
+        # openai 백엔드(스텁)의 실제 API 호출 수. local이면 0
+        "api_calls": embeddings.calls - calls_before,
+        "mean_ms": round(sum(samples) / total * 1000, 4),
+        "paths": paths,
+    }
+
+
+def _rule_precision(
+    corpus: List[Tuple[NormalizedConversation, str]], threshold: Threshold
+) -> Optional[float]:
+    """cascade가 규칙으로 확정한 대화 중 정답 비율."""
+    if threshold is None:
+        return None
+    decided = [
+        (classifier._cascade_classify(conversation), expected) for conversation, expected in corpus
+    ]
+    decided = [(predicted, expected) for predicted, expected in decided if predicted is not None]
+    if not decided:
+        return None
+    return round(sum(predicted == expected for predicted, expected in decided) / len(decided), 4)
+
+
+def run(args: argparse.Namespace) -> Dict[str, object]:
+    # 같은 입력이 캐시 적중으로 빠지면 cascade 효과와 섞이므로 임베딩 캐시는 끔
+    os.environ[EMBEDDING_CACHE_ENABLED_ENV] = "false"
+    os.environ[EMBEDDING_BACKEND_ENV] = args.embedding_backend
+    clients = install_stub_clients(latency_seconds=args.stub_latency_ms / 1000.0)
+    asyncio.run(classifier.warm_prototype_centroids())
+    corpus = _labeled_corpus(args)
+
+    results: Dict[str, Dict[str, object]] = {}
+    for threshold in _parse_thresholds(args.thresholds):
+        _apply_threshold(threshold)
+        result = _measure(corpus, clients)
+        result["rule_precision"] = _rule_precision(corpus, threshold)
+        results[_label(threshold)] = result
+
+    baseline = results.get("off")
+    if baseline is not None:
+        for result in results.values():
+            result["accuracy_delta"] = round(result["accuracy"] - baseline["accuracy"], 4)
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "embedding_model": classifier.embedding_model_name(),
+            "params": {
+                "conversations": args.conversations,
+                "messages": args.messages,
+                "density": args.density,
+                "seed": args.seed,
+                "stub_latency_ms": args.stub_latency_ms,
+                "embedding_backend": args.embedding_backend,
+            },
+        },
+        "results": results,
+    }
+
+
+def _print_report(report: Dict[str, object]) -> None:
+    print(
+        f"{'thresholds':<11} {'accuracy':>9} {'delta':>7} {'embed rate':>11} {'api calls':>10} "
+        f"{'mean_ms':>9} {'rule prec':>10}  paths"
+    )
+    for name, result in report["results"].items():
+        delta = result.get("accuracy_delta")
+        precision = result["rule_precision"]
+        print(
+            f"{name:<11} {result['accuracy']:>9.3f} "
+            f"{(f'{delta:+.3f}' if delta is not None else '-'):>7} "
+            f"{result['embedding_rate']:>11.3f} {result['api_calls']:>10} "
+            f"{result['mean_ms']:>9.3f} "
+            f"{(f'{precision:.3f}' if precision is not None else '-'):>10}  "
+            + " ".join(f"{path}={count}" for path, count in result["paths"].items())
+        )
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Classifier cascade accuracy vs embedding calls.")
+    parser.add_argument("--conversations", type=int, default=400, help="합성 대화 수")
+    parser.add_argument("--messages", default="4,8,16,30", help="대화당 메시지 수 후보 (쉼표 구분)")
+    parser.add_argument("--density", type=float, default=0.2, help="OTHER 메시지 중 위험 문장 비율")
+    parser.add_argument(
+        "--thresholds", default="off,1:1,2:1,2:2,3:2,4:3", help="off 또는 최소매칭:차이 (쉼표 구분)"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--stub-latency-ms", type=float, default=5.0, help="스텁 임베딩 응답 지연")
+    parser.add_argument(
+        "--embedding-backend", choices=EMBEDDING_BACKENDS, default=EMBEDDING_BACKENDS[0]
+    )
+    parser.add_argument(
+        "--max-accuracy-drop", type=float, help="cascade 꺼짐 대비 허용 정확도 하락 (예: 0.02)"
+    )
+    parser.add_argument("--output", type=Path, help="결과 JSON 저장 경로")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.disable(logging.WARNING)
+    args = _parse_args(argv)
+    report = run(args)
+    _print_report(report)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+        )
+
+    failed = False
+    if args.max_accuracy_drop is not None:
+        for name, result in report["results"].items():
+            delta = result.get("accuracy_delta")
+            if delta is not None and -delta > args.max_accuracy_drop:
+                print(
+                    f"FAIL: {name} loses {-delta:.3f} accuracy "
+                    f"(limit {args.max_accuracy_drop:.3f})",
+                    file=sys.stderr,
+                )
+                failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
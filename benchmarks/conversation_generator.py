@@ -0,0 +1,187 @@
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from app.agents.context.conversation_type_classifier import ALLOWED_CONTEXT_TYPES
+
+# OCR 스텁이 응답하는 이미지 호스트. 공인 IP 리터럴이라 URL 검증 시 DNS 조회가 발생하지 않음
+STUB_IMAGE_HOST = "93.184.216.34"
+
+PLATFORMS = ["INSTAGRAM", "TELEGRAM"]
+
+# 유형별 일반 대화 (위험 신호 없음, 유형 분류 키워드 포함)
+NEUTRAL_LINES: Dict[str, List[str]] = {
+    "구직": [
+        "안녕하세요 채용 공고 보고 연락드렸습니다.",
+        "면접 일정은 다음 주 화요일 오후 괜찮으실까요?",
+        "이력서는 메일로 보내드렸어요.",
+        "급여는 월급제이고 4대보험 가입됩니다.",
+        "근무지는 강남역 근처 사무실입니다.",
+    ],
+    "중고거래": [
+        "아직 판매 중인가요? 가격 조금 조정 가능할까요?",
+        "직거래 가능하시면 역 앞에서 뵐게요.",
+        "제품 상태는 사진 그대로이고 기스 없습니다.",
+        "택배로 보내드리면 송장 번호 알려드릴게요.",
+        "구매 확정 후 후기 남겨주시면 감사하겠습니다.",
+    ],
+    "재테크": [
+        "요즘 코인 시장이 많이 출렁이네요.",
+        "주식 투자 경험은 어느 정도 있으세요?",
+        "수익률은 시장 상황에 따라 달라집니다.",
+        "선물이나 레버리지 상품은 위험이 커요.",
+        "투자 설명 자료 먼저 보내드릴게요.",
+    ],
+    "부업": [
+        "재택으로 하는 단기 알바 관심 있으세요?",
+        "건당 수당은 작업 난이도에 따라 다릅니다.",
+        "파트타임으로 하루 두세 시간 정도면 됩니다.",
+        "부업 처음이시면 간단한 작업부터 시작해요.",
+        "아르바이트 일정은 자유롭게 정하시면 됩니다.",
+    ],
+}
+
+# 유형별 위험 신호 문장 (text_patterns 규칙에 매칭되도록 구성)
+SIGNAL_LINES: Dict[str, List[str]] = {
+    "구직": [
+        "합격 처리하려면 교육비 입금 부탁드립니다.",
+        "채용 확정 진행 전에 등록 수수료가 있어요.",
+        "신분증 사진이랑 통장사본 제출 부탁드려요.",
+    ],
+    "중고거래": [
+        "안전결제 링크 보내드릴게요 여기서 결제해 주세요.",
+        "배송비 먼저 선입금 해주셔야 발송돼요.",
+        "착불 불가라서 선불만 가능합니다.",
+    ],
+    "재테크": [
+        "원금 보장에 확정 수익 드립니다.",
+        "리딩방 VIP 회원은 수익률 30% 나옵니다.",
+        "지금 가입하시면 무료 체험 가능해요.",
+    ],
+    "부업": [
+        "작업 시작 전 수수료 3만원 입금 부탁드려요.",
+        "좋아요 만 하면 수익 바로 들어옵니다.",
+        "재료비 송금 확인되면 바로 업무 드릴게요.",
+    ],
+}
+
+COMMON_SIGNAL_LINES = [
+    "계좌번호 알려드릴게요 오늘 안에 입금해 주세요.",
+    "지금 바로 처리 안 하시면 기회가 취소됩니다.",
+    "인증번호 오면 바로 알려주세요.",
+    "보증금 송금해 주셔야 진행됩니다. 급합니다.",
+]
+
+ME_LINES = [
+    "네 알겠습니다.",
+    "조금 생각해보고 연락드릴게요.",
+    "혹시 자세한 내용 더 알 수 있을까요?",
+    "확인했습니다 감사합니다.",
+    "그건 좀 어려울 것 같아요.",
+]
+
+
+def _ocr_blob(rng: random.Random, context_type: str, signal_density: float, lines: int) -> str:
+    """캡처 이미지 OCR 결과처럼 여러 줄이 이어진 긴 텍스트."""
+    parts: List[str] = []
+    for idx in range(lines):
+        stamp = f"오후 {rng.randint(1, 12)}:{rng.randint(0, 59):02d}"
+        if rng.random() < signal_density:
+            text = rng.choice(SIGNAL_LINES[context_type] + COMMON_SIGNAL_LINES)
+        else:
+            text = rng.choice(NEUTRAL_LINES[context_type])
+        parts.append(f"{stamp} {'상대방' if idx % 2 == 0 else '나'} {text}")
+    return "\n".join(parts)
+
+
+def generate_messages(
+    num_messages: int,
+    context_type: str,
+    signal_density: float = 0.2,
+    url_ratio: float = 0.0,
+    blob_ratio: float = 0.0,
+    blob_lines: int = 40,
+    rng: Optional[random.Random] = None,
+) -> List[Dict[str, str]]:
+    """AnalyzeRequest.messages 형태의 합성 대화. signal_density는 OTHER 메시지 중 위험 문장 비율."""
+    if context_type not in NEUTRAL_LINES:
+        raise ValueError(f"Unknown context type: {context_type}")
+    rng = rng or random.Random()
+    started_at = datetime(2025, 1, 1, 9, 0, 0)
+    messages: List[Dict[str, str]] = []
+    for idx in range(num_messages):
+        sender = "OTHER" if rng.random() < 0.6 else "ME"
+        message_type = "TEXT"
+        roll = rng.random()
+        if sender == "OTHER" and roll < url_ratio:
+            message_type = "URL"
+            content = f"https://{STUB_IMAGE_HOST}/chat/{context_type}/{rng.randrange(10**6)}.png"
+        elif sender == "OTHER" and roll < url_ratio + blob_ratio:
+            content = _ocr_blob(rng, context_type, signal_density, blob_lines)
+        elif sender == "OTHER" and rng.random() < signal_density:
+            content = rng.choice(SIGNAL_LINES[context_type] + COMMON_SIGNAL_LINES)
+        elif sender == "OTHER":
+            content = rng.choice(NEUTRAL_LINES[context_type])
+        else:
+            content = rng.choice(ME_LINES)
+        messages.append(
+            {
+                "type": message_type,
+                "content": content,
+                "sender": sender,
+                "timestamp": (started_at + timedelta(seconds=30 * idx)).isoformat(),
+            }
+        )
+    return messages
+
+
+def generate_payload(
+    num_messages: int,
+    context_type: Optional[str] = None,
+    signal_density: float = 0.2,
+    url_ratio: float = 0.0,
+    blob_ratio: float = 0.0,
+    blob_lines: int = 40,
+    rng: Optional[random.Random] = None,
+) -> Dict[str, object]:
+    """/api/analyze 요청 본문. context_type이 없으면 ALLOWED_CONTEXT_TYPES 중 무작위 선택."""
+    rng = rng or random.Random()
+    context_type = context_type or rng.choice(ALLOWED_CONTEXT_TYPES)
+    return {
+        "uuid": f"bench-{rng.randrange(16**12):012x}",
+        "platform": rng.choice(PLATFORMS),
+        "messages": generate_messages(
+            num_messages,
+            context_type,
+            signal_density=signal_density,
+            url_ratio=url_ratio,
+            blob_ratio=blob_ratio,
+            blob_lines=blob_lines,
+            rng=rng,
+        ),
+    }
+
+
+def generate_corpus(
+    count: int,
+    num_messages: int,
+    signal_density: float = 0.2,
+    url_ratio: float = 0.0,
+    blob_ratio: float = 0.0,
+    blob_lines: int = 40,
+    seed: int = 42,
+) -> List[Dict[str, object]]:
+    """네 가지 유형을 고르게 섞은 결정적 요청 목록."""
+    rng = random.Random(seed)
+    return [
+        generate_payload(
+            num_messages,
+            context_type=ALLOWED_CONTEXT_TYPES[idx % len(ALLOWED_CONTEXT_TYPES)],
+            signal_density=signal_density,
+            url_ratio=url_ratio,
+            blob_ratio=blob_ratio,
+            blob_lines=blob_lines,
+            rng=rng,
+        )
+        for idx in range(count)
+    ]
@@ -0,0 +1,222 @@
+"""부하 테스트용 OpenAI 호환 서버.
+
+embeddings.create, responses.create(안전 행동 json_schema / OCR input_image, stream 포함)만 지원.
+출력은 benchmarks.openai_stub와 같은 결정적 값이며 지연 분포와 오류율을 설정할 수 있음.
+
+    python -m benchmarks.fake_openai_server --port 9100 \\
+        --embeddings-latency lognormal:80,0.4 --responses-latency lognormal:900,0.5 --error-rate 0.01
+    OPENAI_BASE_URL=http://127.0.0.1:9100/v1 OPENAI_API_KEY=fake uvicorn app.main:app
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from benchmarks.openai_stub import image_reference, stub_embedding, stub_response_text
+
+_STREAM_CHUNK_CHARS = 16
+
+
+@dataclass(frozen=True)
+class LatencyDistribution:
+    """응답 지연 분포. spec 형식: fixed:<ms> | uniform:<min_ms>,<max_ms> | lognormal:<median_ms>,<sigma>."""
+
+    kind: str
+    params: tuple
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        kind, _, raw = spec.partition(":")
+        kind = kind.strip().lower()
+        params = tuple(float(value) for value in raw.split(",") if value.strip())
+        expected = {"fixed": 1, "uniform": 2, "lognormal": 2}
+        if kind not in expected or len(params) != expected[kind]:
+            raise ValueError(f"Invalid latency spec: {spec}")
+        return cls(kind, params)
+
+    def sample_seconds(self, rng: random.Random) -> float:
+        if self.kind == "fixed":
+            value_ms = self.params[0]
+        elif self.kind == "uniform":
+            value_ms = rng.uniform(self.params[0], self.params[1])
+        else:
+            median_ms, sigma = self.params
+            value_ms = rng.lognormvariate(math.log(max(median_ms, 1e-3)), sigma)
+        return max(0.0, value_ms) / 1000.0
+
+
+@dataclass(frozen=True)
+class FakeServerConfig:
+    embeddings_latency: LatencyDistribution
+    responses_latency: LatencyDistribution
+    ocr_latency: LatencyDistribution
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    seed: int = 0
+
+
+def _usage(text: str) -> Dict[str, int]:
+    tokens = max(1, len(text) // 2)
+    return {"prompt_tokens": tokens, "total_tokens": tokens}
+
+
+def _response_body(request: Dict[str, object], text: str) -> Dict[str, object]:
+    response_id = "resp_" + hashlib.sha256(text.encode("utf-8")).hexdigest()[:24]
+    return {
+        "id": response_id,
+        "object": "response",
+        "created_at": int(time.time()),
+        "model": request.get("model", "fake"),
+        "status": "completed",
+        "output": [
+            {
+                "id": f"msg_{response_id[5:]}",
+                "type": "message",
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }
+        ],
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+        "usage": {
+            "input_tokens": len(str(request.get("input", ""))) // 2,
+            "output_tokens": len(text) // 2,
+            "total_tokens": (len(str(request.get("input", ""))) + len(text)) // 2,
+        },
+    }
+
+
+def _sse(event: Dict[str, object]) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+async def _stream_response(request: Dict[str, object], text: str) -> AsyncIterator[str]:
+    body = _response_body(request, text)
+    item_id = body["output"][0]["id"]
+    sequence = 0
+    yield _sse(
+        {
+            "type": "response.created",
+            "response": {**body, "status": "in_progress", "output": []},
+            "sequence_number": sequence,
+        }
+    )
+    for idx in range(0, len(text), _STREAM_CHUNK_CHARS):
+        sequence += 1
+        yield _sse(
+            {
+                "type": "response.output_text.delta",
+                "item_id": item_id,
+                "output_index": 0,
+                "content_index": 0,
+                "delta": text[idx : idx + _STREAM_CHUNK_CHARS],
+                "sequence_number": sequence,
+            }
+        )
+        await asyncio.sleep(0)
+    yield _sse({"type": "response.completed", "response": body, "sequence_number": sequence + 1})
+
+
+def create_app(config: FakeServerConfig) -> FastAPI:
+    app = FastAPI(title="Fake OpenAI")
+    rng = random.Random(config.seed)
+    counters: Dict[str, int] = {"embeddings": 0, "responses": 0, "ocr": 0, "errors": 0}
+
+    def _injected_error() -> Optional[JSONResponse]:
+        roll = rng.random()
+        if roll < config.rate_limit_rate:
+            counters["errors"] += 1
+            return JSONResponse(
+                {"error": {"message": "Rate limit reached (fake)", "type": "rate_limit_error"}},
+                status_code=429,
+                headers={"retry-after": "1"},
+            )
+        if roll < config.rate_limit_rate + config.error_rate:
+            counters["errors"] += 1
+            return JSONResponse(
+                {"error": {"message": "Internal error (fake)", "type": "server_error"}},
+                status_code=500,
+            )
+        return None
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        counters["embeddings"] += 1
+        await asyncio.sleep(config.embeddings_latency.sample_seconds(rng))
+        error = _injected_error()
+        if error is not None:
+            return error
+        texts: List[str] = body["input"] if isinstance(body["input"], list) else [body["input"]]
+        return {
+            "object": "list",
+            "data": [
+                {"object": "embedding", "index": idx, "embedding": stub_embedding(text)}
+                for idx, text in enumerate(texts)
+            ],
+            "model": body.get("model", "fake"),
+            "usage": _usage("".join(texts)),
+        }
+
+    @app.post("/v1/responses")
+    async def responses(request: Request):
+        body = await request.json()
+        is_ocr = image_reference(body.get("input")) is not None
+        counters["ocr" if is_ocr else "responses"] += 1
+        latency = config.ocr_latency if is_ocr else config.responses_latency
+        await asyncio.sleep(latency.sample_seconds(rng))
+        error = _injected_error()
+        if error is not None:
+            return error
+        text = stub_response_text(body)
+        if body.get("stream"):
+            return StreamingResponse(_stream_response(body, text), media_type="text/event-stream")
+        return _response_body(body, text)
+
+    @app.get("/stats")
+    async def stats() -> Dict[str, int]:
+        return dict(counters)
+
+    return app
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run a fake OpenAI-compatible server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--embeddings-latency", default="lognormal:80,0.4")
+    parser.add_argument("--responses-latency", default="lognormal:900,0.5")
+    parser.add_argument("--ocr-latency", default="lognormal:1500,0.5")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 응답 비율")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429 응답 비율")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = _parse_args(argv)
+    config = FakeServerConfig(
+        embeddings_latency=LatencyDistribution.parse(args.embeddings_latency),
+        responses_latency=LatencyDistribution.parse(args.responses_latency),
+        ocr_latency=LatencyDistribution.parse(args.ocr_latency),
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
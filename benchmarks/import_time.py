@@ -0,0 +1,123 @@
+"""`python -X importtime` 기반 import 시간 리포트.
+
+새 프로세스에서 모듈을 import한 시간을 여러 번 측정해 최솟값을 쓰고, 누적 시간이 큰 모듈을 출력.
+시작 시점에 import되면 안 되는 무거운 모듈(--forbid)이 있거나 예산(--budget-ms)을 넘으면 종료 코드 1.
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --budget-ms 900 --output import_time.json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# 첫 사용 또는 워밍업 시점까지 import를 미루는 모듈
+DEFAULT_FORBIDDEN = ("openai", "httpx", "dotenv", "numpy")
+
+
+def _measure_once(module: str) -> Dict[str, int]:
+    """모듈별 누적 import 시간(마이크로초)."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative: Dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative_us, name = (part.strip() for part in line[len("import time:") :].split("|"))
+        if not cumulative_us.isdigit():
+            continue
+        cumulative[name] = int(cumulative_us)
+    return cumulative
+
+
+def measure(module: str, repeat: int) -> Dict[str, int]:
+    """repeat번 측정한 모듈별 최솟값. 디스크 캐시/스케줄링 잡음을 줄이기 위함."""
+    best: Dict[str, int] = {}
+    for _ in range(repeat):
+        for name, value in _measure_once(module).items():
+            best[name] = min(value, best.get(name, value))
+    return best
+
+
+def build_report(
+    module: str, timings: Dict[str, int], forbidden: List[str], top: int
+) -> Dict[str, object]:
+    total_ms = timings.get(module, 0) / 1000.0
+    top_level: Dict[str, int] = {}
+    for name, value in timings.items():
+        root = name.split(".")[0]
+        if name == root:
+            top_level[root] = value
+    ranked = sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:top]
+    app_modules = sorted(
+        ((name, value) for name, value in timings.items() if name.startswith("app.")),
+        key=lambda item: item[1],
+        reverse=True,
+    )[:top]
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "module": module,
+            "python": sys.version.split()[0],
+        },
+        "total_ms": round(total_ms, 1),
+        "top_packages_ms": {name: round(value / 1000.0, 1) for name, value in ranked},
+        "app_modules_ms": {name: round(value / 1000.0, 1) for name, value in app_modules},
+        "forbidden_imported": [name for name in forbidden if name in timings],
+    }
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Report import time of the app entry module.")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument(
+        "--forbid",
+        default=",".join(DEFAULT_FORBIDDEN),
+        help="import 시점에 로드되면 실패로 처리할 모듈 (쉼표 구분, 빈 값이면 검사 안 함)",
+    )
+    parser.add_argument("--budget-ms", type=float, default=0.0, help="총 import 시간 예산 (0이면 검사 안 함)")
+    parser.add_argument("--output", type=Path, help="결과 JSON 저장 경로")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    forbidden = [name.strip() for name in args.forbid.split(",") if name.strip()]
+    timings = measure(args.module, max(1, args.repeat))
+    report = build_report(args.module, timings, forbidden, args.top)
+
+    print(f"{args.module}: {report['total_ms']:.1f} ms (min of {args.repeat})")
+    print(f"{'package':48} {'cumulative_ms':>14}")
+    for name, value in report["top_packages_ms"].items():
+        print(f"{name:48} {value:>14.1f}")
+    print(f"{'app module':48} {'cumulative_ms':>14}")
+    for name, value in report["app_modules_ms"].items():
+        print(f"{name:48} {value:>14.1f}")
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+        )
+
+    failed = False
+    if report["forbidden_imported"]:
+        print(f"FAIL: imported at startup: {', '.join(report['forbidden_imported'])}", file=sys.stderr)
+        failed = True
+    if args.budget_ms and report["total_ms"] > args.budget_ms:
+        print(f"FAIL: {report['total_ms']:.1f} ms exceeds budget {args.budget_ms:.1f} ms", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
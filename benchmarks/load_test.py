@@ -0,0 +1,155 @@
+"""/api/analyze 부하 생성기.
+
+목표 RPS로 요청을 일정 간격(open-loop)으로 보내고 처리량과 지연 시간 분위수를 출력.
+응답이 느려져도 전송 속도를 줄이지 않으므로 대기열이 쌓이는 지점을 확인할 수 있음.
+
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --rps 20 --duration 60 --output load.json
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.conversation_generator import generate_corpus
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.latencies: List[float] = []
+        self.statuses: Counter = Counter()
+        self.degraded: Counter = Counter()
+
+    def record(self, status: str, latency: float, body: Optional[object] = None) -> None:
+        self.statuses[status] += 1
+        if status == "200":
+            self.latencies.append(latency)
+            if isinstance(body, dict):
+                for stage in body.get("degraded_stages", []):
+                    self.degraded[stage] += 1
+
+
+async def _send(
+    client: httpx.AsyncClient,
+    path: str,
+    payload: Dict[str, object],
+    headers: Dict[str, str],
+    recorder: _Recorder,
+) -> None:
+    started = time.perf_counter()
+    try:
+        response = await client.post(path, json=payload, headers=headers)
+    except httpx.HTTPError as exc:
+        recorder.record(type(exc).__name__, time.perf_counter() - started)
+        return
+    latency = time.perf_counter() - started
+    body = response.json() if response.status_code == 200 else None
+    recorder.record(str(response.status_code), latency, body)
+
+
+async def run_load(args: argparse.Namespace) -> Dict[str, object]:
+    payloads = generate_corpus(
+        args.conversations,
+        args.messages,
+        signal_density=args.density,
+        url_ratio=args.url_ratio,
+        blob_ratio=args.blob_ratio,
+        seed=args.seed,
+    )
+    headers = {"X-Request-Deadline-Ms": str(args.deadline_ms)} if args.deadline_ms else {}
+    recorder = _Recorder()
+    limits = httpx.Limits(max_connections=args.max_connections)
+    timeout = httpx.Timeout(args.timeout)
+    interval = 1.0 / args.rps
+    total = int(args.rps * args.duration)
+
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=timeout) as client:
+        tasks = []
+        started = time.perf_counter()
+        for idx in range(total):
+            # 예정된 전송 시각에 맞춰 보냄 (이전 응답을 기다리지 않음)
+            delay = started + idx * interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            payload = dict(payloads[idx % len(payloads)])
+            payload["uuid"] = f"load-{idx}"
+            tasks.append(
+                asyncio.create_task(_send(client, args.path, payload, headers, recorder))
+            )
+        send_elapsed = time.perf_counter() - started
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    latencies = sorted(recorder.latencies)
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "url": args.url + args.path,
+            "target_rps": args.rps,
+            "duration_seconds": args.duration,
+            "conversations": args.conversations,
+            "messages": args.messages,
+            "deadline_ms": args.deadline_ms,
+        },
+        "requests": total,
+        "achieved_send_rps": round(total / send_elapsed, 2) if send_elapsed else 0.0,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "statuses": dict(recorder.statuses),
+        "degraded_stages": dict(recorder.degraded),
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 0.50) * 1000, 1),
+            "p95": round(_percentile(latencies, 0.95) * 1000, 1),
+            "p99": round(_percentile(latencies, 0.99) * 1000, 1),
+            "max": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+        },
+    }
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Drive /api/analyze at a target RPS.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--path", default="/api/analyze")
+    parser.add_argument("--rps", type=float, default=10.0)
+    parser.add_argument("--duration", type=float, default=30.0, help="전송 시간(초)")
+    parser.add_argument("--conversations", type=int, default=200, help="서로 다른 합성 대화 수")
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--density", type=float, default=0.2)
+    # URL 메시지는 실제 이미지 다운로드가 일어나므로 기본적으로 넣지 않음
+    parser.add_argument("--url-ratio", type=float, default=0.0)
+    parser.add_argument("--blob-ratio", type=float, default=0.05)
+    parser.add_argument("--deadline-ms", type=int, default=0, help="요청별 처리 시간 예산")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--max-connections", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", type=Path, help="결과 JSON 저장 경로")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = _parse_args(argv)
+    if args.rps <= 0 or args.duration <= 0:
+        raise SystemExit("--rps and --duration must be positive")
+    report = asyncio.run(run_load(args))
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+        )
+
+
+if __name__ == "__main__":
+    main()
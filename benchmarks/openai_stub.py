@@ -0,0 +1,231 @@
+import asyncio
+import hashlib
+import json
+import math
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from app.core.config import CENTROIDS_PATH_ENV, EMBEDDING_MODEL_ENV, reload_settings
+from app.utils.text_utils import normalize_text
+from benchmarks.conversation_generator import NEUTRAL_LINES, SIGNAL_LINES
+
+EMBEDDING_DIMENSIONS = 256
+STUB_EMBEDDING_MODEL = "stub-hashed-bigram"
+
+# 1x1 PNG. OCR 스텁은 이미지 내용을 보지 않고 URL 기준으로 텍스트를 만듦
+STUB_PNG_BYTES = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c63f8cfc0f01f0005000201a5f9c5d10000000049454e44ae426082"
+)
+
+_STREAM_CHUNK_CHARS = 16
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+def stub_embedding(text: str, dimensions: int = EMBEDDING_DIMENSIONS) -> List[float]:
+    """문자 bigram 해시 기반 결정적 임베딩. 같은 어휘를 공유하는 문장끼리 코사인 유사도가 높음."""
+    normalized = normalize_text(text).replace(" ", "")
+    vector = [0.0] * dimensions
+    grams = [normalized[idx : idx + 2] for idx in range(max(len(normalized) - 1, 1))]
+    for gram in grams:
+        digest = _digest(gram)
+        slot = int.from_bytes(digest[:4], "big") % dimensions
+        vector[slot] += 1.0 if digest[4] & 1 else -1.0
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+
+def stub_ocr_text(image_ref: str) -> str:
+    """이미지 참조(URL/data URL)별로 항상 같은 대화 캡처 텍스트."""
+    digest = _digest(image_ref)
+    context_types = sorted(NEUTRAL_LINES)
+    context_type = context_types[digest[0] % len(context_types)]
+    lines = NEUTRAL_LINES[context_type] + SIGNAL_LINES[context_type]
+    picked = [lines[byte % len(lines)] for byte in digest[1:4]]
+    return "\n".join(picked)
+
+
+def _excerpt_quotes(prompt: str) -> List[str]:
+    quotes: List[str] = []
+    for line in prompt.splitlines():
+        if line.startswith("OTHER:"):
+            quotes.append(line[len("OTHER:") :].strip())
+    return quotes
+
+
+def stub_safe_actions_text(prompt: str) -> str:
+    """json_schema 형식에 맞는 안전 행동 JSON. 인용은 프롬프트의 대화 발췌에서 선택."""
+    quotes = _excerpt_quotes(prompt)
+    risk_signals = []
+    if quotes:
+        quote = quotes[_digest(prompt)[0] % len(quotes)]
+        risk_signals.append(
+            {"quote": quote, "reason": "금전이나 개인정보를 요구하는 표현일 수 있어 주의가 필요합니다."}
+        )
+    payload = {
+        "summary": "대화에서 주의가 필요한 요청이 확인되어 사실 여부 확인이 필요합니다.",
+        "risk_signals": risk_signals,
+        "additional_recommendations": [
+            "공식 채널로 상대방의 신원을 먼저 확인하세요.",
+            "입금이나 개인정보 제공은 확인 전까지 보류하세요.",
+        ],
+    }
+    return json.dumps(payload, ensure_ascii=False)
+
+
+def image_reference(request_input: object) -> Optional[str]:
+    """responses.create input에 포함된 input_image URL. 없으면 None."""
+    if not isinstance(request_input, list):
+        return None
+    for item in request_input:
+        for part in item.get("content", []) if isinstance(item, dict) else []:
+            if isinstance(part, dict) and part.get("type") == "input_image":
+                return str(part.get("image_url", ""))
+    return None
+
+
+def stub_response_text(request: Dict[str, object]) -> str:
+    """responses.create 요청 본문에 대한 결정적 출력. input_image가 있으면 OCR, 없으면 안전 행동."""
+    image_ref = image_reference(request.get("input"))
+    if image_ref is not None:
+        return stub_ocr_text(image_ref)
+    return stub_safe_actions_text(str(request.get("input", "")))
+
+
+def _embedding_response(request_input: object) -> SimpleNamespace:
+    texts = [request_input] if isinstance(request_input, str) else list(request_input)
+    return SimpleNamespace(
+        data=[
+            SimpleNamespace(index=idx, embedding=stub_embedding(text))
+            for idx, text in enumerate(texts)
+        ]
+    )
+
+
+def _stream_events(text: str) -> List[SimpleNamespace]:
+    events = [
+        SimpleNamespace(type="response.output_text.delta", delta=text[idx : idx + _STREAM_CHUNK_CHARS])
+        for idx in range(0, len(text), _STREAM_CHUNK_CHARS)
+    ]
+    events.append(SimpleNamespace(type="response.completed", delta=None))
+    return events
+
+
+class _AsyncStubStream:
+    """openai AsyncStream 대체 (이벤트 반복과 close만 지원)."""
+
+    def __init__(self, events: List[SimpleNamespace]) -> None:
+        self._events = events
+        self.closed = False
+
+    async def __aiter__(self) -> AsyncIterator[SimpleNamespace]:
+        for event in self._events:
+            if self.closed:
+                return
+            yield event
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _StubEmbeddings:
+    def __init__(self, latency_seconds: float) -> None:
+        self.latency_seconds = latency_seconds
+        self.calls = 0
+
+    def create(self, model: str, input: object, **kwargs) -> SimpleNamespace:
+        self.calls += 1
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        return _embedding_response(input)
+
+
+class _StubResponses:
+    def __init__(self, latency_seconds: float) -> None:
+        self.latency_seconds = latency_seconds
+        self.calls = 0
+
+    def create(self, **request) -> SimpleNamespace:
+        self.calls += 1
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        return SimpleNamespace(output_text=stub_response_text(request))
+
+
+class _AsyncStubEmbeddings(_StubEmbeddings):
+    async def create(self, model: str, input: object, **kwargs) -> SimpleNamespace:
+        self.calls += 1
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        return _embedding_response(input)
+
+
+class _AsyncStubResponses(_StubResponses):
+    async def create(self, stream: bool = False, **request):
+        self.calls += 1
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        text = stub_response_text(request)
+        if stream:
+            return _AsyncStubStream(_stream_events(text))
+        return SimpleNamespace(output_text=text)
+
+
+class StubOpenAI:
+    """OpenAI 클라이언트 대체. embeddings.create / responses.create만 지원."""
+
+    def __init__(self, latency_seconds: float = 0.0) -> None:
+        self.embeddings = _StubEmbeddings(latency_seconds)
+        self.responses = _StubResponses(latency_seconds)
+
+
+class AsyncStubOpenAI:
+    """AsyncOpenAI 클라이언트 대체."""
+
+    def __init__(self, latency_seconds: float = 0.0) -> None:
+        self.embeddings = _AsyncStubEmbeddings(latency_seconds)
+        self.responses = _AsyncStubResponses(latency_seconds)
+
+
+def _image_handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, headers={"content-type": "image/png"}, content=STUB_PNG_BYTES)
+
+
+def install_stub_clients(latency_seconds: float = 0.0) -> Dict[str, object]:
+    """각 모듈의 클라이언트 싱글턴을 스텁으로 교체. 반환값으로 호출 횟수를 확인할 수 있음."""
+    from app.agents.actions import safe_action_generator
+    from app.agents.context import conversation_type_classifier, embedding_backends, embedding_cache
+    from app.services import ocr_service
+
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    # 스텁 벡터로 만든 centroid가 실제 모델용 아티팩트를 덮어쓰지 않도록 모델명과 경로를 분리
+    os.environ[EMBEDDING_MODEL_ENV] = STUB_EMBEDDING_MODEL
+    os.environ[CENTROIDS_PATH_ENV] = os.path.join(
+        tempfile.gettempdir(), "ai-server-stub-centroids.json"
+    )
+    reload_settings()
+    sync_client = StubOpenAI(latency_seconds)
+    async_client = AsyncStubOpenAI(latency_seconds)
+
+    embedding_backends._EMBEDDING_CLIENT = sync_client
+    embedding_backends._ASYNC_EMBEDDING_CLIENT = async_client
+    # EMBEDDING_BACKEND가 local이면 스텁 클라이언트는 쓰이지 않음
+    conversation_type_classifier._EMBEDDING_BACKEND = None
+    conversation_type_classifier._EMBEDDING_BATCHER = None
+    conversation_type_classifier._PROTOTYPE_CENTROIDS = None
+    # 스텁 모델명으로 바뀐 설정을 다시 읽도록 캐시도 새로 만듦
+    embedding_cache._EMBEDDING_CACHE = None
+    safe_action_generator._ASYNC_SAFE_ACTIONS_CLIENT = async_client
+    ocr_service._ASYNC_OCR_CLIENT = async_client
+    ocr_service._ASYNC_HTTP_CLIENT = httpx.AsyncClient(
+        transport=httpx.MockTransport(_image_handler)
+    )
+    return {"sync": sync_client, "async": async_client}
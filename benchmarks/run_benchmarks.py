@@ -0,0 +1,290 @@
+"""파이프라인 단계별 마이크로벤치마크.
+
+OpenAI/이미지 다운로드는 결정적 스텁으로 대체하고 합성 대화로 각 단계를 측정한 뒤 JSON으로 저장.
+
+    python -m benchmarks.run_benchmarks --output bench.json
+    python -m benchmarks.run_benchmarks --baseline bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from app.agents.analyzer.conversation_analyzer import (
+    analyze_conversation,
+    extract_signal_phrases,
+    scan_conversation,
+    signal_query_terms,
+)
+from app.agents.analyzer.rule_set import get_rule_set
+from app.agents.context import conversation_type_classifier as classifier
+from app.agents.context.centroid_index import CentroidIndex
+from app.agents.decision.decision_orchestrator import decide_risk_stage
+from app.agents.explanation.rag.rag_provider import retrieve_evidence
+from app.agents.explanation.rag.retrieval_contract import RetrievalRequest
+from app.core.config import (
+    EMBEDDING_BACKEND_ENV,
+    EMBEDDING_BACKENDS,
+    EMBEDDING_CACHE_ENABLED_ENV,
+    RESULT_CACHE_ENABLED_ENV,
+)
+from app.pipeline.analysis_pipeline import _build_conversation_excerpt, run_analysis_pipeline
+from app.schemas.conversation import NormalizedConversation
+from app.schemas.request import AnalyzeRequest
+from benchmarks.conversation_generator import generate_corpus
+from benchmarks.openai_stub import install_stub_clients
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _summarize(samples: List[float]) -> Dict[str, float]:
+    values = sorted(samples)
+    return {
+        "count": len(values),
+        "mean_ms": round(statistics.fmean(values) * 1000, 4) if values else 0.0,
+        "p50_ms": round(_percentile(values, 0.50) * 1000, 4),
+        "p95_ms": round(_percentile(values, 0.95) * 1000, 4),
+        "min_ms": round(values[0] * 1000, 4) if values else 0.0,
+        "max_ms": round(values[-1] * 1000, 4) if values else 0.0,
+    }
+
+
+def _time_calls(calls: List[Callable[[], object]], iterations: int, warmup: int) -> List[float]:
+    for _ in range(warmup):
+        for call in calls:
+            call()
+    samples: List[float] = []
+    for _ in range(iterations):
+        for call in calls:
+            started = time.perf_counter()
+            call()
+            samples.append(time.perf_counter() - started)
+    return samples
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def _classify_embedding(
+    conversation: NormalizedConversation, embedding: Sequence[float], centroids: CentroidIndex
+) -> str:
+    """분류기 임베딩 경로 중 API 호출을 뺀 부분 (centroid 점수 + 허용 유형/fallback 판단)."""
+    best_category = centroids.best_categories([embedding])[0]
+    return classifier._resolve_category(conversation, best_category, centroids.default_category)
+
+
+class _PreparedCase:
+    """단계별 측정에 필요한 입력을 미리 계산해 둔 대화 하나."""
+
+    def __init__(self, payload: Dict[str, object], centroids: CentroidIndex) -> None:
+        self.request = AnalyzeRequest(**payload)
+        # 단계 측정은 OCR 이전 텍스트 기준 (URL 메시지는 그대로 둠)
+        self.conversation = NormalizedConversation.from_messages(self.request.messages)
+        self.embedding_input = classifier._build_embedding_input(self.conversation)
+        self.embedding = classifier._embed_texts([self.embedding_input])[0]
+        self.conversation_type = _classify_embedding(
+            self.conversation, self.embedding, centroids
+        )
+        self.allowed_signals = get_rule_set().resolve_risk_signals(self.conversation_type)
+        self.signals = analyze_conversation(self.conversation, self.allowed_signals)
+        self.matched_phrases = extract_signal_phrases(self.conversation, self.allowed_signals)
+        self.match_index = scan_conversation(self.conversation, self.conversation_type).match_index()
+        self.retrieval_request = RetrievalRequest(
+            risk_stage=decide_risk_stage(self.signals),
+            conversation_type=self.conversation_type,
+            signals=self.signals,
+            query_terms=signal_query_terms(self.signals),
+            matched_phrases=self.matched_phrases,
+        )
+
+
+def run(args: argparse.Namespace) -> Dict[str, object]:
+    # 캐시가 켜져 있으면 반복 측정이 캐시 적중만 재게 되므로 끔 (스텁 설치 시 설정을 다시 읽음)
+    os.environ[RESULT_CACHE_ENABLED_ENV] = "false"
+    os.environ[EMBEDDING_CACHE_ENABLED_ENV] = "false"
+    os.environ[EMBEDDING_BACKEND_ENV] = args.embedding_backend
+    install_stub_clients(latency_seconds=args.stub_latency_ms / 1000.0)
+    corpus = generate_corpus(
+        args.conversations,
+        args.messages,
+        signal_density=args.density,
+        url_ratio=args.url_ratio,
+        blob_ratio=args.blob_ratio,
+        blob_lines=args.blob_lines,
+        seed=args.seed,
+    )
+    # 파이프라인과 같은 경로로 centroid를 로드(없으면 계산)해 단계 측정과 end-to-end가 공유
+    asyncio.run(classifier.warm_prototype_centroids())
+    centroids = classifier._PROTOTYPE_CENTROIDS
+    cases = [_PreparedCase(payload, centroids) for payload in corpus]
+
+    stage_calls: Dict[str, List[Callable[[], object]]] = {
+        "normalize_conversation": [
+            lambda case=case: NormalizedConversation.from_messages(case.request.messages)
+            for case in cases
+        ],
+        "analyze_conversation": [
+            lambda case=case: analyze_conversation(case.conversation, case.allowed_signals)
+            for case in cases
+        ],
+        "extract_signal_phrases": [
+            lambda case=case: extract_signal_phrases(case.conversation, case.allowed_signals)
+            for case in cases
+        ],
+        # 위 두 단계를 한 번에 수행하는 파이프라인 경로
+        "rule_scan": [
+            lambda case=case: scan_conversation(case.conversation, case.conversation_type)
+            for case in cases
+        ],
+        "build_conversation_excerpt": [
+            lambda case=case: _build_conversation_excerpt(
+                case.conversation, case.match_index, case.matched_phrases, max_lines=20
+            )
+            for case in cases
+        ],
+        "retrieve_evidence": [
+            lambda case=case: retrieve_evidence(case.retrieval_request) for case in cases
+        ],
+        "classifier_rule_scoring": [
+            lambda case=case: classifier._score_rule_based(case.conversation) for case in cases
+        ],
+        # openai 백엔드는 스텁 응답 시간(--stub-latency-ms)을, local은 실제 계산 시간을 측정
+        "classifier_embedding": [
+            lambda case=case: classifier._embed_texts([case.embedding_input]) for case in cases
+        ],
+        "classifier_embedding_scoring": [
+            lambda case=case: _classify_embedding(case.conversation, case.embedding, centroids)
+            for case in cases
+        ],
+        # 대화 전체의 임베딩을 한 번에 점수화하는 배치 경로
+        "classifier_batch_scoring": [
+            lambda: centroids.best_categories([case.embedding for case in cases])
+        ],
+    }
+
+    stages: Dict[str, Dict[str, float]] = {}
+    for name, calls in stage_calls.items():
+        stages[name] = _summarize(_time_calls(calls, args.iterations, args.warmup))
+
+    async def _end_to_end() -> List[float]:
+        for case in cases[: args.warmup]:
+            await run_analysis_pipeline(case.request)
+        samples: List[float] = []
+        for _ in range(args.iterations):
+            for case in cases:
+                started = time.perf_counter()
+                await run_analysis_pipeline(case.request)
+                samples.append(time.perf_counter() - started)
+        return samples
+
+    stages["pipeline_end_to_end"] = _summarize(asyncio.run(_end_to_end()))
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "ruleset_version": get_rule_set().version,
+            "ruleset_digest": get_rule_set().digest,
+            "embedding_model": classifier.embedding_model_name(),
+            "params": {
+                "conversations": args.conversations,
+                "messages": args.messages,
+                "density": args.density,
+                "url_ratio": args.url_ratio,
+                "blob_ratio": args.blob_ratio,
+                "blob_lines": args.blob_lines,
+                "iterations": args.iterations,
+                "warmup": args.warmup,
+                "seed": args.seed,
+                "stub_latency_ms": args.stub_latency_ms,
+                "embedding_backend": args.embedding_backend,
+            },
+        },
+        "stages": stages,
+    }
+
+
+def _print_report(report: Dict[str, object], baseline: Optional[Dict[str, object]]) -> None:
+    baseline_stages = (baseline or {}).get("stages", {})
+    header = f"{'stage':<30} {'mean_ms':>10} {'p50_ms':>10} {'p95_ms':>10}"
+    if baseline_stages:
+        header += f" {'vs base':>9}"
+    print(header)
+    for name, summary in report["stages"].items():
+        line = (
+            f"{name:<30} {summary['mean_ms']:>10.3f} "
+            f"{summary['p50_ms']:>10.3f} {summary['p95_ms']:>10.3f}"
+        )
+        base = baseline_stages.get(name)
+        if base and base.get("mean_ms"):
+            line += f" {summary['mean_ms'] / base['mean_ms']:>8.2f}x"
+        print(line)
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark analysis pipeline stages.")
+    parser.add_argument("--conversations", type=int, default=40, help="합성 대화 수")
+    parser.add_argument("--messages", type=int, default=30, help="대화당 메시지 수")
+    parser.add_argument("--density", type=float, default=0.2, help="OTHER 메시지 중 위험 문장 비율")
+    parser.add_argument("--url-ratio", type=float, default=0.05, help="URL(OCR) 메시지 비율")
+    parser.add_argument("--blob-ratio", type=float, default=0.05, help="긴 OCR 텍스트 메시지 비율")
+    parser.add_argument("--blob-lines", type=int, default=40, help="긴 OCR 텍스트의 줄 수")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0, help="스텁 OpenAI 응답 지연")
+    parser.add_argument(
+        "--embedding-backend", choices=EMBEDDING_BACKENDS, default=EMBEDDING_BACKENDS[0]
+    )
+    parser.add_argument("--output", type=Path, help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", type=Path, help="비교할 이전 결과 JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = _parse_args(argv)
+    # 단계별 INFO 로그가 측정값에 섞이지 않도록 경고 이상만 출력
+    logging.disable(logging.INFO)
+    report = run(args)
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline else None
+    _print_report(report, baseline)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8"
+        )
+        print(f"saved: {args.output}")
+
+
+if __name__ == "__main__":
+    main()